@@ -3,228 +3,483 @@
 Learning Graph Quality Analysis Script
 
 Analyzes the concept dependency graph and generates quality metrics including:
-- DAG verification
+- DAG verification (cycles reported per strongly connected component)
 - Indegree/outdegree analysis
 - Dependency chain analysis
 - Orphaned node detection
 - Connected component analysis
-"""
-
-import csv
-from collections import defaultdict, deque
-from typing import Dict, List, Set, Tuple
 
+The graph is loaded once with learning_graph.load_csv into compact CSR
+arrays, and every analysis below works on concept indices in O(V+E).
 
-def load_graph(csv_path: str) -> Tuple[Dict[int, str], Dict[int, List[int]]]:
-    """Load the dependency graph from CSV file."""
-    concepts = {}  # id -> label
-    dependencies = defaultdict(list)  # id -> list of prerequisite ids
+With --incremental, the graph and the analysis memo (chain lengths and
+component labels) are saved next to the report. The next run diffs the CSV
+against that state and only recomputes what the changed concepts can affect,
+falling back to a full analysis when the graph has a cycle.
+"""
 
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            concept_id = int(row['ConceptID'])
-            concepts[concept_id] = row['ConceptLabel']
+import argparse
+import json
+from array import array
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
-            if row['Dependencies']:
-                deps = [int(d) for d in row['Dependencies'].split('|')]
-                dependencies[concept_id] = deps
+from graph_cycles import find_cycle_components, simple_cycles
+from learning_graph import LearningGraph, load_csv
 
-    return concepts, dependencies
+# Bump when the layout of the incremental state file changes
+STATE_VERSION = 1
 
 
-def calculate_indegree(concepts: Dict[int, str],
-                       dependencies: Dict[int, List[int]]) -> Dict[int, int]:
-    """Calculate indegree (number of concepts that depend on each concept)."""
-    indegree = {cid: 0 for cid in concepts}
+def load_graph(csv_path: str) -> LearningGraph:
+    """Load the dependency graph from CSV file."""
+    return load_csv(csv_path)
 
-    for concept_id, prereqs in dependencies.items():
-        for prereq in prereqs:
-            indegree[prereq] += 1
 
-    return indegree
+def calculate_indegree(graph: LearningGraph) -> List[int]:
+    """Calculate indegree (number of concepts that depend on each concept), by index."""
+    return graph.dependents.degrees()
 
 
-def calculate_outdegree(concepts: Dict[int, str],
-                        dependencies: Dict[int, List[int]]) -> Dict[int, int]:
-    """Calculate outdegree (number of prerequisites for each concept)."""
-    outdegree = {cid: len(dependencies.get(cid, [])) for cid in concepts}
-    return outdegree
+def calculate_outdegree(graph: LearningGraph) -> List[int]:
+    """Calculate outdegree (number of prerequisites for each concept), by index."""
+    return graph.prerequisites.degrees()
 
 
-def find_orphaned_nodes(concepts: Dict[int, str],
-                        indegree: Dict[int, int],
-                        dependencies: Dict[int, List[int]]) -> List[Tuple[int, str]]:
+def find_orphaned_nodes(graph: LearningGraph,
+                        indegree: List[int],
+                        outdegree: List[int]) -> List[Tuple[int, str]]:
     """Find concepts that nothing depends on (potential dead ends)."""
-    orphaned = [(cid, label) for cid, label in concepts.items()
-                if indegree[cid] == 0 and cid in dependencies]
+    orphaned = [(graph.ids[i], graph.labels[i]) for i in range(len(graph))
+                if indegree[i] == 0 and outdegree[i] > 0]
     return orphaned
 
 
-def verify_dag(concepts: Dict[int, str],
-               dependencies: Dict[int, List[int]]) -> Tuple[bool, List[List[int]]]:
+def verify_dag(graph: LearningGraph) -> Tuple[bool, List[List[int]]]:
     """Verify the graph is a DAG using topological sort. Returns (is_dag, cycles_found)."""
-    indeg = {cid: 0 for cid in concepts}
+    # Number of concepts that still depend on each concept
+    remaining = array('i', graph.dependents.degrees())
 
-    # Calculate indegree
-    for concept_id, prereqs in dependencies.items():
-        for prereq in prereqs:
-            indeg[prereq] += 1
-
-    # Kahn's algorithm for topological sort
-    queue = deque([cid for cid in concepts if indeg[cid] == 0])
-    processed = []
+    # Kahn's algorithm, peeling concepts that nothing depends on
+    queue = deque(i for i in range(len(graph)) if remaining[i] == 0)
+    processed = 0
 
     while queue:
         node = queue.popleft()
-        processed.append(node)
+        processed += 1
 
-        # For each concept that depends on this node
-        for concept_id, prereqs in dependencies.items():
-            if node in prereqs:
-                indeg[concept_id] -= 1
-                if indeg[concept_id] == 0:
-                    queue.append(concept_id)
+        # Each prerequisite of this node loses one dependent
+        for prereq in graph.prerequisites[node]:
+            remaining[prereq] -= 1
+            if remaining[prereq] == 0:
+                queue.append(prereq)
 
-    is_dag = len(processed) == len(concepts)
-    cycles = [] if is_dag else find_cycles(concepts, dependencies)
+    is_dag = processed == len(graph)
+    cycles = [] if is_dag else find_cycles(graph)
 
     return is_dag, cycles
 
 
-def find_cycles(concepts: Dict[int, str],
-                dependencies: Dict[int, List[int]]) -> List[List[int]]:
-    """Find cycles in the graph using DFS."""
-    visited = set()
-    rec_stack = set()
-    cycles = []
-
-    def dfs(node, path):
-        visited.add(node)
-        rec_stack.add(node)
-        path.append(node)
-
-        # Check all nodes that this node depends on (reverse edges in dependency graph)
-        for next_node, prereqs in dependencies.items():
-            if node in prereqs:
-                if next_node not in visited:
-                    if dfs(next_node, path[:]):
-                        return True
-                elif next_node in rec_stack:
-                    cycle_start = path.index(next_node)
-                    cycles.append(path[cycle_start:] + [next_node])
-                    return True
-
-        rec_stack.remove(node)
-        return False
-
-    for node in concepts:
-        if node not in visited:
-            dfs(node, [])
-
-    return cycles
-
-
-def find_longest_chain(concepts: Dict[int, str],
-                       dependencies: Dict[int, List[int]]) -> Tuple[int, List[int]]:
-    """Find the longest dependency chain using DFS."""
-    memo = {}
-
-    def dfs(node):
-        if node in memo:
-            return memo[node]
+def find_cycles(graph: LearningGraph, max_cycles: int = None) -> List[List[int]]:
+    """Find cycles in the graph.
+
+    By default reports one shortest cycle for every strongly connected
+    component that contains a cycle, in O(V+E). With max_cycles set,
+    enumerates up to that many elementary cycles with Johnson's algorithm
+    instead. Each cycle is a list of concept IDs, closed (its first concept
+    is repeated at the end) and following prerequisite -> dependent edges.
+    """
+    nodes = range(len(graph))
+    if max_cycles is not None:
+        cycles = simple_cycles(nodes, graph.dependents, limit=max_cycles)
+    else:
+        cycles = (cycle for _, cycle in find_cycle_components(nodes, graph.dependents))
+
+    ids = graph.ids
+    return [[ids[i] for i in cycle] + [ids[cycle[0]]] for cycle in cycles]
+
+
+def compute_chain_lengths(graph: LearningGraph, length: array = None,
+                          best_prereq: array = None, starts: Iterable[int] = None) -> Tuple[array, array]:
+    """Compute the longest-chain memo with an iterative DFS.
+
+    length[i] is the number of concepts on the longest prerequisite chain
+    ending at concept i, and best_prereq[i] is the next concept down that
+    chain (-1 for a foundational concept). Entries with a non-zero length
+    are treated as already computed, so passing a partly filled memo and the
+    invalidated concepts as starts only recomputes those.
+
+    Edges that lead back into the current path (cycles) are ignored, so the
+    result is still defined for graphs that are not DAGs.
+    """
+    n = len(graph)
+    prerequisites = graph.prerequisites
+    if length is None:
+        length = array('i', bytes(4 * n))       # 0 = not computed yet
+        best_prereq = array('i', [-1]) * n      # next concept down the chain
+    in_progress = bytearray(n)
+
+    for start in (range(n) if starts is None else starts):
+        if length[start]:
+            continue
+
+        in_progress[start] = 1
+        stack = [(start, iter(prerequisites[start]))]
+
+        while stack:
+            node, prereqs = stack[-1]
+            for prereq in prereqs:
+                if not length[prereq] and not in_progress[prereq]:
+                    in_progress[prereq] = 1
+                    stack.append((prereq, iter(prerequisites[prereq])))
+                    break
+            else:
+                stack.pop()
+                in_progress[node] = 0
+
+                max_length = 0
+                best_prereq[node] = -1
+                for prereq in prerequisites[node]:
+                    if length[prereq] > max_length:
+                        max_length = length[prereq]
+                        best_prereq[node] = prereq
+
+                length[node] = max_length + 1
+
+    return length, best_prereq
+
+
+def longest_chain_from_memo(graph: LearningGraph, length: array,
+                            best_prereq: array) -> Tuple[int, List[int]]:
+    """Read the longest chain (length, concept IDs) out of a chain memo."""
+    max_chain_length = 0
+    max_chain_end = -1
 
-        if node not in dependencies or not dependencies[node]:
-            memo[node] = (1, [node])
-            return memo[node]
+    for i in range(len(graph)):
+        if length[i] > max_chain_length:
+            max_chain_length = length[i]
+            max_chain_end = i
 
-        max_length = 0
-        max_path = []
+    max_chain_path = []
+    node = max_chain_end
+    while node != -1:
+        max_chain_path.append(graph.ids[node])
+        node = best_prereq[node]
+    max_chain_path.reverse()
 
-        for prereq in dependencies[node]:
-            length, path = dfs(prereq)
-            if length > max_length:
-                max_length = length
-                max_path = path
+    return max_chain_length, max_chain_path
 
-        memo[node] = (max_length + 1, max_path + [node])
-        return memo[node]
 
-    max_chain_length = 0
-    max_chain_path = []
+def find_longest_chain(graph: LearningGraph) -> Tuple[int, List[int]]:
+    """Find the longest dependency chain using an iterative DFS."""
+    return longest_chain_from_memo(graph, *compute_chain_lengths(graph))
 
-    for concept_id in concepts:
-        length, path = dfs(concept_id)
-        if length > max_chain_length:
-            max_chain_length = length
-            max_chain_path = path
 
-    return max_chain_length, max_chain_path
+def component_labels(graph: LearningGraph) -> array:
+    """Label each concept with its connected component (treating graph as undirected).
 
+    Components are numbered in order of their lowest concept index.
+    """
+    n = len(graph)
+    labels = array('i', [-1]) * n
+    count = 0
 
-def find_connected_components(concepts: Dict[int, str],
-                               dependencies: Dict[int, List[int]]) -> List[Set[int]]:
-    """Find connected components (treating graph as undirected)."""
-    visited = set()
-    components = []
+    for start in range(n):
+        if labels[start] != -1:
+            continue
 
-    def bfs(start):
-        component = set()
+        labels[start] = count
         queue = deque([start])
-        component.add(start)
-        visited.add(start)
-
         while queue:
             node = queue.popleft()
 
             # Add all neighbors (both directions)
-            if node in dependencies:
-                for prereq in dependencies[node]:
-                    if prereq not in visited:
-                        visited.add(prereq)
-                        component.add(prereq)
-                        queue.append(prereq)
-
-            for concept_id, prereqs in dependencies.items():
-                if node in prereqs and concept_id not in visited:
-                    visited.add(concept_id)
-                    component.add(concept_id)
-                    queue.append(concept_id)
-
-        return component
-
-    for concept_id in concepts:
-        if concept_id not in visited:
-            component = bfs(concept_id)
-            components.append(component)
+            for neighbors in (graph.prerequisites[node], graph.dependents[node]):
+                for neighbor in neighbors:
+                    if labels[neighbor] == -1:
+                        labels[neighbor] = count
+                        queue.append(neighbor)
+        count += 1
+
+    return labels
 
+
+def group_components(graph: LearningGraph, labels: Sequence[int]) -> List[Set[int]]:
+    """Turn component labels into a list of concept ID sets, one per component."""
+    components = []
+    for concept_id, label in zip(graph.ids, labels):
+        if label == len(components):
+            components.append(set())
+        components[label].add(concept_id)
     return components
 
 
-def generate_report(csv_path: str, output_path: str):
-    """Generate comprehensive quality metrics report."""
-    concepts, dependencies = load_graph(csv_path)
+def find_connected_components(graph: LearningGraph) -> List[Set[int]]:
+    """Find connected components (treating graph as undirected)."""
+    return group_components(graph, component_labels(graph))
+
+
+def analyze_structure(graph: LearningGraph) -> Dict:
+    """Run the full structural analysis (DAG check, chain memo, components)."""
+    is_dag, cycles = verify_dag(graph)
+    length, best_prereq = compute_chain_lengths(graph)
+    return {
+        'is_dag': is_dag,
+        'cycles': cycles,
+        'chain_length': length,
+        'best_prereq': best_prereq,
+        'components': component_labels(graph),
+    }
+
+
+def default_state_path(output_path: str) -> Path:
+    """State file kept next to the report for incremental runs.
+
+    The name starts with a dot so MkDocs does not publish it with the site.
+    """
+    path = Path(output_path)
+    return path.with_name(f".{path.stem}.state.json")
+
+
+def save_analysis_state(state_path: Path, graph: LearningGraph, analysis: Dict):
+    """Record the graph and its analysis memo for the next incremental run."""
+    state = {
+        'version': STATE_VERSION,
+        'ids': list(graph.ids),
+        'offsets': list(graph.prerequisites.offsets),
+        'targets': list(graph.prerequisites.targets),
+        'is_dag': analysis['is_dag'],
+        'chain_length': list(analysis['chain_length']),
+        'best_prereq': list(analysis['best_prereq']),
+        'components': list(analysis['components']),
+    }
+    with open(state_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(state, separators=(',', ':')))
+
+
+def load_analysis_state(state_path: Path) -> Optional[Dict]:
+    """Load the state written by the previous run, or None if it is missing or unusable."""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        return None
+    return state
+
+
+def diff_graph(state: Dict, graph: LearningGraph) -> Tuple[List[int], List[int], List[int], List[int]]:
+    """Compare a graph against the one recorded in an analysis state.
+
+    Returns:
+        Tuple of (old_index, changed, shrunk, removed): old_index maps each
+        new concept index to its index in the state (-1 for new concepts),
+        changed lists new concepts and concepts whose prerequisites changed,
+        shrunk lists the old indices of concepts that lost a prerequisite,
+        and removed lists the old indices of concepts no longer in the graph
+    """
+    old_ids = state['ids']
+    old_offsets = state['offsets']
+    position = {concept_id: k for k, concept_id in enumerate(old_ids)}
+
+    old_index = array('i', [-1]) * len(graph)
+    new_index = array('i', [-1]) * len(old_ids)
+    for i, concept_id in enumerate(graph.ids):
+        k = position.pop(concept_id, -1)
+        if k != -1:
+            old_index[i] = k
+            new_index[k] = i
+
+    # Old edges in new index space (-1 for prerequisites that were removed)
+    old_targets = array('i', [new_index[t] for t in state['targets']])
+    prerequisites = graph.prerequisites
+
+    changed = []
+    shrunk = []
+    for i in range(len(graph)):
+        k = old_index[i]
+        if k == -1:
+            changed.append(i)
+            continue
+
+        old_prereqs = old_targets[old_offsets[k]:old_offsets[k + 1]]
+        new_prereqs = prerequisites[i]
+        if old_prereqs != new_prereqs:
+            changed.append(i)
+            if not set(old_prereqs) <= set(new_prereqs):
+                shrunk.append(k)
+
+    removed = list(position.values())
+    return old_index, changed, shrunk, removed
+
+
+def analyze_incremental(graph: LearningGraph, state: Dict) -> Optional[Dict]:
+    """Update a previous run's analysis for the concepts that changed.
+
+    - Components: concepts in components that cannot have split (no concept
+      in them lost a prerequisite or was removed) keep their grouping, and
+      union-find merges in the new edges and re-links the rest.
+    - Longest chain: only the changed concepts and everything that depends
+      on them, directly or transitively, are recomputed.
+    - DAG check: only the part of the graph reachable from the changed
+      concepts is searched for cycles, since the previous graph was a DAG.
+
+    Returns:
+        The same dict as analyze_structure, or None if the change cannot be
+        handled incrementally (the previous or the new graph has a cycle)
+    """
+    if not state['is_dag']:
+        return None
+
+    old_index, changed, shrunk, removed = diff_graph(state, graph)
+    n = len(graph)
+    prerequisites = graph.prerequisites
+    dependents = graph.dependents
+
+    # Acyclicity: any new cycle has to pass through a changed concept
+    reachable = bytearray(n)
+    stack = []
+    for i in changed:
+        reachable[i] = 1
+        stack.append(i)
+    while stack:
+        for prereq in prerequisites[stack.pop()]:
+            if not reachable[prereq]:
+                reachable[prereq] = 1
+                stack.append(prereq)
+    region = [i for i in range(n) if reachable[i]]
+    if find_cycle_components(region, prerequisites):
+        return None
+
+    # Longest chain: invalidate changed concepts and their dependents
+    old_length = state['chain_length']
+    old_best = state['best_prereq']
+    invalid = bytearray(n)
+    stack = []
+    for i in changed:
+        invalid[i] = 1
+        stack.append(i)
+    while stack:
+        for dependent in dependents[stack.pop()]:
+            if not invalid[dependent]:
+                invalid[dependent] = 1
+                stack.append(dependent)
+
+    length = array('i', bytes(4 * n))
+    best_prereq = array('i', [-1]) * n
+    old_ids = state['ids']
+    for i in range(n):
+        if not invalid[i]:
+            k = old_index[i]
+            length[i] = old_length[k]
+            if old_best[k] != -1:
+                best_prereq[i] = graph.index[old_ids[old_best[k]]]
+    compute_chain_lengths(graph, length, best_prereq,
+                          starts=[i for i in range(n) if invalid[i]])
+
+    # Components: union-find seeded with the components that cannot have split
+    old_components = state['components']
+    split = {old_components[k] for k in shrunk}
+    split.update(old_components[k] for k in removed)
+
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    representative = {}
+    relink = list(changed)
+    for i in range(n):
+        k = old_index[i]
+        if k == -1:
+            continue
+        label = old_components[k]
+        if label in split:
+            relink.append(i)
+        else:
+            parent[i] = representative.setdefault(label, i)
+
+    for i in relink:
+        for prereq in prerequisites[i]:
+            union(i, prereq)
+
+    labels = array('i', [-1]) * n
+    numbering = {}
+    for i in range(n):
+        labels[i] = numbering.setdefault(find(i), len(numbering))
+
+    return {
+        'is_dag': True,
+        'cycles': [],
+        'chain_length': length,
+        'best_prereq': best_prereq,
+        'components': labels,
+        'changed': len(changed) + len(removed),
+    }
+
+
+def generate_report(csv_path: str, output_path: str, incremental: bool = False,
+                    state_path: str = None):
+    """Generate comprehensive quality metrics report.
+
+    Args:
+        csv_path: Path to learning-graph.csv
+        output_path: Path to the markdown report to write
+        incremental: If True, reuse the analysis state from the previous run
+            and save the updated state for the next one
+        state_path: State file (defaults to .<report name>.state.json next to the report)
+    """
+    graph = load_graph(csv_path)
+    concepts = dict(zip(graph.ids, graph.labels))
 
     # Calculate metrics
-    indegree = calculate_indegree(concepts, dependencies)
-    outdegree = calculate_outdegree(concepts, dependencies)
-    orphaned = find_orphaned_nodes(concepts, indegree, dependencies)
-    is_dag, cycles = verify_dag(concepts, dependencies)
-    max_chain_length, max_chain_path = find_longest_chain(concepts, dependencies)
-    components = find_connected_components(concepts, dependencies)
+    indegree = calculate_indegree(graph)
+    outdegree = calculate_outdegree(graph)
+    orphaned = find_orphaned_nodes(graph, indegree, outdegree)
+
+    analysis = None
+    if incremental:
+        state_path = Path(state_path) if state_path else default_state_path(output_path)
+        state = load_analysis_state(state_path)
+        if state is not None:
+            analysis = analyze_incremental(graph, state)
+        if analysis is not None:
+            print(f"♻️  Incremental analysis: {analysis['changed']} concepts changed since last run")
+        else:
+            print("ℹ️  Running full analysis (no usable state from a previous run, or the graph has a cycle)")
+    if analysis is None:
+        analysis = analyze_structure(graph)
+    if incremental:
+        save_analysis_state(state_path, graph, analysis)
+
+    is_dag = analysis['is_dag']
+    cycles = analysis['cycles']
+    max_chain_length, max_chain_path = longest_chain_from_memo(
+        graph, analysis['chain_length'], analysis['best_prereq'])
+    components = group_components(graph, analysis['components'])
 
     # Foundational concepts
-    foundational = [(cid, label) for cid, label in concepts.items()
-                    if outdegree[cid] == 0]
+    foundational = [(graph.ids[i], graph.labels[i]) for i in range(len(graph))
+                    if outdegree[i] == 0]
 
     # Top concepts by indegree
-    top_indegree = sorted([(cid, label, indegree[cid])
-                          for cid, label in concepts.items()],
+    top_indegree = sorted([(graph.ids[i], graph.labels[i], indegree[i])
+                          for i in range(len(graph))],
                          key=lambda x: x[2], reverse=True)[:10]
 
     # Calculate average dependencies
-    total_deps = sum(len(deps) for deps in dependencies.values())
-    avg_deps = total_deps / len(dependencies) if dependencies else 0
+    with_dependencies = sum(1 for deg in outdegree if deg > 0)
+    avg_deps = graph.edge_count / with_dependencies if with_dependencies else 0
 
     # Generate markdown report
     with open(output_path, 'w', encoding='utf-8') as f:
@@ -232,7 +487,7 @@ def generate_report(csv_path: str, output_path: str):
         f.write("## Overview\n\n")
         f.write(f"- **Total Concepts**: {len(concepts)}\n")
         f.write(f"- **Foundational Concepts** (no dependencies): {len(foundational)}\n")
-        f.write(f"- **Concepts with Dependencies**: {len(dependencies)}\n")
+        f.write(f"- **Concepts with Dependencies**: {with_dependencies}\n")
         f.write(f"- **Average Dependencies per Concept**: {avg_deps:.2f}\n\n")
 
         f.write("## Graph Structure Validation\n\n")
@@ -280,7 +535,7 @@ def generate_report(csv_path: str, output_path: str):
             f.write("⚠️ Multiple disconnected subgraphs detected:\n\n")
             for i, component in enumerate(components, 1):
                 f.write(f"### Component {i} ({len(component)} concepts)\n\n")
-                for cid in sorted(list(component)[:10]):
+                for cid in sorted(component)[:10]:
                     f.write(f"- {concepts[cid]}\n")
                 if len(component) > 10:
                     f.write(f"- *...and {len(component) - 10} more*\n")
@@ -296,7 +551,7 @@ def generate_report(csv_path: str, output_path: str):
 
         f.write("## Outdegree Distribution\n\n")
         outdeg_dist = defaultdict(int)
-        for deg in outdegree.values():
+        for deg in outdegree:
             outdeg_dist[deg] += 1
 
         f.write("| Dependencies | Number of Concepts |\n")
@@ -325,16 +580,16 @@ def generate_report(csv_path: str, output_path: str):
 
 
 if __name__ == "__main__":
-    import sys
-
-    # Parse command line arguments
-    if len(sys.argv) < 3:
-        print("Usage: python analyze-graph.py <input_csv> <output_report.md>")
-        print("\nExample:")
-        print("  python analyze-graph.py learning-graph.csv quality-metrics.md")
-        sys.exit(1)
-
-    csv_path = sys.argv[1]
-    output_path = sys.argv[2]
-
-    generate_report(csv_path, output_path)
+    parser = argparse.ArgumentParser(
+        description='Generate a quality metrics report for a learning graph',
+        epilog='Example: python analyze-graph.py learning-graph.csv quality-metrics.md'
+    )
+    parser.add_argument('csv_path', help='Input learning-graph.csv')
+    parser.add_argument('output_path', help='Output markdown report')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only re-analyze concepts that changed since the last --incremental run')
+    parser.add_argument('--state', dest='state_path',
+                        help='State file for --incremental (default: .<output name>.state.json)')
+    args = parser.parse_args()
+
+    generate_report(args.csv_path, args.output_path, args.incremental, args.state_path)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark list_skills latency: in-process SkillIndex vs the subprocess path.
+
+Creates a temporary home directory with synthetic user and project skills,
+then times each output format two ways:
+
+- subprocess: what server.py used to do on every call - fork the listing
+  shell script, capture its output and re-parse/pretty-print the JSON
+- index: SkillIndex.get, which stats the known paths and returns a
+  precomputed string
+- watched: SkillIndex.get while a SkillWatcher keeps the index current,
+  a pure lookup
+
+It also times a top-5 search_skills query against the same index.
+
+The cost of a rebuild after a SKILL.md is edited is reported as well, and
+the skill names from both paths are checked against each other. Finally
+every SKILL.md is rewritten in one burst (as a git checkout would) to
+show how many index updates the watcher's debounce turns it into.
+
+Usage:
+    python benchmark-skills-lister.py
+    python benchmark-skills-lister.py --skills 500 --repeat 50 --watch poll
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from skill_index import FORMATS, SkillIndex
+from skill_watcher import WATCH_MODES, SkillWatcher
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+LIST_SCRIPT = REPO_ROOT / 'scripts' / 'bk-list-skills'
+
+# Flags the server passed to the script for each format
+SCRIPT_FLAGS = {'names-only': ['--names-only'], 'json': ['--json'], 'full': []}
+
+
+def write_skills(root: Path, count: int, prefix: str, version: int = 0):
+    """Write count skill directories with SKILL.md frontmatter under root."""
+    for i in range(count):
+        skill_dir = root / f"{prefix}-skill-{i:03d}"
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        (skill_dir / 'SKILL.md').write_text(
+            "---\n"
+            f"name: {prefix}-skill-{i:03d}\n"
+            f"description: Generates {prefix} artifact number {i} (v{version}) for an intelligent textbook. "
+            "Use this skill after the learning graph has been finalized.\n"
+            "license: MIT\n"
+            "---\n\n"
+            f"# {prefix.title()} Skill {i}\n\n" + "Workflow step.\n" * 200,
+            encoding='utf-8')
+
+
+def list_via_subprocess(script: Path, output_format: str, env, cwd) -> str:
+    """The previous server.py call path."""
+    result = subprocess.run([str(script)] + SCRIPT_FLAGS[output_format], capture_output=True,
+                            text=True, check=True, timeout=10, env=env, cwd=cwd)
+    output = result.stdout.strip()
+    if output_format == 'json':
+        output = json.dumps(json.loads(output), indent=2)
+    return output
+
+
+def best_time(func, repeat: int) -> float:
+    """Best wall-clock time of several runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark list_skills: SkillIndex vs subprocess')
+    parser.add_argument('--skills', type=int, default=40, help='Number of user skills')
+    parser.add_argument('--project-skills', type=int, default=5, help='Number of project skills')
+    parser.add_argument('--repeat', type=int, default=20, help='Calls per measurement (best time is reported)')
+    parser.add_argument('--script', type=Path, default=LIST_SCRIPT,
+                        help='Listing script for the subprocess path (takes --names-only/--json)')
+    parser.add_argument('--watch', choices=[mode for mode in WATCH_MODES if mode != 'off'], default='auto',
+                        help='SkillWatcher backend for the watched measurements')
+    parser.add_argument('--query', default='user artifact 7 textbook', help='search_skills query to time')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        home = Path(tmp) / 'home'
+        project = Path(tmp) / 'project'
+        bk_home = Path(tmp) / 'bk'
+        write_skills(home / '.claude' / 'skills', args.skills, 'user')
+        write_skills(project / '.claude' / 'skills', args.project_skills, 'project')
+        (bk_home / 'skills').mkdir(parents=True)
+        env = dict(os.environ, HOME=str(home), BK_HOME=str(bk_home))
+
+        index = SkillIndex([('user', home / '.claude' / 'skills'),
+                            ('project', project / '.claude' / 'skills')])
+
+        script_names = set(list_via_subprocess(args.script, 'names-only', env, project).splitlines())
+        index_names = set(index.get('names-only').splitlines())
+
+        rows = []
+        for output_format in FORMATS:
+            old = best_time(lambda: list_via_subprocess(args.script, output_format, env, project), args.repeat)
+            new = best_time(lambda: index.get(output_format), args.repeat)
+            rows.append((output_format, old, new))
+
+        watcher = SkillWatcher(index, mode=args.watch)
+        backend = watcher.start()
+        watched = {output_format: best_time(lambda: index.get(output_format), args.repeat)
+                   for output_format in FORMATS}
+        search = best_time(lambda: index.search(args.query, limit=5), args.repeat)
+        top = [entry['name'] for entry in index.search(args.query, limit=5)['results']]
+
+        # Burst: rewrite every user SKILL.md, then wait for the last one to show up
+        updates = watcher.updates
+        start = time.perf_counter()
+        write_skills(home / '.claude' / 'skills', args.skills, 'user', version=1)
+        last = f"user artifact number {args.skills - 1} (v1)"
+        while last not in index.outputs['json'] and time.perf_counter() - start < 30:
+            time.sleep(0.01)
+        burst = time.perf_counter() - start
+        burst_updates = watcher.updates - updates
+        watcher.stop()
+
+        # Rebuild after an edit: touch one SKILL.md, then time the next call
+        skill_md = home / '.claude' / 'skills' / 'user-skill-000' / 'SKILL.md'
+
+        def edit_and_get():
+            os.utime(skill_md, ns=(time.time_ns(), time.time_ns()))
+            index.get('names-only')
+
+        rebuild = best_time(edit_and_get, args.repeat)
+
+    print(f"Skills: {args.skills} user + {args.project_skills} project, script: {args.script}")
+    print()
+    print(f"{'Format':<12} {'subprocess (ms)':>16} {'index (ms)':>12} {'watched (ms)':>13} {'speedup':>10}")
+    print(f"{'-' * 12} {'-' * 16} {'-' * 12} {'-' * 13} {'-' * 10}")
+    for output_format, old, new in rows:
+        print(f"{output_format:<12} {old * 1e3:>16.2f} {new * 1e3:>12.3f} "
+              f"{watched[output_format] * 1e3:>13.4f} {old / new:>9.0f}x")
+    print(f"{'rebuild':<12} {'':>16} {rebuild * 1e3:>12.3f}")
+    print(f"{'search':<12} {'':>16} {'':>12} {search * 1e3:>13.4f}   top 5 for '{args.query}': {', '.join(top)}")
+    print()
+    print(f"Burst of {args.skills} SKILL.md rewrites ({backend} watcher): "
+          f"{burst_updates} index update(s), visible after {burst * 1e3:.0f} ms")
+    print()
+    if script_names == index_names:
+        print(f"✅ Both paths list the same {len(index_names)} skill names")
+    else:
+        print(f"❌ Skill names differ: only in script {sorted(script_names - index_names)[:5]}, "
+              f"only in index {sorted(index_names - script_names)[:5]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,45 @@
 #!/usr/bin/env python3
 """
 MCP Server for listing Claude skills
-Provides zero-token skill listing by executing shell script directly
+Provides zero-token skill listing from an in-process skill index
+
+The index is built once at startup from the SKILL.md frontmatter in
+~/.claude/skills and .claude/skills, and each call returns a precomputed
+string. A background SkillWatcher (inotify, or stat polling where inotify
+is unavailable) applies added, edited and removed SKILL.md files to the
+index, so answering a call is a pure memory lookup.
+
+Environment variables:
+    SKILLS_LISTER_WATCH: auto (default), inotify, poll, or off (check
+        mtimes on every call instead)
+    SKILLS_LISTER_DEBOUNCE: Seconds of quiet before changes are applied
+        (default 0.25, never delayed more than 2 seconds)
+
+Besides list_skills, search_skills ranks skills against a query (BM25 over
+names and descriptions, with trigram matching for partial or misspelled
+words) and returns one page of results, and get_skill returns a single
+skill by name.
 """
 
 import json
-import subprocess
 import os
-from pathlib import Path
+
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 import mcp.server.stdio
 
+from skill_index import FORMATS, SkillIndex
+from skill_watcher import SkillWatcher
+
+MAX_LIMIT = 50
+
 app = Server("skills-lister")
+index = SkillIndex()
+watcher = SkillWatcher(
+    index,
+    mode=os.environ.get("SKILLS_LISTER_WATCH", "auto"),
+    debounce=float(os.environ.get("SKILLS_LISTER_DEBOUNCE", "0.25"))
+)
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
@@ -33,80 +60,131 @@ async def list_tools() -> list[Tool]:
                 },
                 "required": []
             }
+        ),
+        Tool(
+            name="search_skills",
+            description="Search Claude skills by name and description and return the best matches as JSON. Use this instead of list_skills to find a skill for a task without loading the whole catalog.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Words describing the skill, e.g. 'glossary terms' (empty lists all skills)"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_LIMIT,
+                        "description": "Number of results to return",
+                        "default": 5
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "minimum": 0,
+                        "description": "Number of results to skip, for fetching the next page",
+                        "default": 0
+                    },
+                    "location": {
+                        "type": "string",
+                        "enum": ["user", "project"],
+                        "description": "Only search user (~/.claude/skills) or project (.claude/skills) skills"
+                    }
+                },
+                "required": []
+            }
+        ),
+        Tool(
+            name="get_skill",
+            description="Get one Claude skill by exact name: its description, location and directory.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string",
+                        "description": "Skill name, e.g. 'glossary-generator'"
+                    },
+                    "location": {
+                        "type": "string",
+                        "enum": ["user", "project"],
+                        "description": "Which copy to return if the skill is installed in both places"
+                    }
+                },
+                "required": ["name"]
+            }
         )
     ]
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls."""
+    if name == "search_skills":
+        return search_skills(arguments)
+    if name == "get_skill":
+        return get_skill(arguments)
     if name != "list_skills":
         raise ValueError(f"Unknown tool: {name}")
 
     # Get format from arguments (default to names-only)
     output_format = arguments.get("format", "names-only")
-
-    # Construct path to the shell script
-    script_path = os.path.expanduser("~/bin/list-skills.sh")
-
-    # Check if script exists
-    if not os.path.exists(script_path):
+    if output_format not in FORMATS:
         return [TextContent(
             type="text",
-            text=f"Error: Script not found at {script_path}"
+            text=f"Error: Unknown format '{output_format}' (expected one of: {', '.join(FORMATS)})"
         )]
 
-    # Build command with appropriate flag
-    cmd = [script_path]
-    if output_format == "json":
-        cmd.append("--json")
-    elif output_format == "names-only":
-        cmd.append("--names-only")
-    # For 'full', no flag needed
-
     try:
-        # Execute the shell script
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=10
-        )
-
-        output = result.stdout.strip()
-
-        # Format the response based on output type
-        if output_format == "json":
-            # Validate JSON and pretty-print if requested
-            try:
-                parsed = json.loads(output)
-                formatted_output = json.dumps(parsed, indent=2)
-                return [TextContent(
-                    type="text",
-                    text=formatted_output
-                )]
-            except json.JSONDecodeError:
-                return [TextContent(
-                    type="text",
-                    text=output
-                )]
-        else:
-            # Return raw output for names-only or full format
-            return [TextContent(
-                type="text",
-                text=output
-            )]
-
-    except subprocess.TimeoutExpired:
         return [TextContent(
             type="text",
-            text="Error: Script execution timed out after 10 seconds"
+            text=index.get(output_format)
         )]
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         return [TextContent(
             type="text",
-            text=f"Error executing script:\n{e.stderr}"
+            text=f"Unexpected error: {str(e)}"
         )]
+
+def search_skills(arguments: dict) -> list[TextContent]:
+    """Return one page of ranked search results as JSON."""
+    try:
+        limit = min(max(int(arguments.get("limit", 5)), 1), MAX_LIMIT)
+        offset = max(int(arguments.get("offset", 0)), 0)
+    except (TypeError, ValueError):
+        return [TextContent(type="text", text="Error: limit and offset must be integers")]
+
+    try:
+        result = index.search(
+            str(arguments.get("query", "")),
+            limit=limit,
+            offset=offset,
+            location=arguments.get("location")
+        )
+        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Unexpected error: {str(e)}"
+        )]
+
+def get_skill(arguments: dict) -> list[TextContent]:
+    """Return a single skill as JSON, with close matches if the name is unknown."""
+    skill_name = str(arguments.get("name", "")).strip()
+    if not skill_name:
+        return [TextContent(type="text", text="Error: 'name' is required")]
+
+    try:
+        skill = index.find(skill_name, location=arguments.get("location"))
+        if skill is None:
+            suggestions = [entry["name"] for entry in index.search(skill_name, limit=3)["results"]]
+            text = f"Error: No skill named '{skill_name}'"
+            if suggestions:
+                text += f" (did you mean: {', '.join(suggestions)}?)"
+            return [TextContent(type="text", text=text)]
+        return [TextContent(type="text", text=json.dumps({
+            "name": skill.name,
+            "description": skill.description,
+            "location": skill.location,
+            "path": str(skill.path)
+        }, indent=2))]
     except Exception as e:
         return [TextContent(
             type="text",
@@ -115,12 +193,16 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
 
 async def main():
     """Run the MCP server."""
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    watcher.start()
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        watcher.stop()
 
 if __name__ == "__main__":
     import asyncio
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+In-memory index of installed Claude skills for the skills-lister MCP server.
+
+Reads the YAML frontmatter of every SKILL.md under ~/.claude/skills (user)
+and .claude/skills (project) once and keeps the three list_skills outputs
+as precomputed strings. Before answering, the index re-stats the skill
+directories and SKILL.md files it knows about and only rescans when one of
+their mtimes changed, so a call costs a few stat() calls instead of forking
+a shell script.
+
+When a SkillWatcher (skill_watcher.py) is running it keeps the index
+current instead: it calls apply_changes with the paths that changed and
+turns auto_refresh off, so get() becomes a plain dictionary lookup.
+
+search() and find() answer the search_skills and get_skill tools from a
+SkillSearch inverted index (skill_search.py) rebuilt with the outputs.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from skill_search import SkillSearch
+
+FORMATS = ("names-only", "json", "full")
+
+
+@dataclass
+class Skill:
+    """One installed skill, from its SKILL.md frontmatter"""
+    name: str
+    description: str
+    location: str       # 'user' or 'project'
+    path: Path          # Skill directory
+
+
+def default_roots() -> List[Tuple[str, Path]]:
+    """The skill directories searched, as (location, path) pairs."""
+    return [
+        ("user", Path.home() / ".claude" / "skills"),
+        ("project", Path.cwd() / ".claude" / "skills"),
+    ]
+
+
+def _strip_quotes(value: str) -> str:
+    """Remove one pair of matching surrounding quotes."""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def parse_frontmatter(text: str) -> Dict[str, str]:
+    """Read the top-level scalar fields of a SKILL.md YAML frontmatter block.
+
+    Handles plain and quoted single-line values and folded (>) or literal
+    (|) block values, which is all SKILL.md files use; no YAML library is
+    needed.
+
+    Args:
+        text: Contents of a SKILL.md file
+
+    Returns:
+        Mapping of field name to value (empty if there is no frontmatter)
+    """
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != "---":
+        return {}
+
+    fields = {}
+    key = None
+    block = None    # Lines of the block value being collected
+    folded = True
+
+    for line in lines[1:]:
+        if line.strip() == "---":
+            break
+        if block is not None:
+            if line.startswith((" ", "\t")) or not line.strip():
+                block.append(line.strip())
+                continue
+            fields[key] = (" " if folded else "\n").join(part for part in block if part)
+            block = None
+
+        if line.startswith((" ", "\t", "#")) or ":" not in line:
+            continue
+        key, value = line.split(":", 1)
+        key, value = key.strip(), value.strip()
+        if value[:1] in (">", "|"):
+            block = []
+            folded = value[0] == ">"
+        else:
+            fields[key] = _strip_quotes(value)
+
+    if block is not None:
+        fields[key] = (" " if folded else "\n").join(part for part in block if part)
+    return fields
+
+
+def read_skill(skill_dir: Path, location: str) -> Optional[Skill]:
+    """Load one skill directory, or None if it has no SKILL.md."""
+    try:
+        text = (skill_dir / "SKILL.md").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    fields = parse_frontmatter(text)
+    return Skill(
+        name=fields.get("name") or skill_dir.name,
+        description=fields.get("description") or "No description available",
+        location=location,
+        path=skill_dir,
+    )
+
+
+def _mtime(path: Path) -> Optional[int]:
+    """mtime in nanoseconds, or None if the path does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class SkillIndex:
+    """Cached skill list with the list_skills outputs prebuilt"""
+
+    def __init__(self, roots: List[Tuple[str, Path]] = None):
+        """
+        Args:
+            roots: (location, directory) pairs to search (default: user then project)
+        """
+        self.roots = roots if roots is not None else default_roots()
+        self.skills: List[Skill] = []
+        self.outputs: Dict[str, str] = {}
+        self.search_index = SkillSearch([])
+        # Skills keyed by skill directory, and the (root, location) that holds each directory
+        self.by_dir: Dict[Path, Skill] = {}
+        self.dir_roots: Dict[Path, Tuple[Path, str]] = {}
+        # mtimes of the roots, every skill directory and every SKILL.md seen by the last scan
+        self.mtimes: Dict[Path, Optional[int]] = {}
+        # Stat the known paths on every get(); a SkillWatcher turns this off
+        self.auto_refresh = True
+        self.lock = threading.Lock()
+        self.rebuild()
+
+    def rebuild(self):
+        """Rescan every root directory and rebuild the outputs."""
+        with self.lock:
+            self.by_dir = {}
+            self.dir_roots = {}
+            self.mtimes = {}
+            for location, root in self.roots:
+                self._scan_root(root, location, known=())
+            self._publish()
+
+    def _scan_root(self, root: Path, location: str, known: Iterable[Path]):
+        """List a root and load new skill directories, dropping ones that are gone.
+
+        Directories in known that are still present are not re-read.
+        """
+        self.mtimes[root] = _mtime(root)
+        present = set()
+        if self.mtimes[root] is not None:
+            try:
+                entries = list(os.scandir(root))
+            except OSError:
+                entries = []
+            for entry in entries:
+                if entry.is_dir():      # Follows symlinks to installed skills
+                    present.add(Path(entry.path))
+
+        for skill_dir in [d for d, (r, _) in self.dir_roots.items() if r == root and d not in present]:
+            self._forget(skill_dir)
+        known = set(known)
+        for skill_dir in present:
+            if skill_dir not in known:
+                self._load(skill_dir, root, location)
+
+    def _load(self, skill_dir: Path, root: Path, location: str):
+        """(Re)read one skill directory and record its mtimes."""
+        self.dir_roots[skill_dir] = (root, location)
+        self.mtimes[skill_dir] = _mtime(skill_dir)
+        self.mtimes[skill_dir / "SKILL.md"] = _mtime(skill_dir / "SKILL.md")
+        skill = read_skill(skill_dir, location)
+        if skill is not None:
+            self.by_dir[skill_dir] = skill
+        else:
+            self.by_dir.pop(skill_dir, None)
+
+    def _forget(self, skill_dir: Path):
+        """Drop a skill directory that no longer exists."""
+        self.by_dir.pop(skill_dir, None)
+        self.dir_roots.pop(skill_dir, None)
+        self.mtimes.pop(skill_dir, None)
+        self.mtimes.pop(skill_dir / "SKILL.md", None)
+
+    def _publish(self):
+        """Order the skills (by root, then directory name) and rebuild the outputs."""
+        rank = {root: i for i, (_, root) in enumerate(self.roots)}
+        self.skills = sorted(self.by_dir.values(),
+                             key=lambda skill: (rank[self.dir_roots[skill.path][0]], skill.path.name))
+        # Single assignments, so readers on other threads see the old or new outputs, never a mix
+        self.search_index = SkillSearch(self.skills)
+        self.outputs = self.render_all()
+
+    def changed_paths(self, paths: Iterable[Path] = None) -> List[Path]:
+        """Directories and SKILL.md files from the last scan whose mtime changed.
+
+        Args:
+            paths: Only check these paths (default: every path from the last scan)
+        """
+        known = list(self.mtimes.items()) if paths is None else [
+            (path, self.mtimes[path]) for path in paths if path in self.mtimes]
+        return [path for path, mtime in known if _mtime(path) != mtime]
+
+    def is_stale(self) -> bool:
+        """True if any directory or SKILL.md from the last scan changed."""
+        return any(_mtime(path) != mtime for path, mtime in list(self.mtimes.items()))
+
+    def refresh(self) -> bool:
+        """Update the index if the skill directories changed since the last scan.
+
+        Returns:
+            True if anything was re-read
+        """
+        changed = self.changed_paths()
+        if changed:
+            self.apply_changes(changed)
+            return True
+        return False
+
+    def apply_changes(self, paths: Iterable[Path]):
+        """Update the index for changed paths without rescanning everything.
+
+        A root (or a path above one) relists that root: new skill
+        directories are read and removed ones dropped. A skill directory, or
+        any path inside one, re-reads just that skill's SKILL.md. Paths
+        outside every root are ignored.
+
+        Args:
+            paths: Changed files or directories, e.g. from a SkillWatcher
+        """
+        relist = {}     # root -> location
+        reload = {}     # skill_dir -> (root, location)
+        for path in paths:
+            path = Path(path)
+            for location, root in self.roots:
+                if path == root or root.is_relative_to(path):
+                    relist[root] = location
+                elif path.is_relative_to(root):
+                    reload[root / path.relative_to(root).parts[0]] = (root, location)
+
+        if not relist and not reload:
+            return
+        with self.lock:
+            for root, location in relist.items():
+                # Changed directories count as unknown, so relisting re-reads them
+                self._scan_root(root, location, self.dir_roots.keys() - reload.keys())
+            for skill_dir, (root, location) in reload.items():
+                if root in relist:
+                    continue    # Handled by the relist above
+                if skill_dir.is_dir():
+                    self._load(skill_dir, root, location)
+                else:
+                    self._forget(skill_dir)
+            self._publish()
+
+    def get(self, output_format: str) -> str:
+        """Return the prebuilt output for a format, refreshing first if needed."""
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown format: {output_format} (expected one of {', '.join(FORMATS)})")
+        if self.auto_refresh:
+            self.refresh()
+        return self.outputs[output_format]
+
+    def search(self, query: str, limit: int = 5, offset: int = 0,
+               location: Optional[str] = None) -> Dict:
+        """Rank skills by name and description for the search_skills tool.
+
+        Args:
+            query: Free text; empty pages through every skill in listing order
+            limit: Page size
+            offset: Results to skip
+            location: Only 'user' or 'project' skills
+
+        Returns:
+            {query, total, offset, limit, results: [{name, description, location, score}]}
+        """
+        if self.auto_refresh:
+            self.refresh()
+        total, page = self.search_index.search(query, limit=limit, offset=offset, location=location)
+        return {
+            "query": query,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "results": [
+                {"name": skill.name, "description": skill.description,
+                 "location": skill.location, "score": round(score, 3)}
+                for score, skill in page
+            ],
+        }
+
+    def find(self, name: str, location: Optional[str] = None) -> Optional[Skill]:
+        """Look up a skill by exact name (case-insensitive) for the get_skill tool.
+
+        Args:
+            name: Skill name
+            location: Only match skills from 'user' or 'project' (default: the first root that has it)
+
+        Returns:
+            The skill, or None if no skill has that name
+        """
+        if self.auto_refresh:
+            self.refresh()
+        matches = self.search_index.find(name)
+        if location is not None:
+            matches = [skill for skill in matches if skill.location == location]
+        return matches[0] if matches else None
+
+    def render_all(self) -> Dict[str, str]:
+        """Build the names-only, json and full outputs from the current skills."""
+        counts = {location: 0 for location, _ in self.roots}
+        for skill in self.skills:
+            counts[skill.location] = counts.get(skill.location, 0) + 1
+        searched = ", ".join(str(root) for _, root in self.roots)
+
+        if self.skills:
+            names_only = "\n".join(sorted({skill.name for skill in self.skills}))
+        else:
+            names_only = f"No skills found in: {searched}"
+
+        payload = {"total": len(self.skills)}
+        payload.update(counts)
+        payload["skills"] = [
+            {"name": skill.name, "description": skill.description, "location": skill.location}
+            for skill in self.skills
+        ]
+
+        lines = ["Available Claude Skills", "=" * 23, ""]
+        for skill in self.skills:
+            lines.append(f"📘 Skill: {skill.name} ({skill.location})")
+            lines.append(f"   Description: {skill.description}")
+            lines.append("")
+        if not self.skills:
+            lines.extend([f"No skills found in: {searched}", ""])
+        lines.append("=" * 23)
+        lines.append(f"Total skills: {len(self.skills)} ("
+                     + ", ".join(f"{location}: {count}" for location, count in counts.items()) + ")")
+
+        return {
+            "names-only": names_only,
+            "json": json.dumps(payload, indent=2),
+            "full": "\n".join(lines),
+        }
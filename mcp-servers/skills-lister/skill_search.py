@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Inverted index for searching installed skills by name and description.
+
+Built by SkillIndex whenever its skill list changes, so search_skills and
+get_skill answer from prebuilt postings:
+
+- token postings: term -> {document: BM25 weight}, where a term in the
+  skill name counts NAME_WEIGHT times a term in the description
+- trigram postings: trigram -> vocabulary terms containing it, used to
+  expand a query word to similar or longer terms ("gloss" -> "glossary",
+  "diagrams" -> "diagram") when it is misspelled or partial
+
+Matches are ranked with Okapi BM25. An expanded term contributes its BM25
+score scaled by its trigram similarity to the query word.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+NAME_WEIGHT = 3         # A name term counts as this many description terms
+BM25_K1 = 1.2
+BM25_B = 0.75
+MIN_SIMILARITY = 0.5    # Lowest trigram (Dice) similarity used to expand a query word
+PREFIX_SIMILARITY = 0.8 # Similarity given to vocabulary terms that start with the query word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric words of a name or description."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(term: str) -> Set[str]:
+    """Trigrams of a term padded with one space on each side."""
+    padded = f" {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SkillSearch:
+    """BM25 search over skill names and descriptions"""
+
+    def __init__(self, skills: list):
+        """
+        Args:
+            skills: Skill objects from SkillIndex, in listing order
+        """
+        self.skills = skills
+        self.by_name: Dict[str, list] = defaultdict(list)
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self.term_trigrams: Dict[str, Set[str]] = {}
+        self.trigram_terms: Dict[str, List[str]] = defaultdict(list)
+        lengths = []
+
+        for doc, skill in enumerate(skills):
+            self.by_name[skill.name.lower()].append(skill)
+            counts = Counter(tokenize(skill.description))
+            for term in tokenize(skill.name):
+                counts[term] += NAME_WEIGHT
+            for term, count in counts.items():
+                self.postings[term][doc] = count
+            lengths.append(sum(counts.values()))
+
+        for term in self.postings:
+            grams = trigrams(term)
+            self.term_trigrams[term] = grams
+            for gram in grams:
+                self.trigram_terms[gram].append(term)
+
+        # Replace term frequencies with their full BM25 weight, so a query only adds numbers
+        average = sum(lengths) / len(lengths) if lengths else 1.0
+        norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / average) for length in lengths]
+        for term, docs in self.postings.items():
+            idf = _idf(len(skills), len(docs))
+            for doc, frequency in docs.items():
+                docs[doc] = idf * frequency * (BM25_K1 + 1) / (frequency + norms[doc])
+        self.by_location: Dict[str, List[int]] = defaultdict(list)
+        for doc, skill in enumerate(skills):
+            self.by_location[skill.location].append(doc)
+
+    def expand(self, word: str) -> Dict[str, float]:
+        """Vocabulary terms matching a query word, with their similarity (1.0 = exact)."""
+        matches = {}
+        if word in self.postings:
+            matches[word] = 1.0
+        grams = trigrams(word)
+        shared = Counter(term for gram in grams for term in self.trigram_terms.get(gram, ()))
+        for term, overlap in shared.items():
+            if term == word:
+                continue
+            similarity = 2 * overlap / (len(grams) + len(self.term_trigrams[term]))
+            if len(word) >= 3 and term.startswith(word):
+                similarity = max(similarity, PREFIX_SIMILARITY)
+            if similarity >= MIN_SIMILARITY:
+                matches[term] = similarity
+        return matches
+
+    def search(self, query: str, limit: int = 5, offset: int = 0,
+               location: Optional[str] = None) -> Tuple[int, List[Tuple[float, object]]]:
+        """Rank skills against a query.
+
+        An empty query lists the skills in their usual order, so the same
+        call pages through the whole catalog.
+
+        Args:
+            query: Free text matched against names and descriptions
+            limit: Maximum number of results returned
+            offset: Number of ranked results skipped (for pagination)
+            location: Only return skills from 'user' or 'project'
+
+        Returns:
+            (total, results): the number of matching skills and the
+            requested page of (score, skill) pairs, best first
+        """
+        words = tokenize(query)
+        if not words:
+            docs = range(len(self.skills)) if location is None else self.by_location.get(location, [])
+            return len(docs), [(0.0, self.skills[doc]) for doc in docs[offset:offset + limit]]
+
+        allowed = None if location is None else set(self.by_location.get(location, []))
+
+        # Each query word counts once per skill, through its best-scoring expansion
+        scores: Dict[int, float] = defaultdict(float)
+        for word in dict.fromkeys(words):
+            expansions = self.expand(word)
+            if len(expansions) == 1:
+                (term, similarity), = expansions.items()
+                best = self.postings[term]
+                if similarity != 1.0:
+                    best = {doc: similarity * weight for doc, weight in best.items()}
+            else:
+                best = {}
+                for term, similarity in expansions.items():
+                    for doc, weight in self.postings[term].items():
+                        if similarity * weight > best.get(doc, 0.0):
+                            best[doc] = similarity * weight
+            if allowed is None:
+                for doc, score in best.items():
+                    scores[doc] += score
+            else:
+                for doc in allowed.intersection(best):
+                    scores[doc] += best[doc]
+
+        # Ties keep listing order
+        ranked = heapq.nsmallest(offset + limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        page = [(score, self.skills[doc]) for doc, score in ranked[offset:]]
+        return len(scores), page
+
+    def find(self, name: str) -> list:
+        """Skills whose name matches exactly (case-insensitive), user before project."""
+        return self.by_name.get(name.strip().lower(), [])
+
+
+def _idf(count: int, frequency: int) -> float:
+    """BM25 inverse document frequency (always positive)."""
+    return math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
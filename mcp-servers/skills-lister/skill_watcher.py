@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Background watcher that keeps a SkillIndex current for the skills-lister MCP server.
+
+Without a watcher, SkillIndex.get() stats every known skill directory and
+SKILL.md before answering, which grows with the number of installed
+skills. A SkillWatcher moves that work off the call path: a daemon thread
+collects changed paths and hands them to SkillIndex.apply_changes, so
+get() is a plain dictionary lookup.
+
+Two backends:
+
+- inotify (Linux, through ctypes - no extra dependency): watches each root
+  for skill directories being added or removed and each skill directory
+  for SKILL.md being written, moved or deleted. A root that does not exist
+  yet is covered by watching its nearest existing parent.
+- poll: stats the known paths every poll_interval seconds, used where
+  inotify is unavailable or its watch limit is reached.
+
+Changes are debounced: they are applied once no new event has arrived for
+`debounce` seconds, but never later than `max_delay` seconds after the
+first one, so a burst such as a git checkout rewriting hundreds of
+SKILL.md files costs one or two index updates.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from skill_index import SkillIndex
+
+WATCH_MODES = ("auto", "inotify", "poll", "off")
+
+# Flags from <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+# Roots and their missing-root stand-ins: entries appearing or disappearing
+DIR_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+# Skill directories: additionally SKILL.md being rewritten or touched
+SKILL_EVENTS = DIR_EVENTS | IN_CLOSE_WRITE | IN_ATTRIB
+
+EVENT_HEADER = struct.Struct("iIII")    # wd, mask, cookie, len
+
+
+class InotifyBackend:
+    """Reports changed skill paths from inotify events"""
+
+    name = "inotify"
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self.libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths: Dict[int, Path] = {}     # wd -> watched directory
+        self.wds: Dict[Path, int] = {}       # watched directory -> wd
+        self.skill_dirs: Set[Path] = set()
+        self.roots = []
+
+    def _add(self, path: Path, mask: int) -> bool:
+        """Watch a directory; returns False if it vanished in the meantime."""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask | IN_ONLYDIR)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if errno == 28:     # ENOSPC: fs.inotify.max_user_watches reached
+                raise OSError(errno, "inotify watch limit reached")
+            return False
+        self.paths[wd] = path
+        self.wds[path] = wd
+        return True
+
+    def sync(self, index: SkillIndex) -> Set[Path]:
+        """Watch exactly the roots and skill directories the index knows about.
+
+        Returns:
+            Directories that were not watched before (changes made to them
+            before the watch was added have not been reported)
+        """
+        self.roots = [root for _, root in index.roots]
+        wanted = {}
+        for root in self.roots:
+            if root.is_dir():
+                wanted[root] = DIR_EVENTS
+            else:
+                parent = root.parent
+                while parent != parent.parent and not parent.is_dir():
+                    parent = parent.parent
+                wanted.setdefault(parent, DIR_EVENTS)
+        self.skill_dirs = set(index.dir_roots)
+        for skill_dir in self.skill_dirs:
+            wanted[skill_dir] = SKILL_EVENTS
+
+        for path in [path for path in self.wds if path not in wanted]:
+            self.libc.inotify_rm_watch(self.fd, self.wds.pop(path))
+        added = set()
+        for path, mask in wanted.items():
+            # Re-adding an existing watch just updates its mask
+            if path not in self.wds and self._add(path, mask):
+                added.add(path)
+        return added
+
+    def wait(self, timeout: float) -> Set[Path]:
+        """Block up to timeout seconds and return the paths that changed."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: relist every root
+                changed.update(self.roots)
+                continue
+            path = self.paths.get(wd)
+            if mask & IN_IGNORED:
+                self.paths.pop(wd, None)
+                if path is not None and self.wds.get(path) == wd:
+                    del self.wds[path]
+                continue
+            if path is None:
+                continue
+            if path in self.skill_dirs and name and name != "SKILL.md":
+                continue    # Other files in a skill directory do not affect the index
+            changed.add(path / name if name else path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingBackend:
+    """Reports changed skill paths by stat-polling the index's known paths"""
+
+    name = "poll"
+
+    def __init__(self, index: SkillIndex, interval: float, stop: threading.Event):
+        self.index = index
+        self.interval = interval
+        self.stop = stop
+        self.seen: Dict[Path, Optional[int]] = {}
+
+    def sync(self, index: SkillIndex) -> Set[Path]:
+        return set()
+
+    def wait(self, timeout: float) -> Set[Path]:
+        """Sleep, then return the paths whose mtime changed since the last poll."""
+        self.stop.wait(min(timeout, self.interval))
+        changed = set()
+        seen = {}
+        for path, indexed in list(self.index.mtimes.items()):
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                current = None
+            # Report each change once, so a pending change does not look like a new burst
+            if current != self.seen.get(path, indexed):
+                changed.add(path)
+            seen[path] = current
+        self.seen = seen
+        return changed
+
+    def close(self):
+        pass
+
+
+class SkillWatcher:
+    """Keeps a SkillIndex up to date from a background thread"""
+
+    def __init__(self, index: SkillIndex, mode: str = "auto", debounce: float = 0.25,
+                 max_delay: float = 2.0, poll_interval: float = 1.0):
+        """
+        Args:
+            index: Index to keep current
+            mode: 'auto' (inotify, else polling), 'inotify', 'poll' or 'off'
+            debounce: Seconds without new events before changes are applied
+            max_delay: Upper bound in seconds between the first event and the update
+            poll_interval: Seconds between stat passes for the polling backend
+        """
+        if mode not in WATCH_MODES:
+            raise ValueError(f"Unknown watch mode: {mode} (expected one of {', '.join(WATCH_MODES)})")
+        self.index = index
+        self.mode = mode
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.backend = None
+        self.updates = 0        # Number of apply_changes calls made
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> str:
+        """Pick a backend and start the watcher thread.
+
+        Returns:
+            The backend in use: 'inotify', 'poll' or 'off'
+        """
+        if self.mode == "off":
+            return "off"
+        if self.mode in ("auto", "inotify"):
+            try:
+                self.backend = InotifyBackend()
+                self.backend.sync(self.index)
+            except OSError:
+                if self.backend is not None:
+                    self.backend.close()
+                self.backend = None
+                if self.mode == "inotify":
+                    raise
+        if self.backend is None:
+            self.backend = PollingBackend(self.index, self.poll_interval, self._stop)
+
+        # Catch anything that changed between the initial scan and the watches being added
+        self.index.refresh()
+        self.index.auto_refresh = False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="skill-watcher", daemon=True)
+        self._thread.start()
+        return self.backend.name
+
+    def stop(self):
+        """Stop the watcher thread; the index goes back to checking mtimes on every get()."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.backend.close()
+        self.backend = None
+        self.index.auto_refresh = True
+
+    def _run(self):
+        pending = set()
+        first = last = None
+        while not self._stop.is_set():
+            if pending:
+                deadline = min(last + self.debounce, first + self.max_delay)
+                timeout = max(0.0, deadline - time.monotonic())
+            else:
+                timeout = 1.0   # Wake up now and then to notice stop()
+            try:
+                changed = self.backend.wait(timeout)
+            except OSError:
+                if isinstance(self.backend, PollingBackend):
+                    raise
+                # inotify failed (e.g. watch limit): fall back to polling with a full check
+                self.backend.close()
+                self.backend = PollingBackend(self.index, self.poll_interval, self._stop)
+                changed = set(self.index.changed_paths()) | {root for _, root in self.index.roots}
+
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                if first is None:
+                    first = now
+                last = now
+            if pending and (now - last >= self.debounce or now - first >= self.max_delay):
+                self.index.apply_changes(pending)
+                self.updates += 1
+                pending = set()
+                first = last = None
+                try:
+                    added = self.backend.sync(self.index)
+                except OSError:
+                    added = set()
+                    self.backend.close()
+                    self.backend = PollingBackend(self.index, self.poll_interval, self._stop)
+                # Newly watched directories may have changed before their watch existed
+                recheck = set(self.index.changed_paths(
+                    [path for directory in added for path in (directory, directory / "SKILL.md")]))
+                if recheck:
+                    pending = recheck
+                    first = last = time.monotonic()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark SocialOverridePlugin.on_post_page over a synthetic site build.
+
+Generates rendered pages the way mkdocs-material emits them: a <head> with
+OpenGraph and Twitter meta tags pointing at the generated social card under
+/assets/images/social/, followed by a body of article content. Some pages
+have no custom image and some have no social card at all. Every page is
+then passed through on_post_page two ways:
+
+- legacy: the original implementation (two re.findall scans, then one
+  html.replace per matching tag, each copying the whole page)
+- plugin: the current single-pass re.sub in plugins/social_override.py
+
+Both must produce identical HTML for every page. With --profile the
+plugin's opt-in profiling mode is switched on, to measure its overhead
+and print the summary it would write at the end of a build.
+
+Requires mkdocs (the plugin imports mkdocs.plugins.BasePlugin).
+
+Usage:
+    python plugins/benchmark-social-override.py
+    python plugins/benchmark-social-override.py --pages 2000 --tags-per-page 20
+    python plugins/benchmark-social-override.py --profile
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from plugins.social_override import SocialOverridePlugin
+
+SITE_URL = 'https://example.github.io/intelligent-textbook/'
+FILLER = ('The learning graph connects each concept to its prerequisites so that chapters can '
+          'be ordered from foundational ideas to advanced topics. ').split()
+
+
+class Page:
+    """Stand-in for mkdocs.structure.pages.Page with only what the plugin reads"""
+
+    def __init__(self, meta, src_path):
+        self.meta = meta
+        self.file = SimpleNamespace(src_path=src_path)
+
+
+def make_page(rng: random.Random, number: int, body_words: int, tags: int, plain: bool):
+    """Build one rendered page and its Page object."""
+    slug = f"chapters/{number:04d}"
+    card = f"{SITE_URL}assets/images/social/{slug}.png"
+    head = ['<meta charset="utf-8">', f'<title>Chapter {number}</title>']
+    if not plain:
+        # mkdocs-material repeats image tags for width/height/type variants
+        for _ in range(max(1, tags // 2)):
+            head.append(f'<meta  property="og:image" content="{card}" >')
+            head.append('<meta property="og:image:type" content="image/png" >')
+            head.append(f'<meta  name="twitter:image" content="{card}" >')
+        head.append(f'<meta property="og:image" content="{SITE_URL}img/logo.png">')
+    body = ' '.join(rng.choice(FILLER) for _ in range(body_words))
+    html = (f"<!doctype html><html><head>{''.join(head)}</head>"
+            f"<body><article><h1>Chapter {number}</h1><p>{body}</p></article></body></html>")
+    meta = {} if rng.random() < 0.2 else {'image': f"img/chapter-{number}.png"}
+    return html, Page(meta, f"{slug}.md")
+
+
+def legacy_on_post_page(html, page, config):
+    """The original implementation, kept here as the benchmark baseline."""
+    if not hasattr(page, 'custom_image'):
+        return html
+
+    site_url = config['site_url'].rstrip('/')
+    image_path = '/' + page.custom_image.lstrip('/')
+    full_image_url = site_url + image_path
+
+    og_tags = re.findall(r'<meta\s+property="og:image"[^>]*?>', html)
+    for tag in og_tags:
+        if '/assets/images/social/' in tag:
+            new_tag = f'<meta property="og:image" content="{full_image_url}">'
+            html = html.replace(tag, new_tag)
+
+    twitter_tags = re.findall(r'<meta\s+name="twitter:image"[^>]*?>', html)
+    for tag in twitter_tags:
+        if '/assets/images/social/' in tag:
+            new_tag = f'<meta name="twitter:image" content="{full_image_url}">'
+            html = html.replace(tag, new_tag)
+
+    return html
+
+
+def best_time(func, repeat: int) -> float:
+    """Best wall-clock time of several runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SocialOverridePlugin.on_post_page')
+    parser.add_argument('--pages', type=int, default=2000, help='Number of pages in the synthetic site')
+    parser.add_argument('--words', type=int, default=3000, help='Words of body text per page')
+    parser.add_argument('--tags-per-page', type=int, default=2, help='Social image meta tags per page')
+    parser.add_argument('--plain-fraction', type=float, default=0.1,
+                        help='Fraction of pages without a generated social card')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best time is reported)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--profile', action='store_true', help="Enable the plugin's profiling mode")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tmp = tempfile.TemporaryDirectory()
+    config = {'site_url': SITE_URL, 'config_file_path': str(Path(tmp.name) / 'mkdocs.yml')}
+    plugin = SocialOverridePlugin()
+    plugin.load_config({'profile': args.profile})
+    plugin.on_pre_build(config)
+    site = [make_page(rng, number, args.words, args.tags_per_page, rng.random() < args.plain_fraction)
+            for number in range(args.pages)]
+    for html, page in site:
+        plugin.on_page_context({}, page, config)
+    total_bytes = sum(len(html) for html, _ in site)
+
+    mismatches = sum(1 for html, page in site
+                     if plugin.on_post_page(html, page, config) != legacy_on_post_page(html, page, config))
+
+    def run_legacy():
+        for html, page in site:
+            legacy_on_post_page(html, page, config)
+
+    def run_plugin():
+        for html, page in site:
+            plugin.on_post_page(html, page, config)
+
+    legacy = best_time(run_legacy, args.repeat)
+    plugin.on_pre_build(config)
+    current = best_time(run_plugin, args.repeat)
+
+    print(f"Site: {args.pages} pages, {total_bytes / 1e6:.1f} MB of HTML, "
+          f"{args.tags_per_page} social image tags per page")
+    print()
+    print(f"{'on_post_page':<20} {'Build (ms)':>12} {'us/page':>10}")
+    print(f"{'-' * 20} {'-' * 12} {'-' * 10}")
+    for name, seconds in (('legacy', legacy), ('single-pass re.sub', current)):
+        print(f"{name:<20} {seconds * 1e3:>12.1f} {seconds / args.pages * 1e6:>10.1f}")
+    print()
+    print(f"Speedup: {legacy / current:.2f}x")
+    if mismatches:
+        print(f"❌ {mismatches} pages differ between legacy and plugin output")
+    else:
+        print("✅ Plugin output matches the legacy implementation on every page")
+
+    if args.profile:
+        # Counters accumulate over the timed runs, so they cover repeat x pages
+        plugin.on_post_build(config)
+        summary = json.loads((Path(tmp.name) / plugin.config['profile_output']).read_text(encoding='utf-8'))
+        print()
+        print(f"Profile summary ({args.repeat} runs):")
+        print(json.dumps({key: value for key, value in summary.items() if key != 'slowest_pages'}, indent=2))
+        print("Slowest pages:")
+        for entry in summary['slowest_pages']:
+            print(f"  {entry['seconds'] * 1e3:>8.3f} ms  {entry['bytes'] / 1024:>7.1f} KB  "
+                  f"{entry['tags_rewritten']:>3} tags  {entry['page']}")
+    tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,39 +1,128 @@
+from mkdocs.config import config_options
 from mkdocs.plugins import BasePlugin
+import json
+import logging
+import os
 import re
+import time
+
+log = logging.getLogger('mkdocs.plugins.social_override')
+
+# Images generated by the Material social plugin live under this path
+SOCIAL_IMAGE_PATH = '/assets/images/social/'
+
+# OpenGraph and Twitter image meta tags, matched together so a page is scanned once
+IMAGE_META_PATTERN = re.compile(r'<meta\s+(property="og:image"|name="twitter:image")[^>]*?>')
 
 class SocialOverridePlugin(BasePlugin):
+    # Opt-in build profiling, e.g. in mkdocs.yml:
+    #   plugins:
+    #     - social_override:
+    #         profile: true
+    config_scheme = (
+        ('profile', config_options.Type(bool, default=False)),
+        ('profile_output', config_options.Type(str, default='social-override-profile.json')),
+        ('profile_top', config_options.Type(int, default=10)),
+    )
+
+    def on_pre_build(self, config, **kwargs):
+        """Reset profiling counters (mkdocs serve reuses the plugin across rebuilds)"""
+        self.hook_times = {}
+        self.page_stats = []
+        self.tags_rewritten = 0
+        self.build_start = time.perf_counter()
+
     def on_page_context(self, context, page, config, **kwargs):
         """Save custom image path from page metadata if it exists"""
+        start = time.perf_counter() if self.config['profile'] else None
         if page.meta and 'image' in page.meta:
             page.custom_image = page.meta['image']
+        if start is not None:
+            self._record_hook('on_page_context', time.perf_counter() - start)
         return context
-    
+
     def on_post_page(self, html, page, config, **kwargs):
         """Replace social plugin meta tags with our custom image"""
+        if not self.config['profile']:
+            return self._override_image_tags(html, page, config)[0]
+
+        start = time.perf_counter()
+        size = len(html)
+        html, rewritten = self._override_image_tags(html, page, config)
+        elapsed = time.perf_counter() - start
+        self._record_hook('on_post_page', elapsed)
+        self.tags_rewritten += rewritten
+        self.page_stats.append((elapsed, page.file.src_path, size, rewritten))
+        return html
+
+    def _override_image_tags(self, html, page, config):
+        """Return the page with its social card image tags replaced, and how many were replaced"""
         # Only process pages with custom image
         if not hasattr(page, 'custom_image'):
-            return html
-        
+            return html, 0
+
+        # Nothing to replace if the page has no generated social card
+        if SOCIAL_IMAGE_PATH not in html:
+            return html, 0
+
         # Build the full URL for the custom image
         site_url = config['site_url'].rstrip('/')
         image_path = '/' + page.custom_image.lstrip('/')
         full_image_url = site_url + image_path
-        
-        # Find and replace OpenGraph image tags
-        og_tags = re.findall(r'<meta\s+property="og:image"[^>]*?>', html)
-        for tag in og_tags:
-            if '/assets/images/social/' in tag:
-                new_tag = f'<meta property="og:image" content="{full_image_url}">'
-                html = html.replace(tag, new_tag)
-        
-        # Find and replace Twitter image tags
-        twitter_tags = re.findall(r'<meta\s+name="twitter:image"[^>]*?>', html)
-        for tag in twitter_tags:
-            if '/assets/images/social/' in tag:
-                new_tag = f'<meta name="twitter:image" content="{full_image_url}">'
-                html = html.replace(tag, new_tag)
-        
-        return html
+
+        # Replace OpenGraph and Twitter image tags in one pass
+        rewritten = 0
+
+        def replace_tag(match):
+            nonlocal rewritten
+            tag = match.group(0)
+            if SOCIAL_IMAGE_PATH not in tag:
+                return tag
+            rewritten += 1
+            return f'<meta {match.group(1)} content="{full_image_url}">'
+
+        return IMAGE_META_PATTERN.sub(replace_tag, html), rewritten
+
+    def _record_hook(self, hook, elapsed):
+        calls, total = self.hook_times.get(hook, (0, 0.0))
+        self.hook_times[hook] = (calls + 1, total + elapsed)
+
+    def on_post_build(self, config, **kwargs):
+        """Write the profiling summary and log the slowest pages"""
+        if not self.config['profile']:
+            return
+
+        slowest = sorted(self.page_stats, reverse=True)[:self.config['profile_top']]
+        summary = {
+            'build_seconds': round(time.perf_counter() - self.build_start, 3),
+            'hooks': {
+                hook: {'calls': calls, 'seconds': round(total, 6)}
+                for hook, (calls, total) in self.hook_times.items()
+            },
+            'pages': len(self.page_stats),
+            'bytes_processed': sum(size for _, _, size, _ in self.page_stats),
+            'tags_rewritten': self.tags_rewritten,
+            'slowest_pages': [
+                {'page': src_path, 'seconds': round(elapsed, 6), 'bytes': size, 'tags_rewritten': rewritten}
+                for elapsed, src_path, size, rewritten in slowest
+            ],
+        }
+
+        # Relative paths are relative to mkdocs.yml, so the summary stays out of site_dir
+        output = self.config['profile_output']
+        if not os.path.isabs(output):
+            output = os.path.join(os.path.dirname(config['config_file_path']), output)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+        plugin_seconds = sum(total for _, total in self.hook_times.values())
+        log.info(f"social_override: {plugin_seconds * 1000:.1f} ms in hooks over {summary['pages']} pages, "
+                 f"{summary['tags_rewritten']} tags rewritten (summary: {output})")
+        if slowest:
+            lines = [f"{'ms':>9}  {'KB':>8}  {'tags':>4}  page"]
+            for elapsed, src_path, size, rewritten in slowest:
+                lines.append(f"{elapsed * 1000:>9.3f}  {size / 1024:>8.1f}  {rewritten:>4}  {src_path}")
+            log.info("social_override: slowest pages\n" + "\n".join(lines))
 
 # Make the plugin available to MkDocs
 def get_plugin():
@@ -72,12 +72,14 @@ def add_taxonomy_to_csv(input_csv: str, output_csv: str, taxonomy_config: dict =
     Returns:
         Dictionary of taxonomy counts
     """
+    # Dependencies is copied through verbatim; only the taxonomy column is added
     rows = []
     with open(input_csv, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
             concept_id = int(row['ConceptID'])
-            concept_label = row['ConceptLabel']
+            # Support both ConceptLabel and ConceptName column names
+            concept_label = row.get('ConceptLabel') or row.get('ConceptName', '')
             taxonomy_id = assign_taxonomy(concept_id, concept_label, taxonomy_config)
 
             rows.append({
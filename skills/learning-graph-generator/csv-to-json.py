@@ -3,15 +3,20 @@
 Convert CSV Learning Graph to JSON for vis-network.js
 Converts the concept dependency CSV into the JSON format
 used by the existing graph viewer (vis.js network format).
+
+A binary snapshot of the graph (.learning-graph.snapshot) is written next to
+the JSON file so the analysis tools can load the graph without re-parsing
+the CSV or JSON.
 """
 
 VERSION = "0.02"
 
-import csv
 import json
 from typing import Dict, List
 from datetime import datetime
 
+from learning_graph import load_csv, snapshot_path, write_snapshot
+
 
 def csv_to_json(csv_path: str, json_path: str, color_config: dict = None, metadata: dict = None):
     """
@@ -98,42 +103,48 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None, metada
     edges = []
     foundational_ids = []
 
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            concept_id = int(row['ConceptID'])
-            # Support both ConceptLabel and ConceptName column names
-            label = row.get('ConceptLabel') or row.get('ConceptName', '')
-            taxonomy = row['TaxonomyID']
-            dependencies_str = row['Dependencies']
-
-            # Determine if foundational (no dependencies)
-            is_foundational = (dependencies_str == '')
-            if is_foundational:
-                foundational_ids.append(concept_id)
-
-            # Create node - use taxonomy ID directly as group reference
-            node = {
-                'id': concept_id,
-                'label': label,
-                'group': taxonomy
+    # Supports both ConceptLabel and ConceptName column names
+    graph = load_csv(csv_path, use_snapshot=False)
+    declared = graph.declared_dependencies()
+
+    for i in range(len(graph)):
+        concept_id = graph.ids[i]
+        prereq_ids = graph.prerequisite_ids(i)
+
+        # Determine if foundational (no dependencies listed, even unknown ones)
+        is_foundational = concept_id not in declared
+        if is_foundational:
+            foundational_ids.append(concept_id)
+
+        # Create node - use taxonomy ID directly as group reference
+        node = {
+            'id': concept_id,
+            'label': graph.labels[i],
+            'group': graph.taxonomies[i]
+        }
+
+        # Special styling for foundational concepts
+        if is_foundational:
+            node['shape'] = 'box'
+
+        nodes.append(node)
+
+        # Create edges (from concept to its prerequisites)
+        for prereq_id in prereq_ids:
+            edge = {
+                'from': concept_id,
+                'to': prereq_id
             }
+            edges.append(edge)
 
-            # Special styling for foundational concepts
-            if is_foundational:
-                node['shape'] = 'box'
-
-            nodes.append(node)
-
-            # Create edges (from concept to its prerequisites)
-            if dependencies_str:
-                prereq_ids = [int(pid) for pid in dependencies_str.split('|')]
-                for prereq_id in prereq_ids:
-                    edge = {
-                        'from': concept_id,
-                        'to': prereq_id
-                    }
-                    edges.append(edge)
+    if graph.missing_dependencies:
+        print(f"⚠️  Skipped {len(graph.missing_dependencies)} dependencies on unknown concept IDs:")
+        for concept_id, prereq_id in graph.missing_dependencies[:10]:
+            print(f"   - {concept_id} depends on missing {prereq_id}")
+    if graph.invalid_dependencies:
+        print(f"⚠️  Skipped {len(graph.invalid_dependencies)} Dependencies entries that are not concept IDs:")
+        for concept_id, token in graph.invalid_dependencies[:10]:
+            print(f"   - {concept_id}: {token!r}")
 
     # Create metadata section
     default_metadata = {
@@ -189,12 +200,21 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None, metada
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(graph_data, f, indent=2)
 
+    # Write the binary snapshot after the JSON so it records the final file
+    try:
+        snapshot = write_snapshot(graph, snapshot_path(json_path), [csv_path, json_path])
+    except (OSError, ValueError) as e:
+        snapshot = None
+        print(f"⚠️  Could not write graph snapshot: {e}")
+
     print(f"✅ JSON graph created: {json_path} (csv-to-json v{VERSION})")
     print(f"   - Title: {default_metadata['title']}")
     print(f"   - {len(groups)} groups/taxonomies")
     print(f"   - {len(nodes)} nodes")
     print(f"   - {len(edges)} edges")
     print(f"   - {len(foundational_ids)} foundational concepts")
+    if snapshot is not None:
+        print(f"   - Snapshot: {snapshot}")
     print(f"\nFoundational concept IDs: {foundational_ids}")
     print(f"Groups: {list(groups.keys())}")
 
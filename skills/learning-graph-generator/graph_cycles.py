@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Cycle detection engine for learning graphs.
+
+Shared by analyze-graph.py and check-loops.py. Every traversal uses an
+explicit stack, so deep graphs never hit Python's recursion limit, and the
+default mode runs in O(V+E):
+
+- strongly_connected_components: iterative Tarjan's algorithm
+- find_cycle_components: every strongly connected component that contains a
+  cycle, with a shortest representative cycle for each
+- simple_cycles: Johnson's algorithm, bounded to the first N elementary cycles
+
+Graphs are passed as a collection of nodes plus a successors mapping
+(dict or list) where successors[node] is an iterable of node ids. Every
+successor must itself be one of the nodes.
+"""
+
+from collections import defaultdict, deque
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+
+
+def strongly_connected_components(nodes: Iterable[Hashable], successors) -> List[List[Hashable]]:
+    """Find strongly connected components with an iterative Tarjan's algorithm.
+
+    Args:
+        nodes: All node ids
+        successors: Mapping from node id to an iterable of successor ids
+
+    Returns:
+        List of components in reverse topological order. Each component
+        lists its DFS root first.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in nodes:
+        if root in index:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors[root]))]
+
+        while work:
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    index[neighbor] = low[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    work.append((neighbor, iter(successors[neighbor])))
+                    break
+                if neighbor in on_stack and index[neighbor] < low[node]:
+                    low[node] = index[neighbor]
+            else:
+                # All neighbors done: propagate low-link and pop a component
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    component.reverse()
+                    components.append(component)
+
+    return components
+
+
+def shortest_cycle_through(start: Hashable, members, successors) -> List[Hashable]:
+    """Find a shortest cycle through a node using BFS inside its component.
+
+    Args:
+        start: Node the cycle must pass through
+        members: Set of nodes the search is restricted to
+        successors: Mapping from node id to an iterable of successor ids
+
+    Returns:
+        The cycle as a list of nodes starting at start (the closing edge back
+        to start is implied), or an empty list if start is not on a cycle
+    """
+    parent = {start: None}
+    queue = deque([start])
+
+    while queue:
+        node = queue.popleft()
+        for neighbor in successors[node]:
+            if neighbor == start:
+                cycle = []
+                while node is not None:
+                    cycle.append(node)
+                    node = parent[node]
+                cycle.reverse()
+                return cycle
+            if neighbor in members and neighbor not in parent:
+                parent[neighbor] = node
+                queue.append(neighbor)
+
+    return []
+
+
+def find_cycle_components(nodes: Iterable[Hashable],
+                          successors) -> List[Tuple[List[Hashable], List[Hashable]]]:
+    """Report every strongly connected component that contains a cycle.
+
+    A component is cyclic if it has more than one node or a self-loop.
+
+    Args:
+        nodes: All node ids
+        successors: Mapping from node id to an iterable of successor ids
+
+    Returns:
+        List of (component, cycle) pairs, where cycle is a shortest cycle
+        through the component's first node
+    """
+    results = []
+
+    for component in strongly_connected_components(nodes, successors):
+        start = component[0]
+        if len(component) == 1 and start not in successors[start]:
+            continue
+        cycle = shortest_cycle_through(start, set(component), successors)
+        results.append((component, cycle))
+
+    return results
+
+
+def simple_cycles(nodes: Iterable[Hashable], successors,
+                  limit: int = None) -> Iterator[List[Hashable]]:
+    """Enumerate elementary cycles with Johnson's algorithm.
+
+    Iterative version, searching one strongly connected component at a
+    time. The number of elementary cycles can grow exponentially with the
+    graph size, so pass limit to stop after the first N cycles.
+
+    Args:
+        nodes: All node ids
+        successors: Mapping from node id to an iterable of successor ids
+        limit: Maximum number of cycles to yield (None for all)
+
+    Yields:
+        Each cycle as a list of nodes (the closing edge is implied)
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    # Work on a private copy restricted to cyclic components
+    subgraph: Dict[Hashable, set] = {}
+    for component in strongly_connected_components(nodes, successors):
+        members = set(component)
+        for node in component:
+            subgraph[node] = {n for n in successors[node] if n in members}
+
+    count = 0
+
+    # Johnson's algorithm handles self-loops separately
+    for node, neighbors in subgraph.items():
+        if node in neighbors:
+            yield [node]
+            count += 1
+            if limit is not None and count >= limit:
+                return
+            neighbors.discard(node)
+
+    sccs = [c for c in strongly_connected_components(list(subgraph), subgraph) if len(c) > 1]
+
+    while sccs:
+        component = sccs.pop()
+        members = set(component)
+        start = component[0]
+
+        path = [start]
+        blocked = {start}
+        closed = set()
+        blocked_by = defaultdict(set)
+        stack = [(start, [n for n in subgraph[start] if n in members])]
+
+        while stack:
+            node, neighbors = stack[-1]
+            if neighbors:
+                neighbor = neighbors.pop()
+                if neighbor == start:
+                    yield path[:]
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+                    closed.update(path)
+                elif neighbor not in blocked:
+                    path.append(neighbor)
+                    stack.append((neighbor, [n for n in subgraph[neighbor] if n in members]))
+                    closed.discard(neighbor)
+                    blocked.add(neighbor)
+                    continue
+
+            if not neighbors:
+                if node in closed:
+                    _unblock(node, blocked, blocked_by)
+                else:
+                    for neighbor in subgraph[node]:
+                        if neighbor in members:
+                            blocked_by[neighbor].add(node)
+                stack.pop()
+                path.pop()
+
+        # Remove the start node and search what is left of the component
+        members.discard(start)
+        remaining = {node: [n for n in subgraph[node] if n in members] for node in members}
+        sccs.extend(c for c in strongly_connected_components(list(remaining), remaining)
+                    if len(c) > 1)
+
+
+def _unblock(node: Hashable, blocked: set, blocked_by: Dict[Hashable, set]):
+    """Unblock a node and, transitively, every node waiting on it."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current in blocked:
+            blocked.discard(current)
+            stack.extend(blocked_by[current])
+            blocked_by[current].clear()
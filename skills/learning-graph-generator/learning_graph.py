@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Learning Graph Core
+
+Shared loader used by analyze-graph.py, csv-to-json.py,
+taxonomy-distribution.py and check-loops.py, so that a learning graph is
+parsed in one place and held in one compact layout.
+
+A graph is loaded into a CSR (compressed sparse row) representation.
+Concepts are numbered 0..n-1 in file order, and edges live in contiguous
+array('i') offset/target arrays in both directions:
+
+- prerequisites: concept index -> indices of the concepts it depends on
+- dependents:    concept index -> indices of the concepts that depend on it
+
+The id <-> index map, labels and taxonomy IDs are kept alongside. Labels and
+taxonomy IDs are interned so repeated strings share memory.
+
+Dependencies that cannot become edges are kept for reporting rather than
+raising: ids of concepts that do not exist in missing_dependencies, and
+Dependencies tokens that are not integers in invalid_dependencies.
+
+csv-to-json.py also writes a binary snapshot of the graph next to the JSON
+file (.learning-graph.snapshot; the leading dot keeps MkDocs from copying it
+into the built site). load_csv and load_json map the snapshot with mmap and
+use its CSR arrays in place through memoryview, so a tool that runs against
+an unchanged CSV or JSON file skips parsing entirely. The snapshot
+records the size, mtime and SHA-1 of the files it was built from; if the
+file being loaded no longer matches, the snapshot is ignored and the file is
+parsed as usual.
+
+Usage:
+    from learning_graph import load_csv
+
+    graph = load_csv("learning-graph.csv")
+    for i in range(len(graph)):
+        print(graph.ids[i], graph.labels[i], list(graph.prerequisites[i]))
+"""
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Hashable, Iterable, List, Optional, Sequence, Tuple
+
+
+class Adjacency:
+    """Read-only view over one direction of a CSR edge list.
+
+    adjacency[i] returns the neighbor indices of concept i as an array slice
+    (a memoryview slice for a graph loaded from a snapshot). A view can be
+    passed anywhere a list-of-lists adjacency is expected, such as graph_cycles.
+    """
+
+    __slots__ = ('offsets', 'targets')
+
+    def __init__(self, offsets: Sequence[int], targets: Sequence[int]):
+        self.offsets = offsets
+        self.targets = targets
+
+    def __getitem__(self, i: int) -> Sequence[int]:
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def degree(self, i: int) -> int:
+        """Number of neighbors of concept i."""
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def degrees(self) -> List[int]:
+        """Number of neighbors of every concept, by index."""
+        offsets = self.offsets
+        return [offsets[i + 1] - offsets[i] for i in range(len(offsets) - 1)]
+
+
+class LearningGraph:
+    """A learning graph in compact CSR form."""
+
+    def __init__(self, ids: Sequence[Hashable], labels: List[str], taxonomies: List[str],
+                 dep_offsets: array, dep_targets: array,
+                 missing_dependencies: List[Tuple[Hashable, Hashable]] = None,
+                 dependents: Tuple[Sequence[int], Sequence[int]] = None,
+                 invalid_dependencies: List[Tuple[Hashable, str]] = None):
+        """Build the graph from forward (concept -> prerequisite) CSR arrays.
+
+        Args:
+            ids: Concept id for each index
+            labels: Concept label for each index
+            taxonomies: Taxonomy ID for each index ('' if not present)
+            dep_offsets: Offsets into dep_targets, length n + 1
+            dep_targets: Prerequisite indices
+            missing_dependencies: (concept id, prerequisite id) pairs that
+                referenced unknown concepts and were left out of the arrays
+            dependents: Precomputed reverse (offsets, targets) arrays; built
+                from the forward arrays if not given
+            invalid_dependencies: (concept id, token) pairs for Dependencies
+                tokens that are not concept ids at all
+        """
+        self.ids = ids
+        self.index = {concept_id: i for i, concept_id in enumerate(ids)}
+        self.labels = labels
+        self.taxonomies = taxonomies
+        self.missing_dependencies = missing_dependencies or []
+        self.invalid_dependencies = invalid_dependencies or []
+
+        self.prerequisites = Adjacency(dep_offsets, dep_targets)
+        if dependents is None:
+            dependents = _transpose(len(ids), dep_offsets, dep_targets)
+        self.dependents = Adjacency(*dependents)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of (resolved) dependency edges."""
+        return len(self.prerequisites.targets)
+
+    def declared_dependencies(self) -> set:
+        """Ids of concepts whose Dependencies were not empty, resolved or not."""
+        declared = {self.ids[i] for i in range(len(self)) if self.prerequisites.degree(i)}
+        declared.update(concept_id for concept_id, _ in self.missing_dependencies)
+        declared.update(concept_id for concept_id, _ in self.invalid_dependencies)
+        return declared
+
+    def prerequisite_ids(self, i: int) -> List[Hashable]:
+        """Concept ids of the prerequisites of concept i."""
+        ids = self.ids
+        return [ids[j] for j in self.prerequisites[i]]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[Hashable, str, str, Iterable[Hashable]]],
+                  invalid_dependencies: List[Tuple[Hashable, str]] = None) -> 'LearningGraph':
+        """Build a graph from (id, label, taxonomy, prerequisite ids) rows.
+
+        Prerequisites may refer to concepts that appear later. References to
+        ids that never appear are collected in missing_dependencies.
+        invalid_dependencies is stored on the graph as is (load_csv fills it
+        while the rows are read).
+        """
+        ids = []
+        labels = []
+        taxonomies = []
+        raw_dependencies = []
+        for concept_id, label, taxonomy, prereq_ids in rows:
+            ids.append(concept_id)
+            labels.append(sys.intern(label))
+            taxonomies.append(sys.intern(taxonomy))
+            raw_dependencies.append(prereq_ids)
+
+        index = {concept_id: i for i, concept_id in enumerate(ids)}
+        dep_offsets = array('i', [0])
+        dep_targets = array('i')
+        missing = []
+
+        for concept_id, prereq_ids in zip(ids, raw_dependencies):
+            for prereq_id in prereq_ids:
+                j = index.get(prereq_id)
+                if j is None:
+                    missing.append((concept_id, prereq_id))
+                else:
+                    dep_targets.append(j)
+            dep_offsets.append(len(dep_targets))
+
+        if all(type(concept_id) is int for concept_id in ids):
+            ids = array('i', ids)
+
+        return cls(ids, labels, taxonomies, dep_offsets, dep_targets, missing,
+                   invalid_dependencies=invalid_dependencies)
+
+
+def _transpose(n: int, offsets: array, targets: array) -> Tuple[array, array]:
+    """Reverse a CSR edge list with a counting sort (sources stay in order)."""
+    counts = array('i', bytes(4 * (n + 1)))
+    for target in targets:
+        counts[target + 1] += 1
+
+    rev_offsets = array('i', counts)
+    for i in range(n):
+        rev_offsets[i + 1] += rev_offsets[i]
+
+    rev_targets = array('i', bytes(4 * len(targets)))
+    fill = array('i', rev_offsets)
+    for source in range(n):
+        for k in range(offsets[source], offsets[source + 1]):
+            target = targets[k]
+            rev_targets[fill[target]] = source
+            fill[target] += 1
+
+    return rev_offsets, rev_targets
+
+
+def parse_dependencies(dependencies: str, invalid: List[str] = None) -> List[int]:
+    """Parse a pipe-delimited Dependencies cell ("1|4|7") into concept ids.
+
+    Args:
+        dependencies: The cell text
+        invalid: If given, tokens that are not integers are appended to it
+            and skipped; otherwise they raise ValueError
+    """
+    if not dependencies:
+        return []
+    if invalid is None:
+        return [int(d) for d in dependencies.split('|')]
+    ids = []
+    for token in dependencies.split('|'):
+        try:
+            ids.append(int(token))
+        except ValueError:
+            invalid.append(token)
+    return ids
+
+
+def load_csv(csv_path: str, use_snapshot: bool = True) -> LearningGraph:
+    """Load learning-graph.csv (ConceptID, ConceptLabel, Dependencies, TaxonomyID).
+
+    ConceptName is accepted in place of ConceptLabel, and TaxonomyID is
+    optional (it is added later by add-taxonomy.py). Dependencies tokens
+    that are not integers are skipped and listed in invalid_dependencies.
+
+    Args:
+        csv_path: Path to the CSV file
+        use_snapshot: If True, load from an up-to-date snapshot when one exists
+    """
+    if use_snapshot:
+        graph = load_snapshot(snapshot_path(csv_path), csv_path)
+        if graph is not None:
+            return graph
+
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        columns = {name: i for i, name in enumerate(header)}
+
+        id_col = columns['ConceptID']
+        label_col = columns.get('ConceptLabel', columns.get('ConceptName'))
+        deps_col = columns['Dependencies']
+        tax_col = columns.get('TaxonomyID')
+
+        invalid = []
+
+        def rows():
+            for row in reader:
+                if not row:
+                    continue
+                concept_id = int(row[id_col])
+                label = row[label_col] if label_col is not None else ''
+                taxonomy = row[tax_col] if tax_col is not None else ''
+                bad_tokens = []
+                prereq_ids = parse_dependencies(row[deps_col], bad_tokens)
+                invalid.extend((concept_id, token) for token in bad_tokens)
+                yield concept_id, label, taxonomy, prereq_ids
+
+        return LearningGraph.from_rows(rows(), invalid)
+
+
+def load_json(json_path: str, use_snapshot: bool = True) -> LearningGraph:
+    """Load a vis-network learning-graph.json.
+
+    Edges point from a concept to its prerequisite ("from" depends on "to"),
+    as written by csv-to-json.py.
+
+    Args:
+        json_path: Path to the JSON file
+        use_snapshot: If True, load from an up-to-date snapshot when one exists
+    """
+    if use_snapshot:
+        graph = load_snapshot(snapshot_path(json_path), json_path)
+        if graph is not None:
+            return graph
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    nodes = data.get('nodes', [])
+    dependencies = {node['id']: [] for node in nodes}
+    for edge in data.get('edges', []):
+        dependencies.setdefault(edge['from'], []).append(edge['to'])
+
+    return LearningGraph.from_rows(
+        (node['id'], node.get('label', str(node['id'])), node.get('group', ''), dependencies[node['id']])
+        for node in nodes
+    )
+
+
+# Binary snapshot format
+#
+# All integers are native-endian; the header records the byte order and the
+# snapshot is ignored on a machine that does not match. Sections follow the
+# header back to back, each a multiple of 4 bytes long, so every int32 array
+# can be cast in place from the mapped file:
+#
+#   header         SNAPSHOT_HEADER
+#   sources        source_count x SNAPSHOT_SOURCE (files the snapshot was built from)
+#   ids            int32[n]
+#   label refs     uint32[n]      index into the string pool
+#   taxonomy refs  uint32[n]      index into the string pool
+#   prerequisites  int32[n + 1] offsets, int32[edges] targets
+#   dependents     int32[n + 1] offsets, int32[edges] targets
+#   missing        int32[2 * missing_count] (concept id, prerequisite id) pairs
+#   invalid        int32[invalid_count] concept ids, uint32[invalid_count] token refs
+#   string pool    uint32[string_count + 1] offsets, UTF-8 bytes (padded to 4)
+
+SNAPSHOT_MAGIC = b'LGSNAP\0\0'
+SNAPSHOT_VERSION = 2
+SNAPSHOT_SUFFIX = '.snapshot'
+
+# magic, version, little-endian flag, nodes, edges, missing, invalid, strings, sources
+SNAPSHOT_HEADER = struct.Struct('=8sHHIIIIII')
+# source name (string pool index), size, mtime_ns, SHA-1
+SNAPSHOT_SOURCE = struct.Struct('=I4xqq20s4x')
+
+
+def snapshot_path(graph_path) -> Path:
+    """Return the (hidden) snapshot path that goes with a CSV or JSON graph file."""
+    graph_path = Path(graph_path)
+    return graph_path.with_name(f".{graph_path.stem}{SNAPSHOT_SUFFIX}")
+
+
+def _file_sha1(path) -> bytes:
+    """SHA-1 digest of a file's contents."""
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(block)
+    return sha1.digest()
+
+
+def _source_name(source, directory: Path) -> str:
+    """Name a source file relative to the snapshot's directory."""
+    return Path(os.path.relpath(os.path.abspath(source), os.path.abspath(directory))).as_posix()
+
+
+def write_snapshot(graph: LearningGraph, path, sources: Sequence) -> Path:
+    """Write a binary snapshot of a graph.
+
+    The file is written to a temporary name and moved into place, so a tool
+    that already has the old snapshot mapped keeps a consistent view.
+
+    Args:
+        graph: Graph to save (concept ids must be integers)
+        path: Snapshot file to write
+        sources: Files the graph was built from; loading any of them later
+            uses the snapshot while the file is unchanged
+
+    Returns:
+        Path of the written snapshot
+
+    Raises:
+        ValueError: If the concept ids are not 32-bit integers
+        OSError: If a source cannot be read or the snapshot cannot be written
+    """
+    path = Path(path)
+    try:
+        ids = array('i', graph.ids)
+        missing = array('i', [value for pair in graph.missing_dependencies for value in pair])
+        invalid_ids = array('i', [concept_id for concept_id, _ in graph.invalid_dependencies])
+    except (TypeError, OverflowError):
+        raise ValueError("snapshots require integer concept IDs")
+
+    strings = {}
+
+    def intern_ref(text: str) -> int:
+        return strings.setdefault(text, len(strings))
+
+    source_records = []
+    for source in sources:
+        st = os.stat(source)
+        source_records.append(SNAPSHOT_SOURCE.pack(
+            intern_ref(_source_name(source, path.parent)),
+            st.st_size, st.st_mtime_ns, _file_sha1(source)))
+
+    label_refs = array('I', [intern_ref(label) for label in graph.labels])
+    taxonomy_refs = array('I', [intern_ref(taxonomy) for taxonomy in graph.taxonomies])
+    invalid_refs = array('I', [intern_ref(token) for _, token in graph.invalid_dependencies])
+
+    encoded = [text.encode('utf-8') for text in strings]
+    string_offsets = array('I', [0])
+    for data in encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+    pool = b''.join(encoded)
+    pool += b'\0' * (-len(pool) % 4)
+
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, sys.byteorder == 'little',
+        len(graph), graph.edge_count, len(graph.missing_dependencies),
+        len(graph.invalid_dependencies), len(strings), len(source_records))
+
+    sections = [header, *source_records, ids, label_refs, taxonomy_refs,
+                array('i', graph.prerequisites.offsets), array('i', graph.prerequisites.targets),
+                array('i', graph.dependents.offsets), array('i', graph.dependents.targets),
+                missing, invalid_ids, invalid_refs, string_offsets, pool]
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            for section in sections:
+                f.write(section)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    return path
+
+
+def load_snapshot(path, source) -> Optional[LearningGraph]:
+    """Load a graph from a snapshot if it is up to date with a source file.
+
+    The snapshot is used when it records the source file with the same size
+    and mtime, or with the same SHA-1 if only the mtime changed. The CSR
+    arrays and ids are memoryviews over the mapped file; only the string pool
+    is decoded.
+
+    Args:
+        path: Snapshot file
+        source: CSV or JSON file the caller wants to load
+
+    Returns:
+        The graph, or None if the snapshot is missing, stale or unreadable
+    """
+    path = Path(path)
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    view = memoryview(mapped)
+    try:
+        graph = _read_snapshot(view, path, source)
+    except (OSError, ValueError, TypeError, struct.error, UnicodeDecodeError):
+        graph = None
+
+    if graph is None:
+        # Nothing refers to the mapping, so it can be closed right away
+        view.release()
+        mapped.close()
+    return graph
+
+
+def _read_snapshot(view: memoryview, path: Path, source) -> Optional[LearningGraph]:
+    """Parse a mapped snapshot; return None if it is stale or from another format."""
+    (magic, version, little_endian, n, edges, missing_count, invalid_count,
+     string_count, source_count) = SNAPSHOT_HEADER.unpack_from(view, 0)
+    if (magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION
+            or bool(little_endian) != (sys.byteorder == 'little')):
+        return None
+
+    position = SNAPSHOT_HEADER.size
+
+    def take(count: int, typecode: str) -> memoryview:
+        nonlocal position
+        end = position + 4 * count
+        if end > len(view):
+            raise ValueError("truncated snapshot")
+        section = view[position:end].cast(typecode)
+        position = end
+        return section
+
+    sources = [SNAPSHOT_SOURCE.unpack_from(view, position + k * SNAPSHOT_SOURCE.size)
+               for k in range(source_count)]
+    position += source_count * SNAPSHOT_SOURCE.size
+
+    ids = take(n, 'i')
+    label_refs = take(n, 'I')
+    taxonomy_refs = take(n, 'I')
+    dep_offsets = take(n + 1, 'i')
+    dep_targets = take(edges, 'i')
+    rev_offsets = take(n + 1, 'i')
+    rev_targets = take(edges, 'i')
+    missing = take(2 * missing_count, 'i')
+    invalid_ids = take(invalid_count, 'i')
+    invalid_refs = take(invalid_count, 'I')
+    string_offsets = take(string_count + 1, 'I')
+
+    pool_start = position
+    strings = [sys.intern(str(view[pool_start + string_offsets[k]:pool_start + string_offsets[k + 1]],
+                              'utf-8'))
+               for k in range(string_count)]
+
+    # Is the requested file one of the sources, and unchanged?
+    name = _source_name(source, path.parent)
+    st = os.stat(source)
+    for name_ref, size, mtime_ns, sha1 in sources:
+        if strings[name_ref] != name:
+            continue
+        if size != st.st_size:
+            return None
+        if mtime_ns != st.st_mtime_ns and sha1 != _file_sha1(source):
+            return None
+        break
+    else:
+        return None
+
+    labels = [strings[k] for k in label_refs]
+    taxonomies = [strings[k] for k in taxonomy_refs]
+    missing_dependencies = [(missing[k], missing[k + 1]) for k in range(0, len(missing), 2)]
+    invalid_dependencies = [(concept_id, strings[ref]) for concept_id, ref in zip(invalid_ids, invalid_refs)]
+
+    return LearningGraph(ids, labels, taxonomies, dep_offsets, dep_targets,
+                         missing_dependencies, dependents=(rev_offsets, rev_targets),
+                         invalid_dependencies=invalid_dependencies)
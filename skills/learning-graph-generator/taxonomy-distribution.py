@@ -6,10 +6,11 @@ Analyzes the taxonomy distribution in the concept dependency CSV
 and generates a detailed distribution report with recommendations.
 """
 
-import csv
 from collections import defaultdict
 from typing import Dict, List, Tuple
 
+from learning_graph import load_csv
+
 
 def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_names: dict = None):
     """
@@ -39,12 +40,13 @@ def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_name
     taxonomy_counts = defaultdict(int)
     taxonomy_concepts = defaultdict(list)
 
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            tax = row['TaxonomyID']
-            taxonomy_counts[tax] += 1
-            taxonomy_concepts[tax].append((int(row['ConceptID']), row['ConceptLabel']))
+    graph = load_csv(csv_path)
+    if graph.invalid_dependencies:
+        print(f"⚠️  Ignored {len(graph.invalid_dependencies)} Dependencies entries that are not concept IDs "
+              f"(first: concept {graph.invalid_dependencies[0][0]}, {graph.invalid_dependencies[0][1]!r})")
+    for concept_id, concept_label, tax in zip(graph.ids, graph.labels, graph.taxonomies):
+        taxonomy_counts[tax] += 1
+        taxonomy_concepts[tax].append((concept_id, concept_label))
 
     total_concepts = sum(taxonomy_counts.values())
 
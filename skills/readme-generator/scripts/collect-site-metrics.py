@@ -11,7 +11,10 @@ Scans a repository and collects metrics for README generation including:
 - Learning graph statistics
 
 Usage:
-    python collect-site-metrics.py [repo_path]
+    python collect-site-metrics.py [repo_path] [--no-cache]
+
+Per-file markdown counts are cached in docs/learning-graph/.metrics-cache
+so unchanged files are not re-read; --no-cache recounts everything.
 
 Output:
     JSON object with all collected metrics
@@ -21,96 +24,122 @@ import os
 import json
 import re
 import sys
+import argparse
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-def count_words_in_markdown(file_path: str) -> int:
-    """Count words in a markdown file, excluding code blocks and front matter."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+from metrics_cache import MetricsCache
+
+# Bump when a counting regex below changes so cached counts are recomputed
+METRICS_VERSION = "1"
+
+def count_words_in_markdown_text(content: str) -> int:
+    """Count words in markdown text, excluding code blocks and front matter."""
+    # Remove YAML front matter
+    content = re.sub(r'^---\s*\n.*?\n---\s*\n', '', content, flags=re.DOTALL)
 
-        # Remove YAML front matter
-        content = re.sub(r'^---\s*\n.*?\n---\s*\n', '', content, flags=re.DOTALL)
+    # Remove code blocks
+    content = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
+    content = re.sub(r'`[^`]+`', '', content)
 
-        # Remove code blocks
-        content = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
-        content = re.sub(r'`[^`]+`', '', content)
+    # Remove HTML comments
+    content = re.sub(r'<!--.*?-->', '', content, flags=re.DOTALL)
 
-        # Remove HTML comments
-        content = re.sub(r'<!--.*?-->', '', content, flags=re.DOTALL)
+    # Remove markdown links but keep text
+    content = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', content)
 
-        # Remove markdown links but keep text
-        content = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', content)
+    # Remove images
+    content = re.sub(r'!\[([^\]]*)\]\([^\)]+\)', '', content)
 
-        # Remove images
-        content = re.sub(r'!\[([^\]]*)\]\([^\)]+\)', '', content)
+    # Count words
+    words = content.split()
+    return len(words)
 
-        # Count words
-        words = content.split()
-        return len(words)
+def count_words_in_markdown(file_path: str) -> int:
+    """Count words in a markdown file, excluding code blocks and front matter."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return count_words_in_markdown_text(f.read())
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
         return 0
 
+def count_list_items_text(content: str) -> int:
+    """Count markdown list items in markdown text."""
+    # Count unordered lists (-, *, +)
+    unordered = len(re.findall(r'^\s*[-*+]\s+', content, flags=re.MULTILINE))
+    # Count ordered lists (1., 2., etc.)
+    ordered = len(re.findall(r'^\s*\d+\.\s+', content, flags=re.MULTILINE))
+
+    return unordered + ordered
+
 def count_list_items(file_path: str) -> int:
     """Count markdown list items in a file."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Count unordered lists (-, *, +)
-        unordered = len(re.findall(r'^\s*[-*+]\s+', content, flags=re.MULTILINE))
-        # Count ordered lists (1., 2., etc.)
-        ordered = len(re.findall(r'^\s*\d+\.\s+', content, flags=re.MULTILINE))
-
-        return unordered + ordered
+            return count_list_items_text(f.read())
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
         return 0
 
+def count_tables_text(content: str) -> int:
+    """Count markdown tables in markdown text."""
+    # Count table header separators (e.g., |---|---|)
+    tables = len(re.findall(r'^\|?\s*[-:]+\s*\|', content, flags=re.MULTILINE))
+    return tables
+
 def count_tables(file_path: str) -> int:
     """Count markdown tables in a file."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Count table header separators (e.g., |---|---|)
-        tables = len(re.findall(r'^\|?\s*[-:]+\s*\|', content, flags=re.MULTILINE))
-        return tables
+            return count_tables_text(f.read())
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
         return 0
 
+def count_code_blocks_text(content: str) -> int:
+    """Count code blocks in markdown text."""
+    # Count fenced code blocks
+    code_blocks = len(re.findall(r'```', content)) // 2
+    return code_blocks
+
 def count_code_blocks(file_path: str) -> int:
     """Count code blocks in a markdown file."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Count fenced code blocks
-        code_blocks = len(re.findall(r'```', content)) // 2
-        return code_blocks
+            return count_code_blocks_text(f.read())
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
         return 0
 
+def count_equations_text(content: str) -> int:
+    """Count LaTeX equations in markdown text."""
+    # Count display equations ($$...$$)
+    display = len(re.findall(r'\$\$.*?\$\$', content, flags=re.DOTALL))
+    # Count inline equations ($...$)
+    inline = len(re.findall(r'(?<!\$)\$(?!\$)[^$]+\$(?!\$)', content))
+
+    return display + inline
+
 def count_equations(file_path: str) -> int:
     """Count LaTeX equations in a markdown file."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Count display equations ($$...$$)
-        display = len(re.findall(r'\$\$.*?\$\$', content, flags=re.DOTALL))
-        # Count inline equations ($...$)
-        inline = len(re.findall(r'(?<!\$)\$(?!\$)[^$]+\$(?!\$)', content))
-
-        return display + inline
+            return count_equations_text(f.read())
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
         return 0
 
+def count_markdown_metrics(content: str) -> Dict:
+    """Run every per-file content counter over one markdown buffer."""
+    return {
+        'total_words': count_words_in_markdown_text(content),
+        'list_items': count_list_items_text(content),
+        'tables': count_tables_text(content),
+        'code_blocks': count_code_blocks_text(content),
+        'equations': count_equations_text(content)
+    }
+
 def count_quiz_questions(file_path: str) -> int:
     """Count quiz questions in a quiz markdown file."""
     try:
@@ -216,7 +245,7 @@ def get_learning_graph_metrics(repo_path: Path) -> Dict:
 
     return metrics
 
-def collect_metrics(repo_path: str = '.') -> Dict:
+def collect_metrics(repo_path: str = '.', use_cache: bool = True) -> Dict:
     """Collect all site metrics from repository."""
     repo = Path(repo_path).resolve()
     docs_path = repo / 'docs'
@@ -261,14 +290,19 @@ def collect_metrics(repo_path: str = '.') -> Dict:
         print(f"Warning: docs directory not found at {docs_path}", file=sys.stderr)
         return metrics
 
-    # Count markdown files and aggregate statistics
+    # Count markdown files and aggregate statistics (each file read at most once)
+    cache = MetricsCache(docs_path, 'collect-site-metrics', METRICS_VERSION, enabled=use_cache)
     for md_file in docs_path.rglob('*.md'):
         metrics['content']['markdown_files'] += 1
-        metrics['content']['total_words'] += count_words_in_markdown(str(md_file))
-        metrics['content']['list_items'] += count_list_items(str(md_file))
-        metrics['content']['tables'] += count_tables(str(md_file))
-        metrics['content']['code_blocks'] += count_code_blocks(str(md_file))
-        metrics['content']['equations'] += count_equations(str(md_file))
+        try:
+            file_metrics = cache.get(md_file, count_markdown_metrics)
+        except Exception as e:
+            print(f"Error reading {md_file}: {e}", file=sys.stderr)
+            continue
+        for key, value in file_metrics.items():
+            metrics['content'][key] += value
+    cache.prune_unseen()
+    cache.close()
 
     # Count chapters
     chapters_path = docs_path / 'chapters'
@@ -356,10 +390,15 @@ def format_metrics_table(metrics: Dict) -> str:
 
 def main():
     """Main entry point."""
-    repo_path = sys.argv[1] if len(sys.argv) > 1 else '.'
+    parser = argparse.ArgumentParser(description='Collect site metrics for README generation')
+    parser.add_argument('repo_path', nargs='?', default='.', help='Path to the repository (default: .)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Recount every file and ignore docs/learning-graph/.metrics-cache')
+    args = parser.parse_args()
+    repo_path = args.repo_path
 
     print(f"Collecting metrics from: {repo_path}", file=sys.stderr)
-    metrics = collect_metrics(repo_path)
+    metrics = collect_metrics(repo_path, use_cache=not args.no_cache)
 
     # Output JSON
     print(json.dumps(metrics, indent=2))
@@ -7,10 +7,20 @@ and prioritize skill development based on impact and effort.
 Supports both old format (<details>) and new format (<details markdown="1">).
 """
 import re
+import sys
 from pathlib import Path
 from collections import defaultdict
 from typing import Dict, List, Tuple
 
+# The shared <details> tokenizer lives with the diagram report scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'diagram-reports'))
+from details_tokenizer import iter_details_blocks
+
+# Old format: <details>
+# New format: <details markdown="1">
+DETAILS_OPEN_PATTERN = re.compile(r'<details(?:\s+markdown="1")?>', re.IGNORECASE)
+DETAILS_CLOSE_PATTERN = re.compile(r'</details>', re.IGNORECASE)
+
 
 def extract_details_content(docs_dir: Path) -> List[Dict]:
     """Extract all <details> tag content from chapter markdown files.
@@ -41,13 +51,10 @@ def extract_details_content(docs_dir: Path) -> List[Dict]:
             chapter_title = title_match.group(1) if title_match else chapter_dir.name
 
             # Find all <details> blocks (supports both old and new format)
-            # Old format: <details>
-            # New format: <details markdown="1">
-            details_pattern = r'<details(?:\s+markdown="1")?>(.*?)</details>'
-            matches = re.finditer(details_pattern, content, re.DOTALL | re.IGNORECASE)
+            blocks = iter_details_blocks(content, DETAILS_OPEN_PATTERN, DETAILS_CLOSE_PATTERN)
 
-            for match in matches:
-                details_content = match.group(1)
+            for block in blocks:
+                details_content = content[block.details[0]:block.details[1]]
 
                 # Extract summary
                 summary_match = re.search(r'<summary>(.*?)</summary>', details_content, re.IGNORECASE)
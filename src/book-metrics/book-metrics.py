@@ -8,14 +8,27 @@ Generates comprehensive metrics for intelligent textbooks, including:
 
 Usage:
     python book-metrics.py [docs_directory]
+
+    # Batch mode: many books over a process pool, plus a combined summary
+    python book-metrics.py book1/docs book2/docs --jobs 8
+    python book-metrics.py --manifest books.txt --summary nightly-metrics
+
+    # Recount every file instead of using learning-graph/.metrics-cache
+    python book-metrics.py docs --no-cache
 """
 
 import re
 import csv
+import json
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime
 
+from metrics_cache import MetricsCache, read_markdown_file
+
 # Version of the Book Metrics Generator
 VERSION = "0.05"
 
@@ -26,19 +39,44 @@ class BookMetricsGenerator:
     # Directories to exclude from student-facing content metrics
     EXCLUDED_DIRS = {'prompts', 'learning-graph'}
 
-    def __init__(self, docs_dir: str = "docs"):
+    # Per-file counters, compiled once and shared by the document scanner
+    DIAGRAM_PATTERN = re.compile(r'^####\s+Diagram:', re.MULTILINE)
+    DISPLAY_MATH_PATTERN = re.compile(r'\$\$[^$]+?\$\$', re.DOTALL)
+    # Negative lookahead (?!\d) ensures we don't match dollar amounts like $500
+    INLINE_MATH_PATTERN = re.compile(r'\$(?!\d)([^\$]+?)\$')
+    CODE_BLOCK_PATTERN = re.compile(r'```.*?```', re.DOTALL)
+    INLINE_CODE_PATTERN = re.compile(r'`[^`]+`')
+    URL_PATTERN = re.compile(r'https?://\S+')
+    WORD_PATTERN = re.compile(r'\b\w+\b')
+    LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+    H2_PATTERN = re.compile(r'^##\s+', re.MULTILINE)
+    H3_PATTERN = re.compile(r'^###\s+', re.MULTILINE)
+
+    FILE_METRIC_KEYS = ('diagrams', 'equations', 'words', 'links', 'sections')
+
+    # Number of files counted per task when a scan is spread over workers
+    SCAN_CHUNK_SIZE = 32
+
+    def __init__(self, docs_dir: str = "docs", use_cache: bool = True):
         """Initialize the metrics generator.
 
         Args:
             docs_dir: Path to the docs directory (default: "docs")
+            use_cache: If True, reuse per-file metrics from learning-graph/.metrics-cache
         """
         self.docs_dir = Path(docs_dir)
+        self.use_cache = use_cache
         self.chapters_dir = self.docs_dir / "chapters"
         self.learning_graph_dir = self.docs_dir / "learning-graph"
         self.sims_dir = self.docs_dir / "sims"
         self.glossary_file = self.docs_dir / "glossary.md"
         self.faq_file = self.docs_dir / "faq.md"
 
+        # Per-file result table filled by scan_documents()
+        self._file_metrics = None
+        self._chapter_files = {}
+        self._pending_scan = None
+
     def _is_excluded_path(self, path: Path) -> bool:
         """Check if a path is in an excluded directory.
 
@@ -206,42 +244,214 @@ class BookMetricsGenerator:
             print(f"Warning: Could not read {quiz_file}: {e}")
             return 0
 
-    def count_diagrams_in_file(self, markdown_file: Path) -> int:
-        """Count diagrams in a single markdown file.
+    def _read_markdown(self, markdown_file: Path) -> Optional[str]:
+        """Read a markdown file, printing a warning if it cannot be read.
 
         Args:
             markdown_file: Path to markdown file
 
         Returns:
-            Number of diagrams (H4 headers starting with "#### Diagram:")
+            File content, or None if the file could not be read
         """
         try:
             with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                return len(re.findall(r'^####\s+Diagram:', content, re.MULTILINE))
+                return f.read()
         except Exception as e:
             print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+            return None
 
-    def count_all_diagrams(self, exclude_non_content: bool = True) -> int:
-        """Count all diagrams in all markdown files.
+    @classmethod
+    def count_metrics_in_content(cls, content: str) -> Dict[str, int]:
+        """Run every per-file counter over one markdown buffer.
 
         Args:
+            content: Markdown text
+
+        Returns:
+            Dict with diagrams, equations, words, links and sections counts
+        """
+        return {
+            'diagrams': cls._count_diagrams(content),
+            'equations': cls._count_equations(content),
+            'words': cls._count_words(content),
+            'links': cls._count_links(content),
+            'sections': cls._count_sections(content),
+        }
+
+    def start_scan(self, executor: Optional[Executor] = None):
+        """Begin the single-pass scan of the docs tree.
+
+        Cached files are resolved immediately with a stat call. Files that
+        need counting are split into chunks; when an executor is given the
+        chunks are submitted to it so large books are counted in parallel
+        and several books can be in flight at once. Call finish_scan() to
+        collect the results.
+
+        Args:
+            executor: Optional executor (e.g. ProcessPoolExecutor) for counting
+        """
+        cache = MetricsCache(self.docs_dir, "book-metrics", VERSION, enabled=self.use_cache)
+        md_files = sorted(self.docs_dir.rglob('*.md'))
+
+        cached = {}
+        pending = []
+        for md_file in md_files:
+            try:
+                metrics = cache.lookup(md_file)
+            except OSError:
+                metrics = None
+            if metrics is None:
+                pending.append(md_file)
+            else:
+                cached[md_file] = metrics
+
+        chunks = [pending[i:i + self.SCAN_CHUNK_SIZE]
+                  for i in range(0, len(pending), self.SCAN_CHUNK_SIZE)]
+        if executor is None:
+            results = [scan_markdown_files(chunk) for chunk in chunks]
+        else:
+            results = [executor.submit(scan_markdown_files, chunk) for chunk in chunks]
+
+        self._pending_scan = (cache, md_files, cached, results)
+
+    def finish_scan(self) -> Dict[Path, Dict[str, int]]:
+        """Collect the results of start_scan() into the per-file result table.
+
+        Returns:
+            Dict mapping each markdown file path to its metrics dict
+        """
+        cache, md_files, file_metrics, results = self._pending_scan
+        self._pending_scan = None
+
+        for result in results:
+            if isinstance(result, Future):
+                result = result.result()
+            for md_file, metrics, st, sha1, error in result:
+                if error is not None:
+                    print(f"Warning: Could not read {md_file}: {error}")
+                    file_metrics[md_file] = dict.fromkeys(self.FILE_METRIC_KEYS, 0)
+                else:
+                    file_metrics[md_file] = metrics
+                    cache.store(md_file, st, sha1, metrics)
+
+        cache.prune_unseen()
+        cache.close()
+
+        # Index files by the chapter directory they live in
+        chapter_files = {}
+        for md_file in md_files:
+            try:
+                relative_path = md_file.relative_to(self.chapters_dir)
+            except ValueError:
+                continue
+            if len(relative_path.parts) > 1:
+                chapter_files.setdefault(relative_path.parts[0], []).append(md_file)
+
+        self._file_metrics = {md_file: file_metrics[md_file] for md_file in md_files}
+        self._chapter_files = chapter_files
+        return self._file_metrics
+
+    def scan_documents(self, refresh: bool = False,
+                       executor: Optional[Executor] = None) -> Dict[Path, Dict[str, int]]:
+        """Walk the docs tree once and count metrics for every markdown file.
+
+        Each file is read a single time and all counters run over that one
+        buffer. The result table is cached on the generator, and both the
+        book-level and chapter-level totals are aggregated from it.
+
+        Unless caching is disabled, per-file results are also kept in
+        learning-graph/.metrics-cache so unchanged files are not recounted on
+        the next run.
+
+        Args:
+            refresh: If True, rescan even if a result table already exists
+            executor: Optional executor used to count files in parallel
+
+        Returns:
+            Dict mapping each markdown file path to its metrics dict
+        """
+        if self._file_metrics is not None and not refresh:
+            return self._file_metrics
+
+        self.start_scan(executor)
+        return self.finish_scan()
+
+    def _sum_scanned_metric(self, key: str, exclude_non_content: bool = True) -> int:
+        """Sum one metric across the scanned result table.
+
+        Args:
+            key: Metric name (diagrams, equations, words, links or sections)
             exclude_non_content: If True, exclude prompts/ and learning-graph/ directories
 
         Returns:
-            Total number of diagrams
+            Total for the metric
         """
         total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
+        for md_file, metrics in self.scan_documents().items():
             if exclude_non_content and self._is_excluded_path(md_file):
                 continue
-            total += self.count_diagrams_in_file(md_file)
-
+            total += metrics[key]
         return total
 
+    @classmethod
+    def _count_diagrams(cls, content: str) -> int:
+        """Count "#### Diagram:" headers in markdown text."""
+        return len(cls.DIAGRAM_PATTERN.findall(content))
+
+    @classmethod
+    def _count_equations(cls, content: str) -> int:
+        """Count LaTeX equations in markdown text.
+
+        Display math is counted first and removed before counting inline
+        math, so $$...$$ blocks are not double-counted. Dollar amounts
+        like $500 are not counted as inline math.
+        """
+        display = len(cls.DISPLAY_MATH_PATTERN.findall(content))
+        content_no_display = cls.DISPLAY_MATH_PATTERN.sub('', content)
+        inline = len(cls.INLINE_MATH_PATTERN.findall(content_no_display))
+        return inline + display
+
+    @classmethod
+    def _count_words(cls, content: str) -> int:
+        """Count words in markdown text, excluding code and URLs."""
+        content = cls.CODE_BLOCK_PATTERN.sub('', content)
+        content = cls.INLINE_CODE_PATTERN.sub('', content)
+        content = cls.URL_PATTERN.sub('', content)
+        return sum(1 for _ in cls.WORD_PATTERN.finditer(content))
+
+    @classmethod
+    def _count_links(cls, content: str) -> int:
+        """Count markdown links [text](url) in markdown text."""
+        return len(cls.LINK_PATTERN.findall(content))
+
+    @classmethod
+    def _count_sections(cls, content: str) -> int:
+        """Count H2 and H3 headers in markdown text."""
+        return len(cls.H2_PATTERN.findall(content)) + len(cls.H3_PATTERN.findall(content))
+
+    def count_diagrams_in_file(self, markdown_file: Path) -> int:
+        """Count diagrams in a single markdown file.
+
+        Args:
+            markdown_file: Path to markdown file
+
+        Returns:
+            Number of diagrams (H4 headers starting with "#### Diagram:")
+        """
+        content = self._read_markdown(markdown_file)
+        return self._count_diagrams(content) if content is not None else 0
+
+    def count_all_diagrams(self, exclude_non_content: bool = True) -> int:
+        """Count all diagrams in all markdown files.
+
+        Args:
+            exclude_non_content: If True, exclude prompts/ and learning-graph/ directories
+
+        Returns:
+            Total number of diagrams
+        """
+        return self._sum_scanned_metric('diagrams', exclude_non_content)
+
     def count_equations_in_file(self, markdown_file: Path) -> int:
         """Count LaTeX equations in a single markdown file.
 
@@ -255,26 +465,8 @@ class BookMetricsGenerator:
         Returns:
             Number of equations (LaTeX expressions)
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-                # Count display math: $$...$$ (must come first)
-                display_matches = re.findall(r'\$\$[^$]+?\$\$', content, re.DOTALL)
-                display = len(display_matches)
-
-                # Remove all display math blocks to avoid double-counting
-                content_no_display = re.sub(r'\$\$[^$]+?\$\$', '', content, flags=re.DOTALL)
-
-                # Count inline math: $...$
-                # Negative lookahead (?!\d) ensures we don't match dollar amounts like $500
-                inline_matches = re.findall(r'\$(?!\d)([^\$]+?)\$', content_no_display)
-                inline = len(inline_matches)
-
-                return inline + display
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        content = self._read_markdown(markdown_file)
+        return self._count_equations(content) if content is not None else 0
 
     def count_all_equations(self, exclude_non_content: bool = True) -> int:
         """Count all equations in all markdown files.
@@ -285,15 +477,7 @@ class BookMetricsGenerator:
         Returns:
             Total number of equations
         """
-        total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if exclude_non_content and self._is_excluded_path(md_file):
-                continue
-            total += self.count_equations_in_file(md_file)
-
-        return total
+        return self._sum_scanned_metric('equations', exclude_non_content)
 
     def count_microsims(self) -> int:
         """Count MicroSim directories in docs/sims.
@@ -320,21 +504,8 @@ class BookMetricsGenerator:
         Returns:
             Number of words
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Remove code blocks
-                content = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
-                # Remove inline code
-                content = re.sub(r'`[^`]+`', '', content)
-                # Remove URLs
-                content = re.sub(r'https?://\S+', '', content)
-                # Count words
-                words = re.findall(r'\b\w+\b', content)
-                return len(words)
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        content = self._read_markdown(markdown_file)
+        return self._count_words(content) if content is not None else 0
 
     def count_total_words(self, exclude_non_content: bool = True) -> int:
         """Count total words in all markdown files.
@@ -345,15 +516,7 @@ class BookMetricsGenerator:
         Returns:
             Total word count
         """
-        total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if exclude_non_content and self._is_excluded_path(md_file):
-                continue
-            total += self.count_words_in_file(md_file)
-
-        return total
+        return self._sum_scanned_metric('words', exclude_non_content)
 
     def count_links_in_file(self, markdown_file: Path) -> int:
         """Count markdown links in a single file.
@@ -364,14 +527,8 @@ class BookMetricsGenerator:
         Returns:
             Number of links
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Count markdown links [text](url)
-                return len(re.findall(r'\[([^\]]+)\]\(([^)]+)\)', content))
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        content = self._read_markdown(markdown_file)
+        return self._count_links(content) if content is not None else 0
 
     def count_all_links(self, exclude_non_content: bool = True) -> int:
         """Count all links in all markdown files.
@@ -382,15 +539,7 @@ class BookMetricsGenerator:
         Returns:
             Total number of links
         """
-        total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if exclude_non_content and self._is_excluded_path(md_file):
-                continue
-            total += self.count_links_in_file(md_file)
-
-        return total
+        return self._sum_scanned_metric('links', exclude_non_content)
 
     def calculate_equivalent_pages(self, total_words: int, diagrams: int, microsims: int) -> int:
         """Calculate equivalent pages based on words, diagrams, and MicroSims.
@@ -424,15 +573,8 @@ class BookMetricsGenerator:
         Returns:
             Number of sections
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                h2_count = len(re.findall(r'^##\s+', content, re.MULTILINE))
-                h3_count = len(re.findall(r'^###\s+', content, re.MULTILINE))
-                return h2_count + h3_count
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        content = self._read_markdown(markdown_file)
+        return self._count_sections(content) if content is not None else 0
 
     def get_chapter_metrics(self, chapter: Dict[str, Any]) -> Dict[str, Any]:
         """Get metrics for a single chapter.
@@ -445,20 +587,25 @@ class BookMetricsGenerator:
         """
         index_file = chapter['index_file']
         chapter_dir = chapter['path']
+        file_metrics = self.scan_documents()
 
         # Count sections in index.md
-        sections = self.count_sections_in_file(index_file)
+        if index_file in file_metrics:
+            sections = file_metrics[index_file]['sections']
+        else:
+            sections = self.count_sections_in_file(index_file)
 
-        # Count diagrams, equations, words, and links in all markdown files in chapter directory
+        # Sum diagrams, equations, words, and links over all markdown files in chapter directory
         diagrams = 0
         equations = 0
         words = 0
         links = 0
-        for md_file in chapter_dir.rglob('*.md'):
-            diagrams += self.count_diagrams_in_file(md_file)
-            equations += self.count_equations_in_file(md_file)
-            words += self.count_words_in_file(md_file)
-            links += self.count_links_in_file(md_file)
+        for md_file in self._chapter_files.get(chapter_dir.name, []):
+            metrics = file_metrics[md_file]
+            diagrams += metrics['diagrams']
+            equations += metrics['equations']
+            words += metrics['words']
+            links += metrics['links']
 
         return {
             'number': chapter['number'],
@@ -494,28 +641,54 @@ class BookMetricsGenerator:
 
         return aggregated
 
-    def generate_book_metrics_md(self) -> str:
-        """Generate the book-metrics.md content.
+    def collect_book_metrics(self) -> Dict[str, Any]:
+        """Collect the book-level metrics shown in book-metrics.md.
 
         Returns:
-            Markdown content as string
+            Dict with overall metrics plus chapter-only totals
+            (keys prefixed with "chapter_")
         """
         # Collect all metrics (excluding non-content directories)
         chapter_count, _ = self.count_chapters()
-        concepts = self.count_concepts()
-        glossary_terms = self.count_glossary_terms()
-        faqs = self.count_faqs()
-        quiz_questions = self.count_quiz_questions()
         diagrams = self.count_all_diagrams(exclude_non_content=True)
-        equations = self.count_all_equations(exclude_non_content=True)
         microsims = self.count_microsims()
         total_words = self.count_total_words(exclude_non_content=True)
-        links = self.count_all_links(exclude_non_content=True)
-        equivalent_pages = self.calculate_equivalent_pages(total_words, diagrams, microsims)
 
         # Get chapter-aggregated metrics for comparison
         chapter_aggregated = self.get_aggregated_chapter_metrics()
 
+        return {
+            'chapters': chapter_count,
+            'concepts': self.count_concepts(),
+            'glossary_terms': self.count_glossary_terms(),
+            'faqs': self.count_faqs(),
+            'quiz_questions': self.count_quiz_questions(),
+            'microsims': microsims,
+            'diagrams': diagrams,
+            'equations': self.count_all_equations(exclude_non_content=True),
+            'words': total_words,
+            'links': self.count_all_links(exclude_non_content=True),
+            'equivalent_pages': self.calculate_equivalent_pages(total_words, diagrams, microsims),
+            'chapter_diagrams': chapter_aggregated['diagrams'],
+            'chapter_equations': chapter_aggregated['equations'],
+            'chapter_words': chapter_aggregated['words'],
+            'chapter_links': chapter_aggregated['links'],
+            'chapter_equivalent_pages': self.calculate_equivalent_pages(
+                chapter_aggregated['words'], chapter_aggregated['diagrams'], microsims),
+        }
+
+    def generate_book_metrics_md(self, metrics: Optional[Dict[str, Any]] = None) -> str:
+        """Generate the book-metrics.md content.
+
+        Args:
+            metrics: Metrics from collect_book_metrics() (collected if omitted)
+
+        Returns:
+            Markdown content as string
+        """
+        if metrics is None:
+            metrics = self.collect_book_metrics()
+
         # Get current timestamp
         timestamp = datetime.now().strftime("%B %d, %Y at %I:%M %p")
 
@@ -532,22 +705,22 @@ class BookMetricsGenerator:
         md += "|-------------|-------|------|-------|\n"
 
         # Add rows
-        md += f"| Chapters | {chapter_count} | [Chapters](../chapters/index.md) | Number of chapter directories |\n"
-        md += f"| Concepts | {concepts} | [Concept List](./concept-list.md) | Concepts from learning graph |\n"
-        md += f"| Glossary Terms | {glossary_terms} | [Glossary](../glossary.md) | Defined terms |\n"
-        md += f"| FAQs | {faqs} | [FAQ](../faq.md) | Frequently asked questions |\n"
-        md += f"| Quiz Questions | {quiz_questions} | - | Questions across all chapters |\n"
-        md += f"| MicroSims | {microsims} | [Simulations](../sims/index.md) | Interactive MicroSims |\n"
+        md += f"| Chapters | {metrics['chapters']} | [Chapters](../chapters/index.md) | Number of chapter directories |\n"
+        md += f"| Concepts | {metrics['concepts']} | [Concept List](./concept-list.md) | Concepts from learning graph |\n"
+        md += f"| Glossary Terms | {metrics['glossary_terms']} | [Glossary](../glossary.md) | Defined terms |\n"
+        md += f"| FAQs | {metrics['faqs']} | [FAQ](../faq.md) | Frequently asked questions |\n"
+        md += f"| Quiz Questions | {metrics['quiz_questions']} | - | Questions across all chapters |\n"
+        md += f"| MicroSims | {metrics['microsims']} | [Simulations](../sims/index.md) | Interactive MicroSims |\n"
 
         md += "\n## Student-Facing Content Metrics\n\n"
         md += "Excludes administrative directories (`prompts/`, `learning-graph/`).\n\n"
         md += "| Metric Name | All Content | Chapters Only | Notes |\n"
         md += "|-------------|-------------|---------------|-------|\n"
-        md += f"| Diagrams | {diagrams} | {chapter_aggregated['diagrams']} | H4 headers starting with '#### Diagram:' |\n"
-        md += f"| Equations | {equations} | {chapter_aggregated['equations']} | LaTeX expressions (inline and display) |\n"
-        md += f"| Total Words | {total_words:,} | {chapter_aggregated['words']:,} | Words in markdown files |\n"
-        md += f"| Links | {links} | {chapter_aggregated['links']} | Hyperlinks in markdown format |\n"
-        md += f"| Equivalent Pages | {equivalent_pages} | {self.calculate_equivalent_pages(chapter_aggregated['words'], chapter_aggregated['diagrams'], microsims)} | Estimated pages (250 words/page + visuals) |\n"
+        md += f"| Diagrams | {metrics['diagrams']} | {metrics['chapter_diagrams']} | H4 headers starting with '#### Diagram:' |\n"
+        md += f"| Equations | {metrics['equations']} | {metrics['chapter_equations']} | LaTeX expressions (inline and display) |\n"
+        md += f"| Total Words | {metrics['words']:,} | {metrics['chapter_words']:,} | Words in markdown files |\n"
+        md += f"| Links | {metrics['links']} | {metrics['chapter_links']} | Hyperlinks in markdown format |\n"
+        md += f"| Equivalent Pages | {metrics['equivalent_pages']} | {metrics['chapter_equivalent_pages']} | Estimated pages (250 words/page + visuals) |\n"
 
         md += "\n## Metrics Explanation\n\n"
         md += "### Structural Metrics\n\n"
@@ -619,11 +792,14 @@ class BookMetricsGenerator:
 
         return md
 
-    def generate_metrics(self, output_dir: Path = None):
+    def generate_metrics(self, output_dir: Path = None) -> Dict[str, Any]:
         """Generate both metrics files.
 
         Args:
             output_dir: Directory to write files to (defaults to learning-graph directory)
+
+        Returns:
+            The book-level metrics dict written to book-metrics.md
         """
         if output_dir is None:
             output_dir = self.learning_graph_dir
@@ -632,7 +808,8 @@ class BookMetricsGenerator:
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Generate book metrics
-        book_metrics_content = self.generate_book_metrics_md()
+        metrics = self.collect_book_metrics()
+        book_metrics_content = self.generate_book_metrics_md(metrics)
         book_metrics_file = output_dir / "book-metrics.md"
         with open(book_metrics_file, 'w', encoding='utf-8') as f:
             f.write(book_metrics_content)
@@ -645,13 +822,173 @@ class BookMetricsGenerator:
             f.write(chapter_metrics_content)
         print(f"✅ Generated {chapter_metrics_file}")
 
+        return metrics
+
+def scan_markdown_files(paths: List[Path]) -> List[Tuple[Path, Any, Any, Any, Any]]:
+    """Read and count a chunk of markdown files.
+
+    This is the unit of work handed to worker processes, so it only uses
+    module-level names and returns plain picklable values.
+
+    Args:
+        paths: Markdown files to count
+
+    Returns:
+        List of (path, metrics, stat_result, sha1, error) tuples; error is a
+        message string when the file could not be read, otherwise None
+    """
+    results = []
+    for path in paths:
+        try:
+            text, st, sha1 = read_markdown_file(path)
+        except Exception as e:
+            results.append((path, None, None, None, str(e)))
+            continue
+        metrics = BookMetricsGenerator.count_metrics_in_content(text)
+        results.append((path, metrics, st, sha1, None))
+    return results
+
+
+def read_manifest(manifest_file: Path) -> List[str]:
+    """Read a manifest listing one docs directory per line.
+
+    Blank lines and lines starting with '#' are ignored. Relative paths are
+    resolved against the manifest's directory.
+
+    Args:
+        manifest_file: Path to the manifest file
+
+    Returns:
+        List of docs directory paths
+    """
+    docs_dirs = []
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            path = Path(line).expanduser()
+            if not path.is_absolute():
+                path = manifest_file.parent / path
+            docs_dirs.append(str(path))
+    return docs_dirs
+
+
+def run_batch(docs_dirs: List[str], jobs: int = None, use_cache: bool = True,
+              summary_file: Path = None) -> List[Dict[str, Any]]:
+    """Generate metrics for many books over one shared process pool.
+
+    Every book's file scan is submitted before any result is awaited, so
+    small books run side by side and large books are split into chunks of
+    SCAN_CHUNK_SIZE files. Reports are then written book by book, and a
+    combined summary is written as JSON and CSV.
+
+    Args:
+        docs_dirs: Docs directories, one per book
+        jobs: Number of worker processes (default: CPU count)
+        use_cache: If True, reuse per-file metrics from each book's cache
+        summary_file: Summary path; ".json" and ".csv" files are written
+
+    Returns:
+        List of per-book summary rows
+    """
+    start_time = time.perf_counter()
+    rows = []
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        generators = []
+        for docs_dir in docs_dirs:
+            generator = BookMetricsGenerator(docs_dir, use_cache=use_cache)
+            if not generator.docs_dir.is_dir():
+                print(f"❌ Error: Directory '{docs_dir}' does not exist")
+                rows.append({'docs_dir': docs_dir, 'status': 'missing'})
+                continue
+            generator.start_scan(executor)
+            generators.append(generator)
+
+        for generator in generators:
+            print(f"\n📘 {generator.docs_dir}")
+            row = {'docs_dir': str(generator.docs_dir), 'status': 'ok'}
+            try:
+                generator.finish_scan()
+                row['markdown_files'] = len(generator.scan_documents())
+                row.update(generator.generate_metrics())
+            except Exception as e:
+                print(f"❌ Error: Could not generate metrics for {generator.docs_dir}: {e}")
+                row['status'] = f"error: {e}"
+            rows.append(row)
+
+    elapsed = time.perf_counter() - start_time
+    total_files = sum(row.get('markdown_files', 0) for row in rows)
+
+    if summary_file is not None:
+        write_batch_summary(rows, summary_file)
+
+    print(f"\n✅ Processed {len(rows)} books ({total_files:,} markdown files) "
+          f"in {elapsed:.2f}s with {jobs or os.cpu_count()} workers")
+    return rows
+
+
+def write_batch_summary(rows: List[Dict[str, Any]], summary_file: Path):
+    """Write the combined batch summary as JSON and CSV.
+
+    Args:
+        rows: Per-book summary rows from run_batch()
+        summary_file: Summary path; its suffix is replaced by .json and .csv
+    """
+    summary_file = Path(summary_file)
+    json_file = summary_file.with_suffix('.json')
+    csv_file = summary_file.with_suffix('.csv')
+
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generator': f"Book Metrics Python Program v{VERSION}",
+            'generated_on': datetime.now().isoformat(timespec='seconds'),
+            'books': rows
+        }, f, indent=2)
+    print(f"✅ Generated {json_file}")
+
+    fieldnames = []
+    for row in rows:
+        for key in row:
+            if key not in fieldnames:
+                fieldnames.append(key)
+    with open(csv_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"✅ Generated {csv_file}")
+
 
 def main():
     """Main entry point."""
     import sys
-
-    # Get docs directory from command line or use default
-    docs_dir = sys.argv[1] if len(sys.argv) > 1 else "docs"
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate book and chapter metrics')
+    parser.add_argument('docs_dirs', nargs='*', metavar='docs_dir',
+                        help='Path to a docs directory (default: docs); pass several for batch mode')
+    parser.add_argument('--manifest', type=Path,
+                        help='File listing one docs directory per line (batch mode)')
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='Number of worker processes (default: CPU count; enables batch mode)')
+    parser.add_argument('--summary', type=Path, default=Path('book-metrics-summary'),
+                        help='Batch summary path; .json and .csv are written (default: book-metrics-summary)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Recount every file and ignore learning-graph/.metrics-cache')
+    args = parser.parse_args()
+
+    docs_dirs = list(args.docs_dirs)
+    if args.manifest:
+        docs_dirs.extend(read_manifest(args.manifest))
+
+    # Batch mode: several books, a manifest, or an explicit worker count
+    if len(docs_dirs) > 1 or args.manifest or args.jobs:
+        rows = run_batch(docs_dirs or ["docs"], jobs=args.jobs,
+                         use_cache=not args.no_cache, summary_file=args.summary)
+        sys.exit(0 if all(row['status'] == 'ok' for row in rows) else 1)
+
+    docs_dir = docs_dirs[0] if docs_dirs else "docs"
 
     # Check if docs directory exists
     if not Path(docs_dir).exists():
@@ -659,7 +996,7 @@ def main():
         sys.exit(1)
 
     # Generate metrics
-    generator = BookMetricsGenerator(docs_dir)
+    generator = BookMetricsGenerator(docs_dir, use_cache=not args.no_cache)
     generator.generate_metrics()
 
     print(f"\n✅ Book metrics generation version {VERSION} complete!")
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Metrics Cache
+
+Persistent per-file cache for markdown metrics shared by the book metrics,
+book status and site metrics scripts. Each entry is keyed by the file path
+relative to the docs directory and validated against the file's mtime, size
+and SHA-1 content hash, so unchanged files are never re-read.
+
+Entries are grouped by namespace (one per script) and every namespace carries
+a version stamp. When a script's version changes (for example because one of
+its counting regexes changed), the old entries for that namespace are dropped.
+
+The cache lives in docs/learning-graph/.metrics-cache/ and is only used when
+docs/learning-graph/ already exists, so running a report never creates
+directories in a book that does not have them yet. The cache directory gets
+its own .gitignore so the SQLite file is never committed with the book.
+
+Usage:
+    cache = MetricsCache(docs_dir, namespace="book-metrics", version=VERSION)
+    metrics = cache.get(md_file, count_metrics_in_content)
+    cache.close()
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+# Bump when the on-disk layout changes
+SCHEMA_VERSION = "1"
+
+CACHE_DIR_NAME = ".metrics-cache"
+CACHE_FILE_NAME = "file-metrics.sqlite"
+
+
+def read_markdown_bytes(data: bytes) -> str:
+    """Decode markdown bytes the same way open(..., 'r', encoding='utf-8') would.
+
+    Args:
+        data: Raw file bytes
+
+    Returns:
+        Decoded text with universal newlines applied
+    """
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def file_sha1(path) -> str:
+    """Return the SHA-1 hex digest of a file's bytes."""
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def read_markdown_file(path) -> Tuple[str, os.stat_result, str]:
+    """Read a markdown file once and return what the cache needs to store it.
+
+    Args:
+        path: Path to the markdown file
+
+    Returns:
+        Tuple of (decoded text, stat result, SHA-1 hex digest of the bytes)
+    """
+    st = os.stat(path)
+    data = Path(path).read_bytes()
+    return read_markdown_bytes(data), st, hashlib.sha1(data).hexdigest()
+
+
+class MetricsCache:
+    """On-disk cache of per-file markdown metrics."""
+
+    def __init__(self, docs_dir, namespace: str, version: str, enabled: bool = True):
+        """Open (or create) the cache for a docs directory.
+
+        Args:
+            docs_dir: Path to the docs directory
+            namespace: Name of the script that owns the entries
+            version: Version stamp; entries with a different stamp are discarded
+            enabled: If False, every lookup recomputes and nothing is written
+        """
+        self.docs_dir = Path(docs_dir)
+        self.namespace = namespace
+        self.version = f"{SCHEMA_VERSION}:{version}"
+        self.cache_dir = self.docs_dir / "learning-graph" / CACHE_DIR_NAME
+        self.enabled = enabled and self.cache_dir.parent.is_dir()
+
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = None
+        self._entries = {}
+        self._dirty = {}
+        self._seen = set()
+
+        if self.enabled:
+            try:
+                self._open()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: Metrics cache disabled: {e}", file=sys.stderr)
+                self.enabled = False
+                self._conn = None
+
+    def _open(self):
+        """Connect to the SQLite file and load this namespace's entries."""
+        self.cache_dir.mkdir(exist_ok=True)
+        gitignore = self.cache_dir / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("*\n")
+        self._conn = sqlite3.connect(str(self.cache_dir / CACHE_FILE_NAME))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS versions ("
+            "namespace TEXT PRIMARY KEY, version TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "namespace TEXT NOT NULL, path TEXT NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, "
+            "sha1 TEXT NOT NULL, metrics TEXT NOT NULL, "
+            "PRIMARY KEY (namespace, path))"
+        )
+
+        row = self._conn.execute(
+            "SELECT version FROM versions WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        if row is None or row[0] != self.version:
+            # Counters changed since these entries were written
+            self._conn.execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO versions (namespace, version) VALUES (?, ?)",
+                (self.namespace, self.version)
+            )
+            self._conn.commit()
+            return
+
+        for path, mtime_ns, size, sha1, metrics in self._conn.execute(
+            "SELECT path, mtime_ns, size, sha1, metrics FROM entries WHERE namespace = ?",
+            (self.namespace,)
+        ):
+            self._entries[path] = (mtime_ns, size, sha1, json.loads(metrics))
+
+    def _key(self, path: Path) -> str:
+        """Return the cache key for a file (path relative to the docs directory)."""
+        try:
+            return Path(path).relative_to(self.docs_dir).as_posix()
+        except ValueError:
+            return Path(os.path.abspath(path)).as_posix()
+
+    def get(self, path: Path, compute: Callable[[str], Dict]) -> Dict:
+        """Return cached metrics for a file, computing them on a miss.
+
+        The file is not opened at all when its mtime and size match the cached
+        entry. If only the mtime changed but the content hash still matches,
+        the entry is refreshed without recomputing.
+
+        Args:
+            path: Path to the markdown file
+            compute: Function that takes the file text and returns a metrics dict
+
+        Returns:
+            Metrics dict for the file
+
+        Raises:
+            OSError, UnicodeDecodeError: If the file cannot be read on a miss
+        """
+        metrics = self.lookup(path)
+        if metrics is not None:
+            return metrics
+
+        text, st, sha1 = read_markdown_file(path)
+        metrics = compute(text)
+        self.store(path, st, sha1, metrics)
+        return metrics
+
+    def lookup(self, path: Path) -> Optional[Dict]:
+        """Return cached metrics if the file is unchanged.
+
+        A file whose mtime and size match the entry is not opened at all.
+        If only the mtime changed (for example after a git checkout), the file
+        is read and its SHA-1 compared with the entry; on a match the entry's
+        mtime is refreshed and the cached metrics are returned. Callers that
+        compute metrics themselves (for example in worker processes) should
+        pass the result to store() on a miss.
+
+        Args:
+            path: Path to the markdown file
+
+        Returns:
+            Cached metrics dict, or None on a miss
+        """
+        if not self.enabled:
+            self.misses += 1
+            return None
+
+        key = self._key(path)
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            st = os.stat(path)
+            if entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self.hits += 1
+                return entry[3]
+            if entry[1] == st.st_size and file_sha1(path) == entry[2]:
+                # Touched but unchanged: refresh the mtime without recomputing
+                self.store(path, st, entry[2], entry[3])
+                self.hits += 1
+                return entry[3]
+
+        self.misses += 1
+        return None
+
+    def store(self, path: Path, st: os.stat_result, sha1: str, metrics: Dict):
+        """Record freshly computed metrics for a file.
+
+        Args:
+            path: Path to the markdown file
+            st: Stat result taken before the file was read
+            sha1: SHA-1 hex digest of the file bytes
+            metrics: Metrics dict computed from the file
+        """
+        if not self.enabled:
+            return
+        key = self._key(path)
+        self._seen.add(key)
+        self._entries[key] = (st.st_mtime_ns, st.st_size, sha1, metrics)
+        self._dirty[key] = self._entries[key]
+
+    def prune_unseen(self):
+        """Forget entries for files that were not looked up during this run.
+
+        Call this after a full scan of the docs tree so deleted files do not
+        accumulate in the cache.
+        """
+        if not self.enabled:
+            return
+        stale = [key for key in self._entries if key not in self._seen]
+        for key in stale:
+            del self._entries[key]
+            self._dirty.pop(key, None)
+        if stale:
+            self._conn.executemany(
+                "DELETE FROM entries WHERE namespace = ? AND path = ?",
+                [(self.namespace, key) for key in stale]
+            )
+
+    def close(self):
+        """Write new and refreshed entries to disk and close the database."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries "
+                "(namespace, path, mtime_ns, size, sha1, metrics) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (self.namespace, key, mtime_ns, size, sha1, json.dumps(metrics))
+                    for key, (mtime_ns, size, sha1, metrics) in self._dirty.items()
+                ]
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not write metrics cache: {e}", file=sys.stderr)
+        finally:
+            self._conn.close()
+            self._conn = None
+            self._dirty = {}
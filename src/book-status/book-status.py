@@ -7,17 +7,29 @@ for required files, directories, and content. It provides a visual checklist
 with green checkmarks for completed items and red X marks for missing items.
 
 Usage:
-    python book-status.py [path_to_book]
+    python book-status.py [path_to_book] [--no-cache]
 
-If no path is provided, uses current working directory.
+If no path is provided, uses current working directory. Per-file word and
+header counts are cached in docs/learning-graph/.metrics-cache; pass
+--no-cache to re-read every file.
 """
 
 import os
 import sys
 import re
 import glob
+import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'book-metrics'))
+from metrics_cache import MetricsCache
+
+# Bump when a counting regex below changes so cached counts are recomputed
+METRICS_VERSION = "1"
+
+# Per-file metrics cache, opened in main()
+metrics_cache = None
+
 # ANSI color codes for terminal output
 GREEN = '\033[92m'
 RED = '\033[91m'
@@ -69,23 +81,37 @@ def check_yaml_frontmatter(file_path: Path, key: str) -> tuple[bool, any]:
     except Exception:
         return False, None
 
-def count_words_in_file(file_path: Path) -> int:
-    """Count words in a markdown file (excluding frontmatter)."""
+def count_file_metrics(content: str) -> dict:
+    """Count words, headers and references in markdown text."""
+    # Count words (excluding frontmatter)
+    body = content
+    if body.startswith('---'):
+        parts = body.split('---', 2)
+        if len(parts) >= 3:
+            body = parts[2]
+
+    return {
+        'words': len(re.findall(r'\b\w+\b', body)),
+        'h3_headers': len(re.findall(r'^###\s+', content, re.MULTILINE)),
+        'h4_headers': len(re.findall(r'^####\s+', content, re.MULTILINE)),
+        'references': len(re.findall(r'^\d+\.\s+\[', content, re.MULTILINE)),
+        'reference_links': len(re.findall(r'\d+\.\s+\[.+\]\(https?://.+\)', content)),
+    }
+
+def get_file_metrics(file_path: Path) -> dict:
+    """Return metrics for a markdown file, using the metrics cache when open."""
     try:
+        if metrics_cache is not None:
+            return metrics_cache.get(file_path, count_file_metrics)
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Remove YAML frontmatter
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                content = parts[2]
-
-        # Count words
-        words = re.findall(r'\b\w+\b', content)
-        return len(words)
+            return count_file_metrics(f.read())
     except Exception:
-        return 0
+        return None
+
+def count_words_in_file(file_path: Path) -> int:
+    """Count words in a markdown file (excluding frontmatter)."""
+    metrics = get_file_metrics(file_path)
+    return metrics['words'] if metrics else 0
 
 def check_file_has_content(file_path: Path, min_words: int = 100) -> bool:
     """Check if a file has meaningful content (more than min_words)."""
@@ -121,21 +147,22 @@ def check_microsims(docs_path: Path) -> tuple[bool, int]:
 
 def check_references_in_file(file_path: Path) -> bool:
     """Check if a file contains references (numbered list with links)."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Look for numbered references with URLs
-        pattern = r'\d+\.\s+\[.+\]\(https?://.+\)'
-        matches = re.findall(pattern, content)
-        return len(matches) >= 3  # At least 3 references
-    except Exception:
-        return False
+    # Look for numbered references with URLs
+    metrics = get_file_metrics(file_path)
+    return metrics is not None and metrics['reference_links'] >= 3  # At least 3 references
 
 def main():
+    global metrics_cache
+
+    parser = argparse.ArgumentParser(description='Check the status of an intelligent textbook project')
+    parser.add_argument('book_path', nargs='?', help='Path to the book (default: current directory)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-read every file and ignore docs/learning-graph/.metrics-cache')
+    args = parser.parse_args()
+
     # Determine book path
-    if len(sys.argv) > 1:
-        book_path = Path(sys.argv[1]).resolve()
+    if args.book_path:
+        book_path = Path(args.book_path).resolve()
     else:
         book_path = Path.cwd()
 
@@ -182,6 +209,7 @@ def main():
         sys.exit(1)
 
     status['is_book'] = True
+    metrics_cache = MetricsCache(docs_path, 'book-status', METRICS_VERSION, enabled=not args.no_cache)
 
     # ─────────────────────────────────────────────────────────────
     # CHECK 2: Course Description
@@ -292,13 +320,9 @@ def main():
         print_status(has_content, "Glossary has substantial content (1000+ words)")
 
         # Count glossary terms (#### headers)
-        try:
-            with open(glossary, 'r') as f:
-                content = f.read()
-            terms = len(re.findall(r'^####\s+', content, re.MULTILINE))
-            print(f"      {YELLOW}Glossary terms: {terms}{RESET}")
-        except Exception:
-            pass
+        metrics = get_file_metrics(glossary)
+        if metrics:
+            print(f"      {YELLOW}Glossary terms: {metrics['h4_headers']}{RESET}")
 
     # ─────────────────────────────────────────────────────────────
     # CHECK 6: FAQ
@@ -315,13 +339,9 @@ def main():
         print_status(has_content, "FAQ has substantial content")
 
         # Count FAQ entries (### headers)
-        try:
-            with open(faq, 'r') as f:
-                content = f.read()
-            questions = len(re.findall(r'^###\s+', content, re.MULTILINE))
-            print(f"      {YELLOW}FAQ questions: {questions}{RESET}")
-        except Exception:
-            pass
+        metrics = get_file_metrics(faq)
+        if metrics:
+            print(f"      {YELLOW}FAQ questions: {metrics['h3_headers']}{RESET}")
 
     # ─────────────────────────────────────────────────────────────
     # CHECK 7: References
@@ -338,13 +358,9 @@ def main():
         status['references'] = has_refs
 
         # Count references
-        try:
-            with open(references, 'r') as f:
-                content = f.read()
-            ref_count = len(re.findall(r'^\d+\.\s+\[', content, re.MULTILINE))
-            print(f"      {YELLOW}Reference count: {ref_count}{RESET}")
-        except Exception:
-            pass
+        metrics = get_file_metrics(references)
+        if metrics:
+            print(f"      {YELLOW}Reference count: {metrics['references']}{RESET}")
 
     # ─────────────────────────────────────────────────────────────
     # CHECK 8: MicroSims
@@ -386,6 +402,9 @@ def main():
     # ─────────────────────────────────────────────────────────────
     # SUMMARY AND NEXT STEP
     # ─────────────────────────────────────────────────────────────
+    metrics_cache.prune_unseen()
+    metrics_cache.close()
+
     print_header("Summary & Next Step")
 
     # Calculate completion percentage
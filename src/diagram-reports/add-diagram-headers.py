@@ -4,11 +4,15 @@ Add '#### Diagram: NAME' headers before <details> blocks in chapter files.
 
 This script processes all chapter index.md files and adds a level 4 header
 before each <details> block, extracting the name from the <summary> element.
+Blocks that diagram-report.py already pairs with a header (found with the
+shared details_tokenizer) are left alone.
 """
 
 import re
 from pathlib import Path
 
+from details_tokenizer import iter_diagram_blocks
+
 def extract_summary_name(summary_text):
     """Extract the name from summary text, removing 'MicroSim:' or 'Diagram:' prefix"""
     # Remove common prefixes
@@ -23,23 +27,30 @@ def process_chapter_file(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
+    # Offsets of <details> blocks that already belong to a "#### Diagram:" header
+    headed_details = {block.details_start for block in iter_diagram_blocks(content)}
+
     # Split into lines for easier processing
     lines = content.split('\n')
     new_lines = []
     i = 0
+    line_start = 0
     changes_made = 0
 
     while i < len(lines):
         line = lines[i]
+        stripped = line.lstrip()
 
         # Check if this is a <details> block
-        if line.strip().startswith('<details'):
+        if stripped.startswith('<details'):
+            has_header = line_start + len(line) - len(stripped) in headed_details
+
             # Check if the previous non-empty line is already a #### Diagram: header
+            # (this also covers blocks the tokenizer skips, such as unclosed ones)
             prev_line_idx = i - 1
             while prev_line_idx >= 0 and lines[prev_line_idx].strip() == '':
                 prev_line_idx -= 1
 
-            has_header = False
             if prev_line_idx >= 0:
                 prev_line = lines[prev_line_idx].strip()
                 if prev_line.startswith('#### Diagram:'):
@@ -69,6 +80,7 @@ def process_chapter_file(file_path):
                     print(f"  Added header: #### Diagram: {diagram_name}")
 
         new_lines.append(line)
+        line_start += len(line) + 1
         i += 1
 
     if changes_made > 0:
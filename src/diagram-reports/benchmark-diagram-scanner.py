@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Benchmark the DiagramAnalyzer block scanner on a synthetic chapter corpus.
+
+Generates chapters full of "#### Diagram:" headers with <details> blocks,
+then times the per-block analysis two ways:
+
+- legacy: the original per-keyword scans (six Bloom searches, one findall
+  per UI keyword, one substring test per complex feature, each over its own
+  lowercased copy of the block)
+- scanner: DiagramAnalyzer.scan_block, one pass over one lowercased copy
+
+Both must agree on Bloom levels, UI counts and difficulty for every block.
+The end-to-end time for analyze_all_chapters is reported as well.
+
+Usage:
+    python benchmark-diagram-scanner.py
+    python benchmark-diagram-scanner.py --diagrams 2000 --chapters 40 --repeat 5
+"""
+
+import argparse
+import importlib.util
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DIAGRAM_REPORT = Path(__file__).resolve().parent / 'diagram-report.py'
+
+BLOOM_WORDS = ['Remember', 'Understand', 'Apply', 'Analyze', 'Evaluate', 'Create',
+               'Remembering', 'Understanding', 'Applying', 'Analyzing', 'Evaluating', 'Creating']
+TYPES = ['diagram', 'microsim', 'infographic', 'chart']
+FILLER = ('The learner explores how the concept changes as parameters vary. Labels identify each '
+          'region and a legend explains the color scheme. Hover text shows definitions. ').split()
+SIGNAL_WORDS = ['slider', 'sliders', 'button', 'buttons', 'dropdown', 'checkbox', 'input', 'toggle',
+                'menu', 'control', 'controls', 'panel', 'display', 'text box', 'selector',
+                'animation', 'rotate', 'transform', '3D', 'isometric', 'graph', 'photograph',
+                'plot', 'calculation', 'real-time', 'dynamic', 'comparison', 'overlay',
+                'multiple panels', 'side-by-side', 'p5.js', 'MicroSim']
+
+
+def load_diagram_report(path: Path):
+    """Import diagram-report.py as a module (its file name has a hyphen)."""
+    # diagram-report.py imports details_tokenizer from its own directory
+    sys.path.insert(0, str(path.resolve().parent))
+    spec = importlib.util.spec_from_file_location('diagram_report', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_details_block(rng: random.Random) -> str:
+    """Build one synthetic <details> specification block."""
+    words = [rng.choice(FILLER) for _ in range(rng.randint(60, 200))]
+    for _ in range(rng.randint(0, 12)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(SIGNAL_WORDS))
+    blooms = ', '.join(rng.sample(BLOOM_WORDS, rng.randint(1, 3)))
+    lines = [
+        '<details markdown="1">',
+        '<summary>Specification</summary>',
+        f"**Type:** {rng.choice(TYPES)}" if rng.random() < 0.8 else '',
+        f"Bloom's Taxonomy: {blooms}",
+        '',
+        f"**Learning Objective:** Students will {rng.choice(FILLER)} the idea.",
+        '',
+        '**Status:** Specified',
+        '',
+        ' '.join(words),
+        f"Canvas: {rng.choice([600, 800, 1000])}x{rng.choice([400, 600, 800])}px",
+        '</details>',
+    ]
+    return '\n'.join(lines)
+
+
+def write_corpus(root: Path, diagrams: int, chapters: int, seed: int):
+    """Write numbered chapter directories with diagrams spread across them."""
+    rng = random.Random(seed)
+    per_chapter = [diagrams // chapters + (1 if i < diagrams % chapters else 0)
+                   for i in range(chapters)]
+    for number, count in enumerate(per_chapter, 1):
+        chapter_dir = root / f"{number:02d}-synthetic-chapter-{number}"
+        chapter_dir.mkdir(parents=True)
+        parts = [f"# Chapter {number}\n"]
+        for k in range(count):
+            parts.append(f"Some introductory text for figure {k}.\n")
+            parts.append(f"#### Diagram: Figure {number}.{k}\n")
+            parts.append(make_details_block(rng) + '\n')
+        (chapter_dir / 'index.md').write_text('\n'.join(parts), encoding='utf-8')
+
+
+def legacy_signals(content: str, element_type: str, ui_keywords, bloom_pattern):
+    """The original per-keyword analysis, kept here as the benchmark baseline."""
+    bloom_levels = ['Not specified']
+    bloom_match = bloom_pattern.search(content)
+    if bloom_match:
+        bloom_text = bloom_match.group(1)
+        levels = []
+        if re.search(r'\bremember(?:ing)?\b', bloom_text, re.IGNORECASE):
+            levels.append('Remembering')
+        if re.search(r'\bunderstand(?:ing)?\b', bloom_text, re.IGNORECASE):
+            levels.append('Understanding')
+        if re.search(r'\bapply(?:ing)?\b', bloom_text, re.IGNORECASE):
+            levels.append('Applying')
+        if re.search(r'\banalyz(?:e|ing)\b', bloom_text, re.IGNORECASE):
+            levels.append('Analyzing')
+        if re.search(r'\bevaluat(?:e|ing)\b', bloom_text, re.IGNORECASE):
+            levels.append('Evaluating')
+        if re.search(r'\bcreat(?:e|ing)\b', bloom_text, re.IGNORECASE):
+            levels.append('Creating')
+        bloom_levels = levels if levels else ['Not specified']
+
+    content_lower = content.lower()
+    ui_count = 0
+    for keyword in ui_keywords:
+        ui_count += len(re.findall(rf'\b{keyword}s?\b', content_lower))
+
+    content_lower = content.lower()
+    score = 2 if element_type == 'microsim' else 0
+    if ui_count == 0:
+        score += 1
+    elif ui_count <= 3:
+        score += 2
+    elif ui_count <= 6:
+        score += 3
+    else:
+        score += 4
+    for feature in ['animation', 'rotate', 'transform', '3d', 'isometric',
+                    'graph', 'plot', 'calculation', 'real-time', 'dynamic',
+                    'comparison', 'overlay', 'multiple panels', 'side-by-side']:
+        if feature in content_lower:
+            score += 1
+    canvas_match = re.search(r'canvas.*?(\d{3,4})\s*[x×]\s*(\d{3,4})', content_lower)
+    if canvas_match:
+        if int(canvas_match.group(1)) > 900 or int(canvas_match.group(2)) > 700:
+            score += 1
+
+    if score <= 3:
+        difficulty = 'Easy'
+    elif score <= 6:
+        difficulty = 'Medium'
+    elif score <= 9:
+        difficulty = 'Hard'
+    else:
+        difficulty = 'Very Hard'
+    return bloom_levels, ui_count, difficulty
+
+
+def best_time(func, repeat: int) -> float:
+    """Best wall-clock time of several runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the DiagramAnalyzer block scanner')
+    parser.add_argument('--diagrams', type=int, default=500, help='Number of diagrams in the corpus')
+    parser.add_argument('--chapters', type=int, default=20, help='Number of chapters to spread them over')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best time is reported)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--script', type=Path, default=DIAGRAM_REPORT, help='Path to diagram-report.py')
+    args = parser.parse_args()
+
+    diagram_report = load_diagram_report(args.script)
+    Analyzer = diagram_report.DiagramAnalyzer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chapters_dir = Path(tmp) / 'chapters'
+        write_corpus(chapters_dir, args.diagrams, args.chapters, args.seed)
+
+        blocks = []
+        for index_file in sorted(chapters_dir.glob('*/index.md')):
+            content = index_file.read_text(encoding='utf-8')
+            blocks.extend(content[block.details[0]:block.details[1]]
+                          for block in diagram_report.iter_diagram_blocks(content))
+
+        analyzer = Analyzer(str(chapters_dir))
+        element_types = ['microsim' if 'microsim' in block.lower() else 'diagram' for block in blocks]
+
+        # Both implementations must agree before timing means anything
+        mismatches = 0
+        for block, element_type in zip(blocks, element_types):
+            signals = analyzer.scan_block(block)
+            new = (signals.bloom_levels, signals.ui_count,
+                   analyzer.estimate_difficulty(block, signals.ui_count, element_type, signals))
+            if new != legacy_signals(block, element_type, Analyzer.UI_KEYWORDS, Analyzer.BLOOM_PATTERN):
+                mismatches += 1
+
+        def run_legacy():
+            for block, element_type in zip(blocks, element_types):
+                legacy_signals(block, element_type, Analyzer.UI_KEYWORDS, Analyzer.BLOOM_PATTERN)
+
+        def run_scanner():
+            for block, element_type in zip(blocks, element_types):
+                signals = analyzer.scan_block(block)
+                analyzer.estimate_difficulty(block, signals.ui_count, element_type, signals)
+
+        def run_full():
+            Analyzer(str(chapters_dir)).analyze_all_chapters()
+
+        legacy = best_time(run_legacy, args.repeat)
+        scanner = best_time(run_scanner, args.repeat)
+        full = best_time(run_full, args.repeat)
+
+    print(f"Benchmarking {args.script}")
+    print(f"Corpus: {len(blocks)} diagrams in {args.chapters} chapters")
+    print()
+    print(f"{'Scan':<24} {'Best (ms)':>10} {'us/block':>10}")
+    print(f"{'-' * 24} {'-' * 10} {'-' * 10}")
+    for name, seconds in (('legacy per-keyword', legacy),
+                          ('single-pass scanner', scanner),
+                          ('analyze_all_chapters', full)):
+        print(f"{name:<24} {seconds * 1e3:>10.2f} {seconds / len(blocks) * 1e6:>10.1f}")
+    print()
+    print(f"Speedup (scan only): {legacy / scanner:.2f}x")
+    if mismatches:
+        print(f"❌ {mismatches} blocks differ between legacy and scanner results")
+    else:
+        print("✅ Scanner results match the legacy scans for every block")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Details Block Tokenizer
+
+Shared scanner for the "#### Diagram:" header + <details> specification
+blocks in chapter markdown, used by diagram-report.py,
+generate-easy-diagrams.py, generate-medium-diagrams.py,
+add-diagram-headers.py and analyze-details-content.py.
+
+It replaces the DOTALL regex
+
+    ####\\s+Diagram:\\s*([^\\n]+)\\n(.*?)<details[^>]*>(.*?)</details>
+
+which backtracks across the rest of the file for every header when a
+chapter has an unclosed <details>. The tokenizer is a small state machine
+(header -> details open tag -> details close tag). It indexes the newline
+and tag offsets in one pass and then only moves forward, so a whole file is
+tokenized in (near) linear time however it is malformed. It yields
+offsets into the original string instead of copies, and accepts exactly the
+blocks the regex matched, including tags that are not at the start of a line.
+
+Usage:
+    from details_tokenizer import iter_diagram_blocks
+
+    for block in iter_diagram_blocks(content):
+        title = block.header.strip()
+        spec = content[block.details[0]:block.details[1]]
+"""
+
+import re
+from bisect import bisect_left
+from typing import Iterator, List, NamedTuple, Optional, Pattern, Tuple
+
+# "####", whitespace, "Diagram:" - the title is matched by _title_candidates
+DIAGRAM_HEADER_PATTERN = re.compile(r'####\s+Diagram:')
+WHITESPACE_PATTERN = re.compile(r'\s*')
+
+DETAILS_OPEN = '<details'
+DETAILS_CLOSE = '</details>'
+
+
+class DiagramBlock(NamedTuple):
+    """One "#### Diagram:" header and the <details> block that belongs to it"""
+    header: str                 # Title text after "Diagram:" (not stripped)
+    start: int                  # Offset of the "####"
+    preamble: Tuple[int, int]   # Span between the header line and <details>
+    details_start: int          # Offset of the <details ...> open tag
+    details: Tuple[int, int]    # Span of the content inside <details>...</details>
+    end: int                    # Offset just past </details>
+
+
+class DetailsBlock(NamedTuple):
+    """One <details>...</details> block"""
+    start: int                  # Offset of the open tag
+    details: Tuple[int, int]    # Span of the content inside the tags
+    end: int                    # Offset just past the close tag
+
+
+class _TagIndex:
+    """Sorted offsets of one literal string, for "next one at or after pos" lookups"""
+
+    def __init__(self, content: str, tag: str):
+        self.positions = []
+        pos = content.find(tag)
+        while pos != -1:
+            self.positions.append(pos)
+            pos = content.find(tag, pos + 1)
+
+    def next(self, pos: int) -> int:
+        """Offset of the first occurrence at or after pos, or -1"""
+        i = bisect_left(self.positions, pos)
+        return self.positions[i] if i < len(self.positions) else -1
+
+    def last_before(self, pos: int, lo: int = 0) -> int:
+        """Offset of the last occurrence in [lo, pos), or -1"""
+        i = bisect_left(self.positions, pos) - 1
+        return self.positions[i] if i >= 0 and self.positions[i] >= lo else -1
+
+
+def _title_candidates(content: str, pos: int, newlines: _TagIndex) -> List[Tuple[int, int]]:
+    """Title spans for \\s*([^\\n]+)\\n at pos, in the order the regex tries them.
+
+    The greedy match takes the first non-blank text up to the end of its
+    line. If the rest of the block does not match after that, the regex
+    backs off into the blank run before it, where the only other title end
+    is the first newline of the last group of newlines, with the one blank
+    character before it as the title.
+    """
+    candidates = []
+    text_start = WHITESPACE_PATTERN.match(content, pos).end()
+    if text_start < len(content):
+        line_end = newlines.next(text_start)
+        if line_end != -1:
+            candidates.append((text_start, line_end))
+
+    newline = newlines.last_before(text_start, pos)
+    if newline != -1:
+        while newline > pos and content[newline - 1] == '\n':
+            newline -= 1
+        if newline > pos:
+            candidates.append((newline - 1, newline))
+
+    return candidates
+
+
+def find_details_open(content: str, pos: int,
+                      pattern: Pattern = None) -> Optional[Tuple[int, int]]:
+    """Find the next <details ...> open tag at or after pos.
+
+    Args:
+        content: Markdown text
+        pos: Offset to search from
+        pattern: Optional compiled pattern for the open tag; by default any
+            tag starting with "<details" is accepted, like <details[^>]*>
+
+    Returns:
+        (start, end) span of the open tag, or None
+    """
+    if pattern is not None:
+        match = pattern.search(content, pos)
+        return match.span() if match else None
+
+    start = content.find(DETAILS_OPEN, pos)
+    if start == -1:
+        return None
+    tag_end = content.find('>', start + len(DETAILS_OPEN))
+    if tag_end == -1:
+        return None
+    return start, tag_end + 1
+
+
+def find_details_close(content: str, pos: int,
+                       pattern: Pattern = None) -> Optional[Tuple[int, int]]:
+    """Find the next </details> close tag at or after pos.
+
+    Returns:
+        (start, end) span of the close tag, or None
+    """
+    if pattern is not None:
+        match = pattern.search(content, pos)
+        return match.span() if match else None
+
+    start = content.find(DETAILS_CLOSE, pos)
+    if start == -1:
+        return None
+    return start, start + len(DETAILS_CLOSE)
+
+
+def iter_details_blocks(content: str, open_pattern: Pattern = None,
+                        close_pattern: Pattern = None) -> Iterator[DetailsBlock]:
+    """Yield every <details>...</details> block in a markdown string.
+
+    Each block ends at the first close tag after its open tag, as with a
+    non-greedy regex. Once an open tag has no close tag after it, no later
+    block can be closed either, so scanning stops there.
+
+    Args:
+        content: Markdown text
+        open_pattern: Optional compiled pattern for the open tag (for example
+            to accept only <details> and <details markdown="1">)
+        close_pattern: Optional compiled pattern for the close tag (for
+            example to match it case-insensitively)
+
+    Yields:
+        DetailsBlock offsets in file order
+    """
+    pos = 0
+    while True:
+        opened = find_details_open(content, pos, open_pattern)
+        if opened is None:
+            return
+        closed = find_details_close(content, opened[1], close_pattern)
+        if closed is None:
+            return
+        yield DetailsBlock(opened[0], (opened[1], closed[0]), closed[1])
+        pos = closed[1]
+
+
+def iter_diagram_blocks(content: str) -> Iterator[DiagramBlock]:
+    """Yield every "#### Diagram:" header with the <details> block that follows it.
+
+    Matches the same blocks as the HEADER_DETAILS_PATTERN regex: the title is
+    the rest of the header line, the preamble is everything up to the next
+    <details ...> open tag (which may include other headers), and the block
+    ends at the first </details> after that. Tag and newline offsets are
+    indexed once up front, so a header without a matching block costs a
+    lookup instead of a scan to the end of the file.
+
+    Args:
+        content: Markdown text
+
+    Yields:
+        DiagramBlock offsets in file order
+    """
+    newlines = _TagIndex(content, '\n')
+    opens = _TagIndex(content, DETAILS_OPEN)
+    closes = _TagIndex(content, DETAILS_CLOSE)
+    open_tag_ends = {}
+
+    def block_after(pos: int) -> Optional[Tuple[int, int, int]]:
+        """(open start, open end, close start) of the first complete block after pos"""
+        start = opens.next(pos)
+        if start == -1:
+            return None
+        if start not in open_tag_ends:
+            open_tag_ends[start] = content.find('>', start + len(DETAILS_OPEN))
+        tag_end = open_tag_ends[start]
+        if tag_end == -1:
+            return None
+        close = closes.next(tag_end + 1)
+        if close == -1:
+            return None
+        return start, tag_end + 1, close
+
+    pos = 0
+    while True:
+        header = DIAGRAM_HEADER_PATTERN.search(content, pos)
+        if header is None:
+            return
+
+        for title_start, title_end in _title_candidates(content, header.end(), newlines):
+            block = block_after(title_end + 1)
+            if block is not None:
+                break
+        else:
+            pos = header.start() + 1
+            continue
+
+        open_start, open_end, close_start = block
+        yield DiagramBlock(
+            header=content[title_start:title_end],
+            start=header.start(),
+            preamble=(title_end + 1, open_start),
+            details_start=open_start,
+            details=(open_end, close_start),
+            end=close_start + len(DETAILS_CLOSE)
+        )
+        pos = close_start + len(DETAILS_CLOSE)
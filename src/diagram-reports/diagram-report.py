@@ -34,9 +34,11 @@ import re
 import csv
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 import argparse
 
+from details_tokenizer import iter_diagram_blocks
+
 
 @dataclass
 class VisualElement:
@@ -71,12 +73,21 @@ class VisualElement:
         }
 
 
+@dataclass
+class BlockSignals:
+    """Everything the single-pass scanner extracts from one details block"""
+    bloom_levels: List[str]
+    ui_count: int
+    complex_features: int  # Number of distinct complex features mentioned
+    type_hints: Set[str]  # Which of DiagramAnalyzer.TYPE_HINTS appear
+    canvas_size: Optional[Tuple[int, int]] = None
+
+
 class DiagramAnalyzer:
     """Analyzes markdown files to extract diagram and MicroSim information"""
 
     # Patterns to match - made more flexible
-    # Match #### Diagram: Title followed by <details> block (with optional content in between)
-    HEADER_DETAILS_PATTERN = re.compile(r'####\s+Diagram:\s*([^\n]+)\n(.*?)<details[^>]*>(.*?)</details>', re.DOTALL)
+    # "#### Diagram: Title" + <details> blocks are found by details_tokenizer
     DETAILS_PATTERN = re.compile(r'<details[^>]*>(.*?)</details>', re.DOTALL)
     SUMMARY_PATTERN = re.compile(r'<summary>(.*?)</summary>', re.DOTALL)
     TYPE_PATTERN = re.compile(r'\*\*Type:\*\*\s*(.*?)(?:\n|\r|\*\*)', re.IGNORECASE)
@@ -86,12 +97,43 @@ class DiagramAnalyzer:
     MICROSIM_RECOMMENDATIONS_PATTERN = re.compile(r'\*\*MicroSim Generator Recommendations:\*\*\s*(.*?)(?=</details>|$)', re.DOTALL | re.IGNORECASE)
     RECOMMENDATION_LINE_PATTERN = re.compile(r'\d+\.\s+([a-z0-9-]+)\s+\((\d+)/100\)', re.IGNORECASE)
 
+    # Bloom's levels in report order, matched by one alternation (one group per level)
+    BLOOM_LEVELS = ['Remembering', 'Understanding', 'Applying', 'Analyzing', 'Evaluating', 'Creating']
+    BLOOM_LEVEL_PATTERN = re.compile(
+        r'\b(?:(remember(?:ing)?)|(understand(?:ing)?)|(apply(?:ing)?)'
+        r'|(analyz(?:e|ing))|(evaluat(?:e|ing))|(creat(?:e|ing)))\b',
+        re.IGNORECASE
+    )
+
     # UI element keywords to count
     UI_KEYWORDS = [
         'slider', 'button', 'dropdown', 'checkbox', 'input', 'toggle',
         'menu', 'control', 'panel', 'display', 'text box', 'selector'
     ]
 
+    # Features that increase the estimated difficulty (counted once each)
+    COMPLEX_FEATURES = [
+        'animation', 'rotate', 'transform', '3d', 'isometric',
+        'graph', 'plot', 'calculation', 'real-time', 'dynamic',
+        'comparison', 'overlay', 'multiple panels', 'side-by-side'
+    ]
+
+    # Words used to infer the element type when there is no **Type:** line
+    TYPE_HINTS = ['microsim', 'p5', 'diagram']
+
+    # Single-pass scanner over the lowercased block. Every alternative sits
+    # inside a lookahead, so overlapping keywords are all reported, and no
+    # keyword is a prefix of another, so at most one alternative can match
+    # at any position. The leading character class skips positions where no
+    # keyword can start.
+    SIGNAL_PATTERN = re.compile(
+        '(?=[' + re.escape(''.join(sorted({k[0] for k in UI_KEYWORDS + COMPLEX_FEATURES + TYPE_HINTS}))) + '])'
+        r'(?=\b(?P<ui>' + '|'.join(map(re.escape, UI_KEYWORDS)) + r')s?\b'
+        r'|(?P<feature>' + '|'.join(map(re.escape, COMPLEX_FEATURES)) + r')'
+        r'|(?P<hint>' + '|'.join(map(re.escape, TYPE_HINTS)) + r'))'
+    )
+    CANVAS_PATTERN = re.compile(r'canvas.*?(\d{3,4})\s*[x×]\s*(\d{3,4})')
+
     def __init__(self, chapters_dir: str, verbose: bool = False):
         self.chapters_dir = Path(chapters_dir)
         self.elements: List[VisualElement] = []
@@ -132,17 +174,17 @@ class DiagramAnalyzer:
                 chapter_name = chapter_dir_name
 
             # Find all header + <details> blocks first (preferred method)
-            header_details_blocks = list(self.HEADER_DETAILS_PATTERN.finditer(content))
+            header_details_blocks = list(iter_diagram_blocks(content))
 
             if self.verbose:
                 print(f"\n  Analyzing {file_path.parent.name}/index.md:")
                 print(f"    Found {len(header_details_blocks)} header+details blocks")
 
             elements_found = 0
-            for match in header_details_blocks:
-                header_title = match.group(1).strip()
-                # group(2) is now the content between header and details (iframe, etc.)
-                details_content = match.group(3)  # The actual details content
+            for block in header_details_blocks:
+                header_title = block.header.strip()
+                # block.preamble spans the content between header and details (iframe, etc.)
+                details_content = content[block.details[0]:block.details[1]]  # The actual details content
                 element = self.parse_details_block(details_content, chapter_num, chapter_name, chapter_dir_name, header_title)
                 if element:
                     self.elements.append(element)
@@ -170,16 +212,18 @@ class DiagramAnalyzer:
                 return None
             title = summary_match.group(1).strip()
 
+        # Bloom levels, UI keywords and difficulty signals in one pass
+        signals = self.scan_block(content)
+
         # Extract type - be more lenient
         type_match = self.TYPE_PATTERN.search(content)
         if type_match:
             element_type = type_match.group(1).strip().lower()
         else:
             # Try to infer from content
-            content_lower = content.lower()
-            if 'microsim' in content_lower or 'p5.js' in content_lower or 'p5' in content_lower:
+            if 'microsim' in signals.type_hints or 'p5' in signals.type_hints:
                 element_type = 'microsim'
-            elif 'diagram' in content_lower:
+            elif 'diagram' in signals.type_hints:
                 element_type = 'diagram'
             else:
                 element_type = 'unknown'
@@ -193,7 +237,7 @@ class DiagramAnalyzer:
             element_type = 'unknown'
 
         # Extract Bloom's taxonomy levels
-        bloom_levels = self.extract_bloom_levels(content)
+        bloom_levels = signals.bloom_levels
 
         # Extract learning objective
         learning_obj = self.extract_learning_objective(content)
@@ -205,10 +249,10 @@ class DiagramAnalyzer:
         microsim_recommendations, microsim_text = self.extract_microsim_recommendations(content)
 
         # Count UI elements
-        ui_count = self.count_ui_elements(content)
+        ui_count = signals.ui_count
 
         # Estimate difficulty
-        difficulty = self.estimate_difficulty(content, ui_count, element_type)
+        difficulty = self.estimate_difficulty(content, ui_count, element_type, signals)
 
         return VisualElement(
             chapter_num=chapter_num,
@@ -234,21 +278,12 @@ class DiagramAnalyzer:
 
         bloom_text = bloom_match.group(1)
 
-        # Common Bloom's levels
-        levels = []
-        if re.search(r'\bremember(?:ing)?\b', bloom_text, re.IGNORECASE):
-            levels.append('Remembering')
-        if re.search(r'\bunderstand(?:ing)?\b', bloom_text, re.IGNORECASE):
-            levels.append('Understanding')
-        if re.search(r'\bapply(?:ing)?\b', bloom_text, re.IGNORECASE):
-            levels.append('Applying')
-        if re.search(r'\banalyz(?:e|ing)\b', bloom_text, re.IGNORECASE):
-            levels.append('Analyzing')
-        if re.search(r'\bevaluat(?:e|ing)\b', bloom_text, re.IGNORECASE):
-            levels.append('Evaluating')
-        if re.search(r'\bcreat(?:e|ing)\b', bloom_text, re.IGNORECASE):
-            levels.append('Creating')
+        # Common Bloom's levels, reported in taxonomy order
+        found = set()
+        for level_match in self.BLOOM_LEVEL_PATTERN.finditer(bloom_text):
+            found.add(level_match.lastindex - 1)
 
+        levels = [self.BLOOM_LEVELS[i] for i in sorted(found)]
         return levels if levels else ['Not specified']
 
     def extract_learning_objective(self, content: str) -> str:
@@ -287,20 +322,44 @@ class DiagramAnalyzer:
 
         return (recommendations, full_text)
 
-    def count_ui_elements(self, content: str) -> int:
-        """Count the number of UI elements mentioned in specifications"""
+    def scan_block(self, content: str) -> BlockSignals:
+        """Scan a details block once for Bloom levels, UI keywords and difficulty signals"""
         content_lower = content.lower()
-        count = 0
+        ui_count = 0
+        features = set()
+        type_hints = set()
+
+        for match in self.SIGNAL_PATTERN.finditer(content_lower):
+            kind = match.lastgroup
+            if kind == 'ui':
+                ui_count += 1
+            elif kind == 'feature':
+                features.add(match.group(kind))
+            else:
+                type_hints.add(match.group(kind))
 
-        for keyword in self.UI_KEYWORDS:
-            # Count occurrences of each keyword
-            count += len(re.findall(rf'\b{keyword}s?\b', content_lower))
+        canvas_size = None
+        canvas_match = self.CANVAS_PATTERN.search(content_lower)
+        if canvas_match:
+            canvas_size = (int(canvas_match.group(1)), int(canvas_match.group(2)))
+
+        return BlockSignals(
+            bloom_levels=self.extract_bloom_levels(content),
+            ui_count=ui_count,
+            complex_features=len(features),
+            type_hints=type_hints,
+            canvas_size=canvas_size
+        )
 
-        return count
+    def count_ui_elements(self, content: str) -> int:
+        """Count the number of UI elements mentioned in specifications"""
+        return self.scan_block(content).ui_count
 
-    def estimate_difficulty(self, content: str, ui_count: int, element_type: str) -> str:
+    def estimate_difficulty(self, content: str, ui_count: int, element_type: str,
+                            signals: BlockSignals = None) -> str:
         """Estimate implementation difficulty based on various factors"""
-        content_lower = content.lower()
+        if signals is None:
+            signals = self.scan_block(content)
 
         # Factors that increase difficulty
         difficulty_score = 0
@@ -320,21 +379,11 @@ class DiagramAnalyzer:
             difficulty_score += 4  # High interactivity
 
         # Check for complex features
-        complex_features = [
-            'animation', 'rotate', 'transform', '3d', 'isometric',
-            'graph', 'plot', 'calculation', 'real-time', 'dynamic',
-            'comparison', 'overlay', 'multiple panels', 'side-by-side'
-        ]
-
-        for feature in complex_features:
-            if feature in content_lower:
-                difficulty_score += 1
+        difficulty_score += signals.complex_features
 
         # Check for canvas size (larger = more complex)
-        canvas_match = re.search(r'canvas.*?(\d{3,4})\s*[x×]\s*(\d{3,4})', content_lower)
-        if canvas_match:
-            width = int(canvas_match.group(1))
-            height = int(canvas_match.group(2))
+        if signals.canvas_size:
+            width, height = signals.canvas_size
             if width > 900 or height > 700:
                 difficulty_score += 1
 
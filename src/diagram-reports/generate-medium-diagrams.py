@@ -24,6 +24,8 @@ from pathlib import Path
 from dataclasses import dataclass
 from typing import List, Tuple, Optional
 
+from details_tokenizer import iter_diagram_blocks
+
 
 @dataclass
 class DiagramCandidate:
@@ -41,12 +43,6 @@ class DiagramCandidate:
 class DiagramSpecExtractor:
     """Extracts diagram specifications from chapter markdown files"""
 
-    # Pattern to find the diagram section with details block
-    DIAGRAM_SECTION_PATTERN = re.compile(
-        r'####\s+Diagram:\s*([^\n]+)\n(.*?)<details[^>]*>(.*?)</details>',
-        re.DOTALL
-    )
-
     def __init__(self, chapters_dir: Path):
         self.chapters_dir = chapters_dir
 
@@ -63,11 +59,11 @@ class DiagramSpecExtractor:
                 content = f.read()
 
             # Find the matching diagram section
-            for match in self.DIAGRAM_SECTION_PATTERN.finditer(content):
-                header_title = match.group(1).strip()
+            for block in iter_diagram_blocks(content):
+                header_title = block.header.strip()
                 if header_title == element_title:
-                    # Extract the details content (group 3)
-                    details_content = match.group(3)
+                    # Extract the details content
+                    details_content = content[block.details[0]:block.details[1]]
                     # Remove the MicroSim recommendations section
                     spec = re.sub(
                         r'---\s*\*\*MicroSim Generator Recommendations:\*\*.*',
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark the learning graph quality analysis on synthetic graphs.
+
+Generates random learning graphs (DAGs where every concept depends on a few
+earlier concepts), runs the analyze-graph.py report on each, and prints the
+time per run along with the time per node+edge. The graph is loaded once into
+the CSR arrays of learning_graph.py and every analysis walks those arrays by
+concept index, so the time per node+edge should stay roughly flat as the
+graph grows, showing O(V+E) scaling.
+
+Usage:
+    python benchmark-analyze-graph.py
+    python benchmark-analyze-graph.py --sizes 1000 5000 20000 --avg-deps 3
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import importlib.util
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ANALYZE_GRAPH = (Path(__file__).resolve().parent.parent.parent
+                 / 'skills' / 'learning-graph-generator' / 'analyze-graph.py')
+
+
+def load_analyze_graph(path: Path):
+    """Import analyze-graph.py as a module (its file name has a hyphen)."""
+    # analyze-graph.py imports its helper modules from its own directory
+    sys.path.insert(0, str(path.resolve().parent))
+    spec = importlib.util.spec_from_file_location('analyze_graph', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_synthetic_graph(csv_path: Path, num_concepts: int, avg_deps: int, seed: int) -> int:
+    """Write a random learning-graph.csv and return its edge count."""
+    rng = random.Random(seed)
+    edges = 0
+
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['ConceptID', 'ConceptLabel', 'Dependencies', 'TaxonomyID'])
+        for concept_id in range(1, num_concepts + 1):
+            # Roughly 5% foundational concepts, the rest depend on earlier ones
+            if concept_id == 1 or rng.random() < 0.05:
+                deps = []
+            else:
+                count = min(concept_id - 1, rng.randint(1, 2 * avg_deps - 1))
+                deps = rng.sample(range(max(1, concept_id - 500), concept_id),
+                                  min(count, concept_id - max(1, concept_id - 500)))
+            edges += len(deps)
+            writer.writerow([concept_id, f"Concept {concept_id}",
+                             '|'.join(str(d) for d in deps), 'SYN'])
+
+    return edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark analyze-graph.py on synthetic graphs')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2000, 5000, 10000, 20000],
+                        help='Concept counts to benchmark')
+    parser.add_argument('--avg-deps', type=int, default=3, help='Average dependencies per concept')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per size (best time is reported)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--script', type=Path, default=ANALYZE_GRAPH, help='Path to analyze-graph.py')
+    args = parser.parse_args()
+
+    analyze_graph = load_analyze_graph(args.script)
+
+    print(f"Benchmarking {args.script}")
+    print()
+    print(f"{'Concepts':>10} {'Edges':>10} {'Best (s)':>10} {'us/(V+E)':>10}")
+    print(f"{'-' * 10} {'-' * 10} {'-' * 10} {'-' * 10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            csv_path = Path(tmp) / f"graph-{size}.csv"
+            report_path = Path(tmp) / f"report-{size}.md"
+            edges = write_synthetic_graph(csv_path, size, args.avg_deps, args.seed)
+
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    analyze_graph.generate_report(str(csv_path), str(report_path))
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            per_item = best / (size + edges) * 1e6
+            print(f"{size:>10,} {edges:>10,} {best:>10.3f} {per_item:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
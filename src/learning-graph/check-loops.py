@@ -3,89 +3,66 @@
 Check for loops (cycles) in a vis-network learning graph JSON file.
 
 This script reads a learning graph in vis-network JSON format and detects
-any cycles in the directed graph. If cycles are found, it reports the
-nodes involved in each cycle.
+any cycles in the directed graph. If cycles are found, it reports every
+strongly connected group of nodes that forms a loop, with a shortest loop
+through each group.
+
+The graph loader (learning_graph.py) and cycle engine (graph_cycles.py) live
+with the learning-graph-generator skill; the cycle engine uses explicit
+stacks, so very deep graphs are handled too.
 
 Usage:
     python check-loops.py <path-to-learning-graph.json>
+
+    # List up to 50 individual loops (Johnson's algorithm) instead
+    python check-loops.py <path-to-learning-graph.json> --max-cycles 50
 """
 
+import argparse
 import json
 import sys
-from collections import defaultdict
-
-
-def load_graph(filepath):
-    """Load a vis-network JSON file and return nodes and edges."""
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+from pathlib import Path
 
-    nodes = {node['id']: node.get('label', str(node['id'])) for node in data.get('nodes', [])}
-    edges = data.get('edges', [])
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent
+                       / 'skills' / 'learning-graph-generator'))
+from graph_cycles import find_cycle_components, simple_cycles
+from learning_graph import load_json
 
-    return nodes, edges
 
-
-def build_adjacency_list(edges):
-    """Build an adjacency list from edges."""
-    adj = defaultdict(list)
-    for edge in edges:
-        from_node = edge['from']
-        to_node = edge['to']
-        adj[from_node].append(to_node)
-    return adj
+def load_graph(filepath):
+    """Load a vis-network JSON file into a LearningGraph (edges point to prerequisites)."""
+    return load_json(filepath)
 
 
-def find_cycles(nodes, adj):
+def find_cycles(graph, max_cycles=None):
     """
-    Find all cycles in a directed graph using DFS.
+    Find cycles in a directed graph.
+
+    By default returns one shortest cycle for each strongly connected
+    component that contains a loop. With max_cycles set, enumerates up to
+    that many elementary cycles instead.
 
     Returns a list of cycles, where each cycle is a list of node IDs.
     """
-    WHITE = 0  # Not visited
-    GRAY = 1   # Currently in recursion stack
-    BLACK = 2  # Completely processed
-
-    color = {node_id: WHITE for node_id in nodes}
-    parent = {node_id: None for node_id in nodes}
-    cycles = []
-
-    def dfs(node, path):
-        color[node] = GRAY
-        path.append(node)
-
-        for neighbor in adj.get(node, []):
-            if neighbor not in color:
-                # Node exists in edges but not in nodes list
-                continue
-
-            if color[neighbor] == GRAY:
-                # Found a cycle - extract the cycle from path
-                cycle_start_idx = path.index(neighbor)
-                cycle = path[cycle_start_idx:]
-                cycles.append(cycle)
-            elif color[neighbor] == WHITE:
-                dfs(neighbor, path)
-
-        path.pop()
-        color[node] = BLACK
-
-    for node_id in nodes:
-        if color[node_id] == WHITE:
-            dfs(node_id, [])
-
-    return cycles
+    nodes = range(len(graph))
+    if max_cycles is not None:
+        cycles = simple_cycles(nodes, graph.prerequisites, limit=max_cycles)
+    else:
+        cycles = (cycle for _, cycle in find_cycle_components(nodes, graph.prerequisites))
+    return [[graph.ids[i] for i in cycle] for cycle in cycles]
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python check-loops.py <path-to-learning-graph.json>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description='Check a vis-network learning graph for loops')
+    parser.add_argument('filepath', help='Path to learning-graph.json')
+    parser.add_argument('--max-cycles', type=int,
+                        help='List up to this many individual loops instead of one per loop group')
+    args = parser.parse_args()
 
-    filepath = sys.argv[1]
+    filepath = args.filepath
 
     try:
-        nodes, edges = load_graph(filepath)
+        graph = load_graph(filepath)
     except FileNotFoundError:
         print(f"Error: File not found: {filepath}")
         sys.exit(1)
@@ -93,12 +70,12 @@ def main():
         print(f"Error: Invalid JSON in file: {e}")
         sys.exit(1)
 
-    if not nodes:
+    if not len(graph):
         print("Warning: No nodes found in the graph.")
         sys.exit(0)
 
-    adj = build_adjacency_list(edges)
-    cycles = find_cycles(nodes, adj)
+    nodes = dict(zip(graph.ids, graph.labels))
+    cycles = find_cycles(graph, args.max_cycles)
 
     if not cycles:
         print(f'No Loops Found in file {filepath}.')
@@ -4,26 +4,222 @@ Image Compression Script for Web Optimization
 Compresses large images to approximately 300KB while preserving original format.
 JPEGs stay as JPEGs (better for photos), PNGs stay as PNGs (better for graphics).
 Images will not be resized below MIN_WIDTH pixels to ensure they fill the column width.
+
+With --jobs N, images are compressed in N worker processes. Each image's
+output is captured in its worker and printed in one piece, in the same
+order as a serial run.
+
+A content-addressed cache (image-cache.json next to this script) records
+the SHA-256 of every image this script wrote, with the target size and
+MIN_WIDTH it was optimized for. Images whose bytes match a recorded
+output are skipped on later runs, so re-running over an optimized docs
+tree does not re-encode (or further degrade) anything.
 """
 
+import argparse
+import hashlib
+import json
+import math
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import BytesIO, StringIO
 from PIL import Image, ImageOps
 import shutil
 from pathlib import Path
 
+from image_headers import read_image_header
+
 # Minimum width in pixels - images should fill the column width
 MIN_WIDTH = 800
 
+# Lowest and highest JPEG quality the size search may use
+JPEG_QUALITY_RANGE = (45, 85)
+
+# Stop searching once a candidate is within this fraction below the target size
+TARGET_TOLERANCE = 0.10
+
+# Width resolution of the size search, in pixels (at least 1% of the original width)
+WIDTH_STEP_PX = 16
+
+# Target size used by main() for every image
+TARGET_SIZE_KB = 300
+
+# Bump when the cache layout changes; older caches are ignored
+CACHE_VERSION = 1
+
 def get_file_size_kb(filepath):
     """Get file size in KB"""
     return os.path.getsize(filepath) / 1024
 
+class TargetSizeSearch:
+    """
+    Finds the largest, highest-quality encoding of an image that fits a size target.
+
+    Candidates are encoded into two reusable in-memory buffers (the current
+    attempt and the best fit so far) instead of being written to disk. The
+    width is binary-searched between MIN_WIDTH and the original width at
+    the lowest JPEG quality, starting from a guess based on the source
+    file size, then the quality is binary-searched at that width. The
+    search stops as soon as a candidate lands within the tolerance band
+    just below the target.
+    """
+
+    def __init__(self, img, is_jpeg, target_size_kb, source_size_kb=None,
+                 min_width=MIN_WIDTH, tolerance=TARGET_TOLERANCE):
+        """
+        Args:
+            img: Image to encode (already oriented and color-converted)
+            is_jpeg: Encode as JPEG (searching quality too) rather than PNG
+            target_size_kb: Size the result must not exceed
+            source_size_kb: Size of the source file, used to guess the starting width
+            min_width: Narrowest width allowed
+            tolerance: Fraction below the target that is close enough to stop
+        """
+        self.img = img
+        self.source_size_kb = source_size_kb
+        self.is_jpeg = is_jpeg
+        self.target_size_kb = target_size_kb
+        self.band_floor_kb = target_size_kb * (1 - tolerance)
+        self.min_width = min(min_width, img.size[0])
+        self.encodes = 0
+        self.work = BytesIO()
+        self.best = BytesIO()
+        self.best_size_kb = None
+        self.best_dims = None
+        self.best_quality = None
+        self.last = None        # (size_kb, dims, quality) of the latest encode
+        self.resized = {}       # width -> resized image, reused across quality probes
+
+    def resize(self, width):
+        """The image scaled to width (cached)."""
+        if width not in self.resized:
+            original_width, original_height = self.img.size
+            if width == original_width:
+                self.resized[width] = self.img
+            else:
+                height = max(1, round(original_height * width / original_width))
+                self.resized[width] = self.img.resize((width, height), Image.Resampling.LANCZOS)
+        return self.resized[width]
+
+    def encode(self, width, quality):
+        """
+        Encode one candidate into the work buffer.
+
+        Returns:
+            True if it fits the target (it then becomes the best candidate)
+        """
+        resized = self.resize(width)
+        self.work.seek(0)
+        self.work.truncate()
+        if self.is_jpeg:
+            resized.save(self.work, "JPEG", quality=quality, optimize=True)
+        else:
+            resized.save(self.work, "PNG", compress_level=9, optimize=True)
+        self.encodes += 1
+        self.last = (self.work.tell() / 1024, resized.size, quality)
+        label = f"quality {quality}" if self.is_jpeg else "PNG"
+        print(f"    {resized.size[0]}x{resized.size[1]} {label}: {self.last[0]:.1f}KB")
+
+        if self.last[0] > self.target_size_kb:
+            return False
+        self.keep_last()
+        return True
+
+    def keep_last(self):
+        """Make the candidate in the work buffer the result."""
+        self.work, self.best = self.best, self.work
+        self.best_size_kb, self.best_dims, self.best_quality = self.last
+
+    def in_band(self):
+        """True if the best candidate is close enough to the target to stop."""
+        return self.best_size_kb is not None and self.best_size_kb >= self.band_floor_kb
+
+    def width_guess(self):
+        """
+        Width expected to land near the target, assuming the encoded size
+        scales with pixel area (the source file size serves as one free probe).
+        """
+        full_width = self.img.size[0]
+        if not self.source_size_kb:
+            return full_width
+        guess = int(full_width * math.sqrt(self.target_size_kb / self.source_size_kb))
+        return max(self.min_width, min(full_width, guess))
+
+    def run(self):
+        """
+        Search for the best fitting candidate.
+
+        Returns:
+            True if a candidate fits the target; otherwise the best buffer
+            holds the smallest allowed encoding (MIN_WIDTH, lowest quality)
+        """
+        full_width = self.img.size[0]
+        low_quality = JPEG_QUALITY_RANGE[0] if self.is_jpeg else None
+        high_quality = JPEG_QUALITY_RANGE[1] if self.is_jpeg else None
+        guess = self.width_guess()
+
+        # Full size at the highest quality fits: nothing bigger or better to find
+        full_high_probed = guess == full_width
+        if full_high_probed and self.encode(full_width, high_quality):
+            return True
+
+        if self.is_jpeg and self.encode(full_width, low_quality):
+            # Full size fits at the lowest quality: only the quality needs searching
+            width = full_width
+        else:
+            # Largest width that fits at the lowest quality, bracketed by the guess and MIN_WIDTH
+            fits, too_big = None, full_width
+            for probe in dict.fromkeys((guess, self.min_width)):
+                if probe >= too_big:
+                    continue
+                if self.encode(probe, low_quality):
+                    fits = probe
+                    break
+                too_big = probe
+            if fits is None:
+                # Even the smallest allowed size is too big: keep it anyway
+                # (the last encode was exactly that candidate)
+                self.keep_last()
+                return False
+
+            step = max(WIDTH_STEP_PX, full_width // 100)
+            while too_big - fits > step and not self.in_band():
+                middle = (fits + too_big) // 2
+                if self.encode(middle, low_quality):
+                    fits = middle
+                else:
+                    too_big = middle
+            # Full size was assumed too big from the guess but never encoded
+            if too_big == full_width and not full_high_probed and not self.in_band() \
+                    and self.encode(full_width, low_quality):
+                fits = full_width
+            width = fits
+
+        # Highest quality that fits at that width (the best buffer holds width at low_quality)
+        if self.is_jpeg and not self.in_band():
+            fits = low_quality
+            if not (width == full_width and full_high_probed) and self.encode(width, high_quality):
+                return True
+            too_big = high_quality
+            while too_big - fits > 1 and not self.in_band():
+                middle = (fits + too_big) // 2
+                if self.encode(width, middle):
+                    fits = middle
+                else:
+                    too_big = middle
+        return True
+
 def compress_image(input_path, target_size_kb=300, min_compression=0, max_compression=9):
     """
     Compress an image to approximately the target size in KB.
     Keeps JPEGs as JPEGs and PNGs as PNGs for optimal compression.
 
+    Candidates are encoded in memory by TargetSizeSearch and only the
+    winner is written back to input_path.
+
     Args:
         input_path: Path to input image
         target_size_kb: Target size in KB (default 300)
@@ -72,105 +268,179 @@ def compress_image(input_path, target_size_kb=300, min_compression=0, max_compre
             original_width, original_height = img.size
             print(f"  Original dimensions: {original_width}x{original_height}")
             print(f"  Format: {'JPEG' if is_jpeg else 'PNG'}")
+            print(f"  Minimum width: {MIN_WIDTH}px, target: {target_size_kb * (1 - TARGET_TOLERANCE):.0f}-{target_size_kb}KB")
 
-            best_size = float('inf')
-            best_img = img.copy()
-
-            # Calculate the minimum resize factor to maintain MIN_WIDTH
-            min_resize_factor = MIN_WIDTH / original_width if original_width > MIN_WIDTH else 1.0
-
-            # Try different resize factors - be more aggressive for very large files
-            if original_size > 1000:  # Over 1MB, start with smaller sizes
-                resize_factors = [0.6, 0.5, 0.4, 0.35, 0.3, 0.25, 0.2, 0.15]
-            elif original_size > 500:  # Over 500KB
-                resize_factors = [0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.25, 0.2]
-            else:  # Smaller files, try compression first
-                resize_factors = [1.0, 0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.25, 0.2]
-
-            # Filter out resize factors that would make the image narrower than MIN_WIDTH
-            resize_factors = [f for f in resize_factors if f >= min_resize_factor]
-            if not resize_factors:
-                resize_factors = [min_resize_factor]  # Use minimum allowed factor
-
-            print(f"  Minimum width: {MIN_WIDTH}px (min resize factor: {min_resize_factor:.2f})")
-
-            # For JPEG, also try different quality levels
-            jpeg_qualities = [85, 75, 65, 55, 45] if is_jpeg else [None]
-
-            for resize_factor in resize_factors:
-                # Resize image if needed
-                if resize_factor < 1.0:
-                    new_width = int(original_width * resize_factor)
-                    new_height = int(original_height * resize_factor)
-                    resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                    print(f"  Trying resize: {resize_factor:.1%} ({new_width}x{new_height})")
-                else:
-                    resized_img = img
-                    print(f"  Trying original size with max compression")
-
-                temp_path = str(input_path) + ".temp"
-
-                if is_jpeg:
-                    # Try different JPEG quality levels at this size
-                    for quality in jpeg_qualities:
-                        resized_img.save(temp_path, "JPEG", quality=quality, optimize=True)
-                        temp_size = get_file_size_kb(temp_path)
-
-                        if resize_factor == 1.0 or quality == jpeg_qualities[0]:
-                            print(f"    Quality {quality}: {temp_size:.1f}KB")
-
-                        if temp_size <= target_size_kb:
-                            best_size = temp_size
-                            best_img = resized_img.copy()
-                            final_width, final_height = resized_img.size
-                            print(f"  ✓ Found suitable size: {temp_size:.1f}KB at {final_width}x{final_height} (quality={quality})")
-                            os.remove(temp_path)
-                            break
-
-                    if best_size <= target_size_kb:
-                        break
-                else:
-                    # PNG compression
-                    resized_img.save(temp_path, "PNG", compress_level=9, optimize=True)
-                    temp_size = get_file_size_kb(temp_path)
-                    print(f"    Result: {temp_size:.1f}KB")
-
-                    if temp_size <= target_size_kb:
-                        best_size = temp_size
-                        best_img = resized_img.copy()
-                        final_width, final_height = resized_img.size
-                        print(f"  ✓ Found suitable size: {temp_size:.1f}KB at {final_width}x{final_height}")
-                        os.remove(temp_path)
-                        break
-
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-
-            # If we couldn't get under target size, use the smallest we achieved while respecting MIN_WIDTH
-            if best_size == float('inf'):
+            search = TargetSizeSearch(img, is_jpeg, target_size_kb, source_size_kb=original_size)
+            if search.run():
+                final_width, final_height = search.best_dims
+                quality = f" (quality={search.best_quality})" if is_jpeg else ""
+                print(f"  ✓ Found suitable size: {search.best_size_kb:.1f}KB at {final_width}x{final_height}{quality}")
+            else:
                 print(f"  Warning: Could not reach target size, using smallest allowed size (min width: {MIN_WIDTH}px)")
-                fallback_factor = max(min_resize_factor, 0.2)
-                best_img = img.resize((int(original_width * fallback_factor), int(original_height * fallback_factor)), Image.Resampling.LANCZOS)
 
-            # Save with best image found - keep original format
-            if is_jpeg:
-                best_img.save(input_path, "JPEG", quality=45, optimize=True)
-            else:
-                best_img.save(input_path, "PNG", compress_level=9, optimize=True)
+        # Write the winner once - keeps the original format
+        with open(input_path, 'wb') as f:
+            f.write(search.best.getbuffer())
 
-            final_size = get_file_size_kb(input_path)
-            compression_ratio = (1 - final_size / original_size) * 100
-            final_width, final_height = best_img.size
+        final_size = get_file_size_kb(input_path)
+        compression_ratio = (1 - final_size / original_size) * 100
+        final_width, final_height = search.best_dims
 
-            print(f"  Final result: {original_size:.1f}KB → {final_size:.1f}KB ({compression_ratio:.1f}% reduction)")
-            print(f"  Dimensions: {original_width}x{original_height} → {final_width}x{final_height}")
+        print(f"  Final result: {original_size:.1f}KB → {final_size:.1f}KB ({compression_ratio:.1f}% reduction)")
+        print(f"  Dimensions: {original_width}x{original_height} → {final_width}x{final_height}")
+        print(f"  Encodes: {search.encodes}")
 
-            return True
+        return True
 
     except Exception as e:
         print(f"  ERROR: {e}")
         return False
 
+def file_sha256(filepath):
+    """SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def default_cache_path():
+    """Optimization cache kept next to this script, shared by every docs tree"""
+    return Path(__file__).resolve().parent / "image-cache.json"
+
+class OptimizationCache:
+    """
+    Content-addressed record of images this script has already optimized.
+
+    outputs maps the SHA-256 of each written image to the source hash and
+    the parameters it was optimized with. paths remembers each file's
+    size, mtime and hash, so unchanged files are not hashed again.
+    """
+
+    def __init__(self, path, outputs=None, paths=None):
+        self.path = Path(path)
+        self.outputs = outputs or {}
+        self.paths = paths or {}
+
+    @classmethod
+    def load(cls, path):
+        """Load the cache, or start an empty one if it is missing, unreadable or outdated."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if not isinstance(state, dict) or state.get('version') != CACHE_VERSION:
+            return cls(path)
+        return cls(path, state.get('outputs'), state.get('paths'))
+
+    def save(self):
+        """Write the cache (via a temporary file so an interrupted run keeps the old one)"""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'outputs': self.outputs, 'paths': self.paths},
+                      f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def current_hash(self, filepath):
+        """Hash of a file's current bytes, reusing the stored hash if size and mtime are unchanged"""
+        key = str(Path(filepath).resolve())
+        stat = os.stat(filepath)
+        known = self.paths.get(key)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['sha256']
+        sha256 = file_sha256(filepath)
+        self.paths[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+        return sha256
+
+    def is_optimized(self, filepath, target_size_kb):
+        """True if the file's bytes are an output of an earlier run with the same parameters"""
+        entry = self.outputs.get(self.current_hash(filepath))
+        return (entry is not None and entry['target_kb'] == target_size_kb
+                and entry['min_width'] == MIN_WIDTH)
+
+    def record(self, filepath, source_hash, target_size_kb):
+        """Remember the image just written to filepath as an optimized output"""
+        self.outputs[self.current_hash(filepath)] = {
+            'source': source_hash,
+            'target_kb': target_size_kb,
+            'min_width': MIN_WIDTH,
+            'size': os.path.getsize(filepath),
+        }
+
+def compress_image_captured(input_path, target_size_kb=300):
+    """
+    Compress one image with its console output captured, for worker processes.
+
+    Returns:
+        (success, output, final_size_kb) where output is everything
+        compress_image printed
+    """
+    buffer = StringIO()
+    with redirect_stdout(buffer):
+        success = compress_image(input_path, target_size_kb=target_size_kb)
+    return success, buffer.getvalue(), get_file_size_kb(input_path)
+
+def compress_all(large_images, target_size_kb=300, jobs=1, cache=None):
+    """
+    Compress every image, serially or across a process pool.
+
+    Output is printed per image in list order either way; with several
+    workers each image's block is printed at once when it and every image
+    before it have finished.
+
+    Args:
+        large_images: (path, size_kb) pairs from find_large_images
+        target_size_kb: Target size in KB
+        jobs: Number of worker processes (1 = compress in this process)
+        cache: Optional OptimizationCache; each compressed image is recorded
+            in it (from this process) against its source hash
+
+    Returns:
+        (successful, failed, total_final_size_kb)
+    """
+    successful = 0
+    failed = 0
+    total_final_size = 0
+    count = len(large_images)
+    sources = {filepath: cache.current_hash(filepath) for filepath, _ in large_images} if cache else {}
+
+    if jobs <= 1:
+        for i, (filepath, original_size) in enumerate(large_images, 1):
+            print(f"\n[{i}/{count}] Processing: {filepath}")
+
+            if compress_image(filepath, target_size_kb=target_size_kb):
+                successful += 1
+                total_final_size += get_file_size_kb(filepath)
+                if cache:
+                    cache.record(filepath, sources[filepath], target_size_kb)
+            else:
+                failed += 1
+                total_final_size += original_size  # Keep original size if failed
+        return successful, failed, total_final_size
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(compress_image_captured, filepath, target_size_kb)
+                   for filepath, _ in large_images]
+        for i, ((filepath, original_size), future) in enumerate(zip(large_images, futures), 1):
+            try:
+                success, output, final_size = future.result()
+            except Exception as e:
+                success, output, final_size = False, f"  ERROR: {e}\n", original_size
+            # One write per image so blocks never interleave
+            sys.stdout.write(f"\n[{i}/{count}] Processing: {filepath}\n{output}")
+            sys.stdout.flush()
+
+            if success:
+                successful += 1
+                total_final_size += final_size
+                if cache:
+                    cache.record(filepath, sources[filepath], target_size_kb)
+            else:
+                failed += 1
+                total_final_size += original_size  # Keep original size if failed
+    return successful, failed, total_final_size
+
 def find_large_images(root_dir, min_size_kb=500):
     """Find all images larger than min_size_kb"""
     large_images = []
@@ -187,10 +457,21 @@ def find_large_images(root_dir, min_size_kb=500):
     return sorted(large_images, key=lambda x: x[1], reverse=True)
 
 def main():
+    parser = argparse.ArgumentParser(description='Compress large images in a docs directory to ~300KB each')
+    parser.add_argument('docs_dir', nargs='?', help='Directory to scan (default: ./docs)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of worker processes (default: 1; 0 = CPU count)')
+    parser.add_argument('--cache', type=Path, default=default_cache_path(),
+                        help='Optimization cache file (default: image-cache.json next to this script)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-evaluate every large image and do not update the cache')
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+
     # Determine starting directory
-    if len(sys.argv) > 1:
+    if args.docs_dir:
         # Use command line argument if provided
-        docs_dir = Path(sys.argv[1])
+        docs_dir = Path(args.docs_dir)
         print(f"📂 Using directory from command line: {docs_dir.absolute()}")
     else:
         # Check current working directory for 'docs' subdirectory
@@ -227,34 +508,54 @@ def main():
     total_original_size = 0
     
     for filepath, size_kb in large_images:
-        print(f"  {filepath}: {size_kb:.1f}KB")
+        # Dimensions come from the file header, so listing decodes nothing
+        info = read_image_header(filepath)
+        if info:
+            print(f"  {filepath}: {size_kb:.1f}KB ({info.display_width}x{info.display_height}, "
+                  f"{info.bytes_per_displayed_pixel(MIN_WIDTH):.2f} bytes per displayed pixel)")
+        else:
+            print(f"  {filepath}: {size_kb:.1f}KB")
         total_original_size += size_kb
     
     print(f"\n📈 Total size of large images: {total_original_size:.1f}KB ({total_original_size/1024:.1f}MB)")
-    
+
+    # Skip images whose bytes are already an output of an earlier run
+    cache = None if args.no_cache else OptimizationCache.load(args.cache)
+    skipped = 0
+    if cache:
+        pending = [(filepath, size_kb) for filepath, size_kb in large_images
+                   if not cache.is_optimized(filepath, TARGET_SIZE_KB)]
+        skipped = len(large_images) - len(pending)
+        if skipped:
+            print(f"\n⏭️  Skipping {skipped} images already optimized by an earlier run (cache: {cache.path})")
+        if not pending:
+            cache.save()
+            print(f"✅ All {len(large_images)} large images are already optimized")
+            return
+        total_original_size = sum(size_kb for _, size_kb in pending)
+        large_images = pending
+
     # Automatically proceed with compression
-    print(f"\n🚀 Starting compression of {len(large_images)} images to ~300KB each...")
+    print(f"\n🚀 Starting compression of {len(large_images)} images to ~{TARGET_SIZE_KB}KB each...")
     
     # Compress images
-    print(f"\n🔄 Compressing {len(large_images)} images...")
-    successful = 0
-    failed = 0
-    total_final_size = 0
-    
-    for i, (filepath, original_size) in enumerate(large_images, 1):
-        print(f"\n[{i}/{len(large_images)}] Processing: {filepath}")
-        
-        if compress_image(filepath, target_size_kb=300):
-            successful += 1
-            total_final_size += get_file_size_kb(filepath)
-        else:
-            failed += 1
-            total_final_size += original_size  # Keep original size if failed
+    workers = f" with {jobs} workers" if jobs > 1 else ""
+    print(f"\n🔄 Compressing {len(large_images)} images{workers}...")
+    start_time = time.perf_counter()
+    try:
+        successful, failed, total_final_size = compress_all(large_images, target_size_kb=TARGET_SIZE_KB,
+                                                            jobs=jobs, cache=cache)
+    finally:
+        if cache:
+            cache.save()
+    elapsed = time.perf_counter() - start_time
     
     # Summary
     print(f"\n✅ Compression Complete!")
     print(f"📊 Results:")
     print(f"  • Successful: {successful}")
+    if skipped:
+        print(f"  • Skipped (already optimized): {skipped}")
     print(f"  • Failed: {failed}")
     print(f"  • Original total: {total_original_size:.1f}KB ({total_original_size/1024:.1f}MB)")
     print(f"  • Final total: {total_final_size:.1f}KB ({total_final_size/1024:.1f}MB)")
@@ -266,6 +567,9 @@ def main():
         savings = total_original_size - total_final_size
         savings_percent = (savings / total_original_size) * 100
         print(f"  • Saved: {savings:.1f}KB ({savings/1024:.1f}MB, {savings_percent:.1f}%)")
+
+    if elapsed > 0:
+        print(f"  • Time: {elapsed:.1f}s ({len(large_images) / elapsed:.2f} images/s{workers})")
     
     print(f"\n💡 Backup files (.backup) created for safety")
 
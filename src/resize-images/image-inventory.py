@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Image Inventory Report
+
+Lists every image under a docs directory with its format, dimensions, EXIF
+orientation and size, read from the file headers only (see image_headers.py),
+so even a large docs tree is scanned in well under a second.
+
+Images are ranked by bytes per displayed pixel: the file size divided by
+the number of pixels a reader actually sees once the image is scaled to
+the column width. A 2 MB, 4000px-wide photo shown 800px wide scores far
+worse than a 2 MB 800px-wide one, which is what makes it the better
+candidate for compress-images.py.
+
+Usage:
+    python image-inventory.py                    # ./docs, top 20
+    python image-inventory.py /path/to/docs --top 50
+    python image-inventory.py docs --json > image-inventory.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from image_headers import scan_images
+
+# Width of the docs content column in pixels (MIN_WIDTH in compress-images.py)
+COLUMN_WIDTH = 800
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report images under a docs directory by bytes per displayed pixel')
+    parser.add_argument('docs_dir', nargs='?', type=Path, default=Path('docs'),
+                        help='Directory to scan (default: ./docs)')
+    parser.add_argument('-n', '--top', type=int, default=20,
+                        help='Number of worst offenders to list (default: 20; 0 = all)')
+    parser.add_argument('--column-width', type=int, default=COLUMN_WIDTH,
+                        help=f'Displayed width images are scaled down to (default: {COLUMN_WIDTH})')
+    parser.add_argument('--min-size-kb', type=float, default=0,
+                        help='Only list images at least this large (default: 0)')
+    parser.add_argument('--json', action='store_true',
+                        help='Print the full inventory as JSON instead of the report')
+    args = parser.parse_args()
+
+    if not args.docs_dir.is_dir():
+        print(f"❌ ERROR: Directory does not exist: {args.docs_dir.absolute()}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    unreadable = []
+    inventory = list(scan_images(args.docs_dir, unreadable))
+    elapsed = time.perf_counter() - start
+    column_width = args.column_width
+
+    if args.json:
+        json.dump([{
+            'path': str(info.path),
+            'format': info.format,
+            'width': info.width,
+            'height': info.height,
+            'orientation': info.orientation,
+            'bits_per_pixel': info.bits_per_pixel,
+            'bytes': info.file_size,
+            'bytes_per_pixel': round(info.bytes_per_pixel, 4),
+            'bytes_per_displayed_pixel': round(info.bytes_per_displayed_pixel(column_width), 4),
+        } for info in inventory], sys.stdout, indent=2)
+        print()
+        return
+
+    total_bytes = sum(info.file_size for info in inventory)
+    formats = Counter(info.format for info in inventory)
+    oversized = [info for info in inventory if info.display_width > column_width]
+    rotated = [info for info in inventory if info.orientation != 1]
+
+    print(f"🔍 Scanned {len(inventory)} images in {args.docs_dir} ({elapsed * 1000:.0f} ms, headers only)")
+    print(f"📊 Total: {total_bytes / 1024 / 1024:.1f}MB - "
+          + ", ".join(f"{count} {name}" for name, count in formats.most_common()))
+    print(f"  • Wider than the {column_width}px column: {len(oversized)} "
+          f"({sum(info.file_size for info in oversized) / 1024 / 1024:.1f}MB)")
+    if rotated:
+        print(f"  • With EXIF rotation: {len(rotated)}")
+    if unreadable:
+        print(f"  ⚠️  Unrecognised or truncated headers: {len(unreadable)}")
+        for path in unreadable[:5]:
+            print(f"     {path}")
+
+    candidates = [info for info in inventory if info.file_size >= args.min_size_kb * 1024]
+    candidates.sort(key=lambda info: info.bytes_per_displayed_pixel(column_width), reverse=True)
+    if args.top > 0:
+        candidates = candidates[:args.top]
+    if not candidates:
+        return
+
+    print(f"\n🏆 Worst offenders by bytes per displayed pixel ({column_width}px column):")
+    print(f"{'B/px shown':>10} {'KB':>8} {'Dimensions':>11} {'Fmt':<4} {'Rot':>3}  Path")
+    print(f"{'-' * 10} {'-' * 8} {'-' * 11} {'-' * 4} {'-' * 3}  {'-' * 4}")
+    for info in candidates:
+        dimensions = f"{info.display_width}x{info.display_height}"
+        print(f"{info.bytes_per_displayed_pixel(column_width):>10.2f} {info.file_size / 1024:>8.1f} "
+              f"{dimensions:>11} {info.format:<4} {info.orientation:>3}  {info.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Image Header Reader
+
+Reads the dimensions, format, EXIF orientation and bit depth of PNG, JPEG,
+GIF and WebP files from their headers alone, without decoding any pixels.
+Used by image-inventory.py for its report and by compress-images.py to
+describe the images it is about to compress.
+
+Only a few small reads are needed per file:
+
+- PNG: the IHDR chunk right after the signature, then the chunk headers
+  up to the first IDAT, looking for an eXIf chunk
+- JPEG: the marker segments up to the first SOF (start of frame); APP1 is
+  read only if it carries EXIF data, every other segment is seeked over
+- GIF and WebP: the first 30 bytes
+
+Usage:
+    from image_headers import read_image_header, scan_images
+
+    info = read_image_header('docs/img/cover.jpg')
+    print(info.display_width, info.display_height, info.bytes_per_pixel)
+
+    for info in scan_images('docs'):
+        ...
+"""
+
+import os
+import struct
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp'}
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Samples per pixel for each PNG color type (grey, RGB, palette, grey+alpha, RGBA)
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# JPEG start-of-frame markers: C0-CF except DHT (C4), JPG (C8) and DAC (CC)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# JPEG markers without a length field
+JPEG_STANDALONE_MARKERS = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8}
+
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+class ImageInfo(NamedTuple):
+    """What an image's header says about it"""
+    path: Path
+    format: str             # 'PNG', 'JPEG', 'GIF' or 'WEBP'
+    width: int              # Stored width in pixels
+    height: int             # Stored height in pixels
+    orientation: int        # EXIF orientation 1-8 (1 = display as stored)
+    bits_per_pixel: int     # Bits per decoded pixel (palette images: bits per index)
+    file_size: int          # Bytes on disk
+
+    @property
+    def display_width(self) -> int:
+        """Width after EXIF orientation is applied"""
+        return self.height if self.orientation >= 5 else self.width
+
+    @property
+    def display_height(self) -> int:
+        """Height after EXIF orientation is applied"""
+        return self.width if self.orientation >= 5 else self.height
+
+    @property
+    def bytes_per_pixel(self) -> float:
+        """File bytes per stored pixel"""
+        return self.file_size / max(1, self.width * self.height)
+
+    def displayed_pixels(self, column_width: int) -> int:
+        """Pixels shown when the image is scaled down to fit column_width."""
+        width, height = self.display_width, self.display_height
+        if width > column_width:
+            height = max(1, round(height * column_width / width))
+            width = column_width
+        return width * height
+
+    def bytes_per_displayed_pixel(self, column_width: int) -> float:
+        """File bytes per pixel actually shown in a column_width-wide column."""
+        return self.file_size / max(1, self.displayed_pixels(column_width))
+
+
+def exif_orientation(tiff: bytes) -> int:
+    """
+    Orientation tag from the IFD0 of a TIFF-structured EXIF block.
+
+    Returns:
+        1-8, or 1 if the block is malformed or has no orientation tag
+    """
+    endian = {b'II': '<', b'MM': '>'}.get(tiff[:2])
+    if endian is None or len(tiff) < 8:
+        return 1
+    offset = struct.unpack_from(endian + 'I', tiff, 4)[0]
+    if offset + 2 > len(tiff):
+        return 1
+    count = struct.unpack_from(endian + 'H', tiff, offset)[0]
+    for entry in range(offset + 2, min(offset + 2 + 12 * count, len(tiff) - 11), 12):
+        tag = struct.unpack_from(endian + 'H', tiff, entry)[0]
+        if tag == EXIF_ORIENTATION_TAG:
+            value = struct.unpack_from(endian + 'H', tiff, entry + 8)[0]
+            return value if 1 <= value <= 8 else 1
+    return 1
+
+
+def _read_png(f) -> Optional[tuple]:
+    header = f.read(18)     # IHDR length and type, then width, height, bit depth, color type
+    if len(header) < 18 or header[4:8] != b'IHDR':
+        return None
+    width, height, depth, color_type = struct.unpack_from('>IIBB', header, 8)
+    bits = depth * PNG_CHANNELS.get(color_type, 0)
+
+    # eXIf, if present, comes before the image data; skip every other chunk unread
+    orientation = 1
+    f.seek(8 + 8 + 13 + 4)
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            break
+        length, kind = struct.unpack('>I4s', chunk)
+        if kind in (b'IDAT', b'IEND'):
+            break
+        if kind == b'eXIf':
+            orientation = exif_orientation(f.read(length))
+            break
+        f.seek(length + 4, os.SEEK_CUR)    # data + CRC
+    return 'PNG', width, height, orientation, bits
+
+
+def _read_jpeg(f) -> Optional[tuple]:
+    orientation = 1
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue    # Tolerate junk between segments
+        marker = f.read(1)
+        while marker == b'\xff':
+            marker = f.read(1)  # Fill bytes
+        if not marker:
+            return None
+        code = marker[0]
+        if code in JPEG_STANDALONE_MARKERS:
+            continue
+        if code in (0xD9, 0xDA):
+            return None     # End of image or start of scan before any frame header
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+
+        if code in JPEG_SOF_MARKERS:
+            frame = f.read(6)
+            if len(frame) < 6:
+                return None
+            precision, height, width, components = struct.unpack('>BHHB', frame)
+            return 'JPEG', width, height, orientation, precision * components
+        if code == 0xE1 and orientation == 1:
+            segment = f.read(length - 2)
+            if segment.startswith(b'Exif\x00\x00'):
+                orientation = exif_orientation(segment[6:])
+            continue
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _read_gif(header: bytes) -> Optional[tuple]:
+    if len(header) < 11:
+        return None
+    width, height = struct.unpack_from('<HH', header, 6)
+    return 'GIF', width, height, 1, (header[10] & 0x07) + 1
+
+
+def _read_webp(header: bytes) -> Optional[tuple]:
+    if len(header) < 30:
+        return None
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack_from('<HH', header, 26)
+        return 'WEBP', width & 0x3FFF, height & 0x3FFF, 1, 24
+    if chunk == b'VP8L':
+        bits = struct.unpack_from('<I', header, 21)[0]
+        alpha = (bits >> 28) & 1
+        return 'WEBP', (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1, 1, 32 if alpha else 24
+    if chunk == b'VP8X':
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+        return 'WEBP', width, height, 1, 32 if header[20] & 0x10 else 24
+    return None
+
+
+def read_image_header(path) -> Optional[ImageInfo]:
+    """
+    Read an image's header.
+
+    Args:
+        path: Path to a PNG, JPEG, GIF or WebP file
+
+    Returns:
+        ImageInfo, or None if the file is not a recognised or complete image header
+    """
+    path = Path(path)
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        header = f.read(30)
+        if header.startswith(PNG_SIGNATURE):
+            f.seek(8)
+            fields = _read_png(f)
+        elif header.startswith(b'\xff\xd8'):
+            fields = _read_jpeg(f)
+        elif header[:6] in (b'GIF87a', b'GIF89a'):
+            fields = _read_gif(header)
+        elif header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            fields = _read_webp(header)
+        else:
+            fields = None
+    if fields is None:
+        return None
+    return ImageInfo(path, *fields, file_size)
+
+
+def iter_image_paths(root) -> Iterator[Path]:
+    """Image files under root (by extension, case-insensitive), in directory order."""
+    for directory, dirs, files in os.walk(root):
+        dirs.sort()
+        for file in sorted(files):
+            if os.path.splitext(file)[1].lower() in IMAGE_EXTENSIONS:
+                yield Path(directory) / file
+
+
+def scan_images(root, unreadable: list = None) -> Iterator[ImageInfo]:
+    """
+    Read the header of every image under root.
+
+    Args:
+        root: Directory to walk
+        unreadable: If given, paths whose header could not be read are appended to it
+    """
+    for path in iter_image_paths(root):
+        try:
+            info = read_image_header(path)
+        except (OSError, struct.error):
+            info = None
+        if info is not None:
+            yield info
+        elif unreadable is not None:
+            unreadable.append(path)
@@ -7,15 +7,35 @@ Resizes images to 1200x630 pixels for optimal social media preview display
 
 Usage:
     python social-media.py input.jpg output.jpg [--mode MODE] [--background COLOR]
+    python social-media.py --batch "docs/sims/*/*.png" [--output-dir DIR] [--jobs N]
+    python social-media.py --manifest cards.txt [--jobs N]
 
 Modes:
     - fit: Resize to fit within 1200x630, add letterboxing if needed (default)
     - fill: Resize to fill 1200x630, crop excess from center
     - stretch: Stretch to exactly 1200x630 (may distort aspect ratio)
+
+Batch mode converts many images in one run, optionally across N worker
+processes, instead of paying Python and PIL startup once per image.
+Inputs come from glob patterns (--batch) or a manifest file with one
+"input [output]" pair per line. Outputs default to <name>-social.jpg next
+to each input, or mirror the inputs' layout under --output-dir. An output
+that is at least as new as its input is skipped (use --force to rebuild).
+
+Large sources are shrunk before the final LANCZOS pass: JPEGs are decoded
+at reduced scale with Image.draft(), and anything still too large is
+box-reduced with Image.reduce(). Both stop at REDUCING_GAP times the final
+size, so LANCZOS still does the last, quality-relevant part of the resize.
 """
 
 import argparse
+import glob
+import os
+import shlex
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
 from pathlib import Path
 from PIL import Image, ImageOps
 
@@ -23,6 +43,12 @@ from PIL import Image, ImageOps
 TARGET_WIDTH = 1200
 TARGET_HEIGHT = 630
 
+# Pre-shrinking stops once the image is this many times the size LANCZOS resizes it to
+REDUCING_GAP = 2.0
+
+# Batch-mode outputs written next to their input are named <stem><SOCIAL_SUFFIX>.jpg
+SOCIAL_SUFFIX = '-social'
+
 
 def resize_fit(img: Image.Image, bg_color: str = 'white') -> Image.Image:
     """
@@ -94,6 +120,28 @@ def resize_stretch(img: Image.Image) -> Image.Image:
     return img.resize((TARGET_WIDTH, TARGET_HEIGHT), Image.Resampling.LANCZOS)
 
 
+def resized_size(width: int, height: int, mode: str) -> tuple:
+    """
+    Size a width x height image is resized to by the given mode, before
+    letterboxing or cropping.
+    """
+    if mode == 'stretch':
+        return TARGET_WIDTH, TARGET_HEIGHT
+    # fit scales to the tighter side, fill to the looser one
+    choose = min if mode == 'fit' else max
+    scale = choose(TARGET_WIDTH / width, TARGET_HEIGHT / height)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def preshrink_size(img: Image.Image, mode: str) -> tuple:
+    """
+    Size below which pre-shrinking stops: REDUCING_GAP times the size the
+    image is resized to, so LANCZOS still does the final part of the resize.
+    """
+    width, height = resized_size(img.width, img.height, mode)
+    return int(width * REDUCING_GAP), int(height * REDUCING_GAP)
+
+
 def process_image(input_path: str, output_path: str, mode: str = 'fit',
                  bg_color: str = 'white', verbose: bool = False) -> bool:
     """
@@ -112,6 +160,7 @@ def process_image(input_path: str, output_path: str, mode: str = 'fit',
     try:
         # Open the image
         img = Image.open(input_path)
+        original_size = img.size
 
         if verbose:
             print(f"Input: {input_path}")
@@ -119,22 +168,35 @@ def process_image(input_path: str, output_path: str, mode: str = 'fit',
             print(f"  Format: {img.format}")
             print(f"  Mode: {img.mode}")
 
+        if mode not in ('fit', 'fill', 'stretch'):
+            print(f"Error: Unknown mode '{mode}'", file=sys.stderr)
+            return False
+
+        # Large JPEGs are decoded at 1/2, 1/4 or 1/8 scale (only possible before the pixels load)
+        if img.format == 'JPEG':
+            img.draft(img.mode, preshrink_size(img, mode))
+
         # Convert to RGB if necessary (handles RGBA, P, L, etc.)
         if img.mode not in ('RGB', 'L'):
             if verbose:
                 print(f"  Converting from {img.mode} to RGB")
             img = img.convert('RGB')
 
+        # Box-reduce whatever is still much larger than needed before the LANCZOS pass
+        shrink_width, shrink_height = preshrink_size(img, mode)
+        factor = int(min(img.width / shrink_width, img.height / shrink_height))
+        if factor > 1:
+            img = img.reduce(factor)
+        if verbose and img.size != original_size:
+            print(f"  Pre-shrunk to {img.width}x{img.height}")
+
         # Apply resize mode
         if mode == 'fit':
             result = resize_fit(img, bg_color)
         elif mode == 'fill':
             result = resize_fill(img)
-        elif mode == 'stretch':
-            result = resize_stretch(img)
         else:
-            print(f"Error: Unknown mode '{mode}'", file=sys.stderr)
-            return False
+            result = resize_stretch(img)
 
         # Ensure output directory exists
         output_dir = Path(output_path).parent
@@ -157,10 +219,143 @@ def process_image(input_path: str, output_path: str, mode: str = 'fit',
         print(f"Error: Input file not found: {input_path}", file=sys.stderr)
         return False
     except Exception as e:
-        print(f"Error processing image: {e}", file=sys.stderr)
+        print(f"Error processing image {input_path}: {e}", file=sys.stderr)
+        return False
+
+
+def process_image_captured(input_path: str, output_path: str, mode: str = 'fit',
+                           bg_color: str = 'white', verbose: bool = False) -> tuple:
+    """
+    Run process_image with its output captured, for use in a worker process.
+
+    Returns:
+        (success, output) where output is everything the image printed
+    """
+    buffer = StringIO()
+    with redirect_stdout(buffer), redirect_stderr(buffer):
+        success = process_image(input_path, output_path, mode, bg_color, verbose)
+    return success, buffer.getvalue()
+
+
+def glob_inputs(patterns: list) -> list:
+    """
+    Expand glob patterns into (input, None) pairs, in sorted order.
+
+    Files named *-social.jpg are left out so that re-running a pattern does
+    not turn earlier outputs into inputs.
+    """
+    pairs = []
+    seen = set()
+    for pattern in patterns:
+        for match in sorted(glob.glob(pattern, recursive=True)):
+            path = Path(match)
+            if path.is_file() and not path.stem.endswith(SOCIAL_SUFFIX) and path not in seen:
+                seen.add(path)
+                pairs.append((path, None))
+    return pairs
+
+
+def read_manifest(manifest: Path) -> list:
+    """
+    Read (input, output) pairs from a manifest.
+
+    Each non-blank line not starting with # holds an input path and an
+    optional output path, separated by whitespace (quote paths containing
+    spaces). Relative paths are relative to the manifest's directory; a
+    missing output is returned as None.
+    """
+    pairs = []
+    root = manifest.parent
+    for number, line in enumerate(manifest.read_text(encoding='utf-8').splitlines(), 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        fields = shlex.split(line)
+        if len(fields) > 2:
+            raise ValueError(f"{manifest}:{number}: expected 'input [output]', got {len(fields)} fields")
+        pairs.append((root / fields[0], root / fields[1] if len(fields) == 2 else None))
+    return pairs
+
+
+def assign_outputs(pairs: list, output_dir: Path = None) -> list:
+    """
+    Fill in missing outputs: <stem>-social.jpg next to the input, or with
+    output_dir, the input's path relative to the inputs' common directory
+    mirrored under output_dir (docs/sims/x/x.png -> output_dir/x/x.jpg).
+    """
+    missing = [input_path.absolute() for input_path, output_path in pairs if output_path is None]
+    if output_dir is not None and missing:
+        base = Path(os.path.commonpath([path.parent for path in missing]))
+
+    assigned = []
+    for input_path, output_path in pairs:
+        if output_path is None:
+            if output_dir is None:
+                output_path = input_path.with_name(f"{input_path.stem}{SOCIAL_SUFFIX}.jpg")
+            else:
+                output_path = (output_dir / input_path.absolute().relative_to(base)).with_suffix('.jpg')
+        assigned.append((input_path, output_path))
+    return assigned
+
+
+def is_up_to_date(input_path: Path, output_path: Path) -> bool:
+    """True if the output exists and is at least as new as its input."""
+    try:
+        return output_path.stat().st_mtime_ns >= input_path.stat().st_mtime_ns
+    except OSError:
         return False
 
 
+def process_batch(pairs: list, mode: str = 'fit', bg_color: str = 'white', verbose: bool = False,
+                  jobs: int = 1, force: bool = False) -> tuple:
+    """
+    Convert many images, serially or across a process pool.
+
+    Each image's output is printed in one piece, in manifest/glob order.
+
+    Args:
+        pairs: (input, output) paths
+        mode: Resize mode ('fit', 'fill', or 'stretch')
+        bg_color: Background color for 'fit' mode
+        verbose: Print detailed information
+        jobs: Number of worker processes (1 = convert in this process)
+        force: Convert even if the output is already up to date
+
+    Returns:
+        (converted, skipped, failed)
+    """
+    pending = [(input_path, output_path) for input_path, output_path in pairs
+               if force or not is_up_to_date(input_path, output_path)]
+    skipped = len(pairs) - len(pending)
+    converted = 0
+    failed = 0
+
+    if jobs <= 1:
+        for input_path, output_path in pending:
+            if process_image(str(input_path), str(output_path), mode, bg_color, verbose):
+                converted += 1
+            else:
+                failed += 1
+        return converted, skipped, failed
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(process_image_captured, str(input_path), str(output_path),
+                                   mode, bg_color, verbose)
+                   for input_path, output_path in pending]
+        for (input_path, _), future in zip(pending, futures):
+            try:
+                success, output = future.result()
+            except Exception as e:
+                success, output = False, f"Error processing image {input_path}: {e}\n"
+            # One write per image so blocks never interleave
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            if success:
+                converted += 1
+            else:
+                failed += 1
+    return converted, skipped, failed
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Resize images to 1200x630 for social media previews',
@@ -178,15 +373,26 @@ Examples:
 
   # Custom background color for letterboxing
   python social-media.py input.jpg output.jpg --background "#1a73e8"
+
+  # Every MicroSim screenshot, 4 at a time, written as <name>-social.jpg
+  python social-media.py --batch "docs/sims/*/*.png" --jobs 4
+
+  # Same, but into a separate tree (docs/sims/x/x.png -> social/x/x.jpg)
+  python social-media.py --batch "docs/sims/*/*.png" --output-dir social
+
+  # Pairs listed in a manifest ("input [output]" per line)
+  python social-media.py --manifest cards.txt --mode fill
         """
     )
 
     parser.add_argument(
         'input',
+        nargs='?',
         help='Input image path'
     )
     parser.add_argument(
         'output',
+        nargs='?',
         help='Output image path'
     )
     parser.add_argument(
@@ -205,9 +411,62 @@ Examples:
         action='store_true',
         help='Print detailed information'
     )
+    batch = parser.add_argument_group('batch mode')
+    batch.add_argument(
+        '--batch',
+        metavar='GLOB',
+        action='append',
+        help='Convert every image matching this glob (quote it; ** recurses). May be repeated'
+    )
+    batch.add_argument(
+        '--manifest',
+        type=Path,
+        help='Convert the "input [output]" pairs listed in this file, one per line'
+    )
+    batch.add_argument(
+        '-o', '--output-dir',
+        type=Path,
+        help='Write outputs under this directory, mirroring the inputs\' layout. '
+             'Default: <name>-social.jpg next to each input'
+    )
+    batch.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes (default: 1; 0 = CPU count)'
+    )
+    batch.add_argument(
+        '-f', '--force',
+        action='store_true',
+        help='Convert even when the output is newer than its input'
+    )
 
     args = parser.parse_args()
 
+    if args.batch or args.manifest:
+        if args.input or args.output:
+            parser.error('input/output cannot be combined with --batch or --manifest')
+        try:
+            pairs = glob_inputs(args.batch or [])
+            if args.manifest:
+                pairs += read_manifest(args.manifest)
+            pairs = assign_outputs(pairs, args.output_dir)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        if not pairs:
+            print("Error: No input images found", file=sys.stderr)
+            sys.exit(1)
+
+        jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+        converted, skipped, failed = process_batch(pairs, args.mode, args.background, args.verbose,
+                                                   jobs=jobs, force=args.force)
+        print(f"Converted: {converted}, up to date: {skipped}, failed: {failed}")
+        sys.exit(0 if failed == 0 else 1)
+
+    if not args.input or not args.output:
+        parser.error('input and output are required unless --batch or --manifest is given')
+
     # Process the image
     success = process_image(
         args.input,
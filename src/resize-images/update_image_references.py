@@ -1,102 +1,222 @@
 #!/usr/bin/env python3
 """
 Update image references from .png to .jpg in markdown files
+
+docs is walked once, collecting the markdown files and an index of every
+image asset (path without extension -> extensions present). Each markdown
+file is then rewritten in a single regex pass: a .png reference becomes
+.jpg when the index says the .jpg exists and the .png does not, so no
+reference costs a filesystem lookup.
+
+References are resolved the way MkDocs resolves them: relative paths in
+markdown images and <img> tags from the markdown file's directory, paths
+starting with / and front matter image: fields from the docs root.
+
+Usage:
+    python update_image_references.py [docs_dir] [--jobs N] [--dry-run]
 """
 
+import argparse
 import os
+import posixpath
 import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def update_markdown_files():
-    """Update all markdown files to reference .jpg instead of .png where conversion occurred"""
-    
-    # Navigate to repo root from src/resize-images/
-    repo_root = Path(__file__).parent.parent.parent
-    docs_dir = repo_root / "docs"
-    
-    # Find all markdown files
+from image_headers import IMAGE_EXTENSIONS
+
+# Image references that may point at a converted .png, matched in one pass:
+#   ![alt](image.png), <img src="image.png">, and front matter
+#   image: / og:image: / twitter:image: path.png
+REFERENCE_PATTERN = re.compile(
+    r'!\[[^\]]*\]\((?P<markdown>[^)]*\.png)\)'
+    r'|<img[^>]*src="(?P<html>[^"]*\.png)"[^>]*>'
+    r'|image:\s*(?P<meta>[^\s]*\.png)'
+)
+
+# Set in each worker process by _init_worker, so the index is sent once per worker
+_assets = None
+
+
+def index_docs(docs_dir):
+    """
+    Walk docs_dir once.
+
+    Returns:
+        (markdown_files, assets) where assets maps each image's docs-relative
+        POSIX path without extension to the set of extensions present
+    """
     markdown_files = []
+    assets = defaultdict(set)
     for root, dirs, files in os.walk(docs_dir):
+        relative = Path(root).relative_to(docs_dir).as_posix()
+        prefix = '' if relative == '.' else relative + '/'
         for file in files:
+            stem, ext = os.path.splitext(file)
             if file.endswith('.md'):
                 markdown_files.append(Path(root) / file)
-    
-    print(f"🔍 Found {len(markdown_files)} markdown files to check")
-    
+            elif ext.lower() in IMAGE_EXTENSIONS:
+                assets[prefix + stem].add(ext)
+    return sorted(markdown_files), dict(assets)
+
+
+def converted_key(reference, md_dir, from_root):
+    """
+    Index key of a .png reference, or None if it points outside docs.
+
+    Args:
+        reference: The path as written, ending in .png
+        md_dir: Docs-relative POSIX directory of the markdown file
+        from_root: Resolve relative paths from the docs root rather than md_dir
+    """
+    if '://' in reference or reference.startswith('data:'):
+        return None
+    if reference.startswith('/') or from_root:
+        path = reference.lstrip('/')
+    else:
+        path = posixpath.join(md_dir, reference)
+    path = posixpath.normpath(path)
+    if path.startswith('../') or path == '..':
+        return None
+    return path[:-len('.png')]
+
+
+def rewrite_references(content, md_dir, assets):
+    """
+    Rewrite .png references whose image was converted to .jpg.
+
+    Returns:
+        (new_content, changes) where changes lists (line, old, new) per reference
+    """
+    changes = []
+    line = 1
+    counted = 0     # Offset up to which newlines have been counted into line
+
+    def replace(match):
+        nonlocal line, counted
+        group = match.lastgroup
+        reference = match.group(group)
+        extensions = assets.get(converted_key(reference, md_dir, group == 'meta'))
+        if not extensions or '.jpg' not in extensions or '.png' in extensions:
+            return match.group(0)
+        updated = reference[:-len('.png')] + '.jpg'
+        line += content.count('\n', counted, match.start(group))
+        counted = match.start(group)
+        changes.append((line, reference, updated))
+        start, end = match.start(group) - match.start(), match.end(group) - match.start()
+        text = match.group(0)
+        return text[:start] + updated + text[end:]
+
+    return REFERENCE_PATTERN.sub(replace, content), changes
+
+
+def _init_worker(assets):
+    global _assets
+    _assets = assets
+
+
+def update_file(md_file, docs_dir, dry_run=False, assets=None):
+    """
+    Rewrite one markdown file (in place unless dry_run).
+
+    Returns:
+        (changes, error) - the (line, old, new) changes made or proposed,
+        and an error message if the file could not be processed
+    """
+    try:
+        with open(md_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        md_dir = posixpath.normpath(Path(md_file).parent.relative_to(docs_dir).as_posix())
+        content, changes = rewrite_references(content, md_dir, assets if assets is not None else _assets)
+        if changes and not dry_run:
+            with open(md_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+        return changes, None
+    except Exception as e:
+        return [], str(e)
+
+
+def update_markdown_files(docs_dir=None, jobs=1, dry_run=False):
+    """
+    Update all markdown files to reference .jpg instead of .png where conversion occurred
+
+    Args:
+        docs_dir: Docs directory (default: docs at the repo root)
+        jobs: Number of worker processes (1 = process files in this process)
+        dry_run: Report the changes without writing any file
+
+    Returns:
+        (updated_files, total_replacements)
+    """
+    if docs_dir is None:
+        # Navigate to repo root from src/resize-images/
+        repo_root = Path(__file__).parent.parent.parent
+        docs_dir = repo_root / "docs"
+
+    markdown_files, assets = index_docs(docs_dir)
+    print(f"🔍 Found {len(markdown_files)} markdown files to check "
+          f"({sum(len(extensions) for extensions in assets.values())} image assets indexed)")
+
+    if jobs <= 1:
+        results = (update_file(md_file, docs_dir, dry_run, assets) for md_file in markdown_files)
+    else:
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(assets,))
+        results = executor.map(update_file, markdown_files, [docs_dir] * len(markdown_files),
+                               [dry_run] * len(markdown_files), chunksize=16)
+
     updated_files = []
     total_replacements = 0
-    
-    for md_file in markdown_files:
-        try:
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            original_content = content
-            
-            # Replace .png with .jpg for images that were converted
-            # Pattern to match image references
-            patterns = [
-                r'!\[([^\]]*)\]\(([^)]*\.png)\)',  # ![alt](image.png)
-                r'<img[^>]*src="([^"]*\.png)"[^>]*>',  # <img src="image.png">
-                r'image:\s*([^\s]*\.png)',  # YAML front matter image: path.png
-                r'og:image:\s*([^\s]*\.png)',  # og:image: path.png
-                r'twitter:image:\s*([^\s]*\.png)',  # twitter:image: path.png
-            ]
-            
-            file_replacements = 0
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        # Handle tuple matches from capture groups
-                        for captured_path in match:
-                            if captured_path.endswith('.png'):
-                                # Check if corresponding .jpg exists
-                                if '/' in captured_path:
-                                    # Relative or absolute path
-                                    png_path = docs_dir / captured_path.lstrip('/')
-                                else:
-                                    # Just filename, look in same directory as markdown
-                                    png_path = md_file.parent / captured_path
-                                
-                                jpg_path = png_path.with_suffix('.jpg')
-                                
-                                if jpg_path.exists() and not png_path.exists():
-                                    # PNG was converted to JPG
-                                    content = content.replace(captured_path, captured_path.replace('.png', '.jpg'))
-                                    file_replacements += 1
-                    else:
-                        # Handle single string matches
-                        if match.endswith('.png'):
-                            png_path = docs_dir / match.lstrip('/')
-                            jpg_path = png_path.with_suffix('.jpg')
-                            
-                            if jpg_path.exists() and not png_path.exists():
-                                content = content.replace(match, match.replace('.png', '.jpg'))
-                                file_replacements += 1
-            
-            # Write back if changes were made
-            if content != original_content:
-                with open(md_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
+    try:
+        # Results arrive in file order, so the output matches a serial run
+        for md_file, (changes, error) in zip(markdown_files, results):
+            if error:
+                print(f"  ❌ Error processing {md_file}: {error}")
+            elif changes:
                 updated_files.append(str(md_file))
-                total_replacements += file_replacements
-                print(f"  ✅ Updated {md_file}: {file_replacements} references changed")
-        
-        except Exception as e:
-            print(f"  ❌ Error processing {md_file}: {e}")
-    
-    print(f"\n📊 Summary:")
-    print(f"  • Files updated: {len(updated_files)}")
-    print(f"  • Total references updated: {total_replacements}")
-    
-    if updated_files:
+                total_replacements += len(changes)
+                if dry_run:
+                    print(f"  📝 Would update {md_file}: {len(changes)} references")
+                    for line, old, new in changes:
+                        print(f"      line {line}: {old} → {new}")
+                else:
+                    print(f"  ✅ Updated {md_file}: {len(changes)} references changed")
+    finally:
+        if jobs > 1:
+            executor.shutdown()
+
+    print(f"\n📊 Summary{' (dry run, no files written)' if dry_run else ''}:")
+    print(f"  • Files {'to update' if dry_run else 'updated'}: {len(updated_files)}")
+    print(f"  • Total references {'to update' if dry_run else 'updated'}: {total_replacements}")
+
+    if updated_files and not dry_run:
         print(f"\n📝 Updated files:")
         for file in updated_files:
             print(f"  • {file}")
 
-if __name__ == "__main__":
+    return updated_files, total_replacements
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Update image references from .png to .jpg in markdown files')
+    parser.add_argument('docs_dir', nargs='?', type=Path,
+                        help='Docs directory (default: docs at the repo root)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of worker processes (default: 1; 0 = CPU count)')
+    parser.add_argument('-n', '--dry-run', action='store_true',
+                        help='Show which references would change without writing any file')
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+
+    if args.docs_dir is not None and not args.docs_dir.is_dir():
+        print(f"❌ ERROR: Directory does not exist: {args.docs_dir.absolute()}")
+        sys.exit(1)
+
     print("🔄 Updating image references from .png to .jpg...")
-    update_markdown_files()
-    print("✅ Reference update complete!")
\ No newline at end of file
+    update_markdown_files(args.docs_dir, jobs=jobs, dry_run=args.dry_run)
+    print("✅ Reference update complete!")
+
+
+if __name__ == "__main__":
+    main()
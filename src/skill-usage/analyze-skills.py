@@ -1,19 +1,166 @@
 #!/usr/bin/env python3
 """Analyze skill usage logs to identify patterns, performance metrics, and token usage."""
 
+import gzip
+import hashlib
+import heapq
 import json
-from collections import Counter, defaultdict
+import math
+import os
+import re
+from bisect import bisect_right
+from collections import Counter, defaultdict, deque
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 import sys
 from io import StringIO
 
+# skill-usage.jsonl, skill-usage.jsonl.gz, skill-usage.jsonl.1, skill-usage.jsonl.2.gz, ...
+ROTATED_LOG_PATTERN = re.compile(r'^(?P<base>.+?)(?:\.(?P<index>\d+))?(?P<gz>\.gz)?$')
+
+# Distinct prompts tracked exactly before the prompt counter starts evicting
+PROMPT_COUNTER_CAPACITY = 10_000
+
+# Bump when the layout of the rollup state file changes
+ROLLUP_VERSION = 2
+
+# Quantiles reported by --percentiles, and the sketch's relative error
+PERCENTILES = (0.50, 0.90, 0.99)
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Most recent hour/day buckets shown in the percentile table
+PERCENTILE_BUCKETS_SHOWN = 30
+
+# Leading bytes hashed to recognise a log after it is renamed or gzipped
+FINGERPRINT_BYTES = 256
+
+def open_log(filepath):
+    """Open a log file for binary reading, decompressing it if it ends in .gz."""
+    filepath = Path(filepath)
+    return gzip.open(filepath, 'rb') if filepath.suffix == '.gz' else open(filepath, 'rb')
+
+def iter_jsonl(filepath):
+    """Yield the records of a JSONL file one at a time (gzipped if it ends in .gz)."""
+    with open_log(filepath) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line.decode('utf-8'))
+
 def load_jsonl(filepath):
     """Load JSONL file into list of dicts."""
     if not filepath.exists():
         return []
-    with open(filepath) as f:
-        return [json.loads(line) for line in f if line.strip()]
+    return list(iter_jsonl(filepath))
+
+def find_log_files(log_dir, name):
+    """Find a log file and its rotated copies, oldest first.
+
+    Rotated copies follow the logrotate naming (a higher number is older)
+    and may be gzipped: name.3.gz, name.2.gz, name.1, name.gz, name.
+    """
+    files = []
+    for path in Path(log_dir).glob(f"{name}*"):
+        match = ROTATED_LOG_PATTERN.match(path.name)
+        if not match or match.group('base') != name or not path.is_file():
+            continue
+        index = int(match.group('index') or 0)
+        files.append((-index, 0 if match.group('gz') else 1, path))
+    return [path for _, _, path in sorted(files)]
+
+def iter_log(log_dir, name):
+    """Yield the records of a log and its rotated copies in chronological order."""
+    for path in find_log_files(log_dir, name):
+        yield from iter_jsonl(path)
+
+def log_fingerprint(filepath, length):
+    """SHA-1 of the first length bytes of a log (after decompression)."""
+    with open_log(filepath) as f:
+        return hashlib.sha1(f.read(length)).hexdigest()
+
+def gzip_size(filepath):
+    """Uncompressed size of a single-member .gz file modulo 2**32 (its ISIZE trailer)."""
+    with open(filepath, 'rb') as f:
+        f.seek(-4, os.SEEK_END)
+        return int.from_bytes(f.read(4), 'little')
+
+def plan_log_tail(log_dir, name, checkpoints):
+    """Work out where to resume reading a log and its rotated copies.
+
+    Each checkpoint records a file's inode, the byte offset consumed so far
+    and a fingerprint of its first bytes. A current file continues a
+    checkpoint when the fingerprint still matches and the file is not
+    shorter than the offset; the inode is tried first, and the fingerprint
+    alone recognises a log that logrotate renamed or gzipped. Anything else
+    (a new file, or one truncated by copytruncate) is read from the start.
+
+    Args:
+        log_dir: Log directory
+        name: Log file name, e.g. skill-usage.jsonl
+        checkpoints: Checkpoints saved for this log by the previous run
+
+    Returns:
+        List of (path, checkpoint) pairs, oldest file first, where each
+        checkpoint is a fresh dict whose 'offset' is where reading resumes
+    """
+    unused = list(checkpoints)
+    plan = []
+
+    for path in find_log_files(log_dir, name):
+        stat = path.stat()
+        compressed = path.suffix == '.gz'
+        fingerprints = {}
+
+        def continues(checkpoint):
+            if not compressed and stat.st_size < checkpoint['offset']:
+                return False
+            length = checkpoint['fingerprint_length']
+            if length not in fingerprints:
+                fingerprints[length] = log_fingerprint(path, length)
+            return fingerprints[length] == checkpoint['fingerprint']
+
+        candidates = sorted(unused, key=lambda c: c['inode'] != stat.st_ino)
+        previous = next((c for c in candidates if continues(c)), None)
+        if previous is not None:
+            unused.remove(previous)
+
+        plan.append((path, {
+            'file': path.name,
+            'inode': stat.st_ino,
+            'offset': previous['offset'] if previous else 0,
+            'fingerprint_length': previous['fingerprint_length'] if previous else 0,
+            'fingerprint': previous['fingerprint'] if previous else log_fingerprint(path, 0),
+        }))
+
+    return plan
+
+def iter_log_tail(plan):
+    """Yield the records appended since the checkpoints of a plan_log_tail plan.
+
+    Each checkpoint's offset advances as lines are read. A last line without
+    its newline is left for the next run, since the hook may still be
+    writing it.
+    """
+    for path, checkpoint in plan:
+        # A fully read .gz file has nothing new; skip decompressing it again
+        if path.suffix == '.gz' and checkpoint['offset'] and \
+                gzip_size(path) == checkpoint['offset'] % 2**32:
+            continue
+
+        with open_log(path) as f:
+            f.seek(checkpoint['offset'])
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                checkpoint['offset'] += len(line)
+                if line.strip():
+                    yield json.loads(line.decode('utf-8'))
+
+        # Extend the fingerprint while the file is still shorter than FINGERPRINT_BYTES
+        length = min(checkpoint['offset'], FINGERPRINT_BYTES)
+        if length != checkpoint['fingerprint_length']:
+            checkpoint['fingerprint_length'] = length
+            checkpoint['fingerprint'] = log_fingerprint(path, length)
 
 def format_duration(seconds):
     """Format duration in human-readable format."""
@@ -42,32 +189,77 @@ def format_tokens(count):
         return f"{count/1_000:.1f}K"
     return str(count)
 
+def make_invocation(event, skill_epoch, prompt, prompt_epoch, start_epoch):
+    """Build the correlated record for one skill end event.
+
+    Args:
+        event: The end event from skill-usage.jsonl
+        skill_epoch: The event's epoch as an int
+        prompt: Text of the preceding prompt, or "Unknown prompt"
+        prompt_epoch: Epoch of the preceding prompt, or None
+        start_epoch: Epoch of the matching start event, or None
+
+    Returns:
+        Dict with the skill, prompt, duration, timing and token fields
+    """
+    # Get duration from the event, or calculate from start event
+    duration = event.get('duration_seconds', 'unknown')
+    if duration == 'unknown' or duration == '0' or duration == 0:
+        if start_epoch is not None:
+            duration = skill_epoch - start_epoch
+
+    # Calculate time from prompt to skill completion
+    prompt_to_completion = None
+    if prompt_epoch:
+        prompt_to_completion = skill_epoch - prompt_epoch
+
+    return {
+        'skill': event['skill'],
+        'prompt': prompt,
+        'duration': duration,
+        'prompt_to_completion': prompt_to_completion,
+        'timestamp': event['timestamp'],
+        'epoch': skill_epoch,
+        'session': event['session'],
+        'input_tokens': event.get('input_tokens'),
+        'output_tokens': event.get('output_tokens'),
+        'total_tokens': event.get('total_tokens'),
+        'cache_read_tokens': event.get('cache_read_tokens'),
+        'cache_creation_tokens': event.get('cache_creation_tokens')
+    }
+
 def correlate_prompts_with_skills(prompts, skill_events):
-    """Match user prompts with skill invocations by session ID and timestamp."""
-    # Index prompts by session and epoch for better matching
+    """Match user prompts with skill invocations by session ID and timestamp.
+
+    Prompts are indexed per session as a sorted epoch array, so the prompt
+    before each end event is found with a binary search. Start events are
+    paired with end events through a stack per (session, skill), so repeated
+    and nested invocations of a skill each get their own start time. The
+    whole pass is O(n log n) in the number of events.
+    """
+    # Index prompts by session: epochs sorted, texts in the same order
     prompts_by_session = defaultdict(list)
     for prompt in prompts:
-        prompts_by_session[prompt['session']].append({
-            'epoch': int(prompt['epoch']),
-            'prompt': prompt['prompt'],
-            'timestamp': prompt['timestamp']
-        })
+        prompts_by_session[prompt['session']].append((int(prompt['epoch']), prompt['prompt']))
 
-    # Sort prompts by epoch within each session
-    for session in prompts_by_session:
-        prompts_by_session[session].sort(key=lambda x: x['epoch'])
+    prompt_epochs = {}
+    prompt_texts = {}
+    for session, session_prompts in prompts_by_session.items():
+        session_prompts.sort(key=lambda x: x[0])
+        prompt_epochs[session] = [epoch for epoch, _ in session_prompts]
+        prompt_texts[session] = [text for _, text in session_prompts]
 
-    # Build a map of start events to calculate duration
-    start_events = {}
-    for event in skill_events:
-        if event['event'] == 'start':
-            key = f"{event['session']}-{event['skill']}-{event['epoch']}"
-            start_events[key] = int(event['epoch'])
+    # Unmatched start epochs per (session, skill), most recent last
+    open_starts = defaultdict(list)
 
     # Correlate skill events with nearest preceding prompt
     correlated = []
     for event in skill_events:
-        if event['event'] != 'end':
+        kind = event['event']
+        if kind == 'start':
+            open_starts[(event['session'], event['skill'])].append(int(event['epoch']))
+            continue
+        if kind != 'end':
             continue
 
         session = event['session']
@@ -76,42 +268,20 @@ def correlate_prompts_with_skills(prompts, skill_events):
         # Find the most recent prompt before this skill event
         best_prompt = "Unknown prompt"
         prompt_epoch = None
-        session_prompts = prompts_by_session.get(session, [])
-        for p in reversed(session_prompts):
-            if p['epoch'] <= skill_epoch:
-                best_prompt = p['prompt']
-                prompt_epoch = p['epoch']
-                break
-
-        # Get duration from the event, or calculate from start event
-        duration = event.get('duration_seconds', 'unknown')
-        if duration == 'unknown' or duration == '0' or duration == 0:
-            # Try to find matching start event
-            for key, start_epoch in start_events.items():
-                if key.startswith(f"{session}-{event['skill']}-"):
-                    if start_epoch <= skill_epoch:
-                        duration = skill_epoch - start_epoch
-                        break
-
-        # Calculate time from prompt to skill completion
-        prompt_to_completion = None
-        if prompt_epoch:
-            prompt_to_completion = skill_epoch - prompt_epoch
-
-        correlated.append({
-            'skill': event['skill'],
-            'prompt': best_prompt,
-            'duration': duration,
-            'prompt_to_completion': prompt_to_completion,
-            'timestamp': event['timestamp'],
-            'epoch': skill_epoch,
-            'session': session,
-            'input_tokens': event.get('input_tokens'),
-            'output_tokens': event.get('output_tokens'),
-            'total_tokens': event.get('total_tokens'),
-            'cache_read_tokens': event.get('cache_read_tokens'),
-            'cache_creation_tokens': event.get('cache_creation_tokens')
-        })
+        epochs = prompt_epochs.get(session)
+        if epochs:
+            i = bisect_right(epochs, skill_epoch)
+            if i:
+                best_prompt = prompt_texts[session][i - 1]
+                prompt_epoch = epochs[i - 1]
+
+        # Pair with the most recent unmatched start of this skill
+        start_epoch = None
+        starts = open_starts.get((session, event['skill']))
+        if starts and starts[-1] <= skill_epoch:
+            start_epoch = starts.pop()
+
+        correlated.append(make_invocation(event, skill_epoch, best_prompt, prompt_epoch, start_epoch))
 
     return correlated
 
@@ -140,37 +310,538 @@ def analyze_prompt_timing(prompts):
 
     return timing_data
 
-def generate_report(log_dir, project_dir=None):
-    """Generate skill usage report and return as string."""
+class TopKCounter:
+    """Counter with a fixed number of slots (the Space-Saving algorithm).
+
+    Counts are exact until more than capacity distinct keys have been seen.
+    After that, a new key replaces the key with the lowest count and takes
+    over its count as a possible overestimate, so the memory stays fixed
+    while every key seen more than n / capacity times is still kept.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.heap = []      # One (count, order, key) per key; counts may be stale
+        self.order = 0
+
+    def add(self, key):
+        """Count one occurrence of key."""
+        if key in self.counts:
+            self.counts[key] += 1
+            return
+
+        count = 0
+        if len(self.counts) >= self.capacity:
+            # Pop until the smallest entry is up to date, then evict it
+            while True:
+                stale_count, order, smallest = heapq.heappop(self.heap)
+                if self.counts[smallest] == stale_count:
+                    break
+                heapq.heappush(self.heap, (self.counts[smallest], order, smallest))
+            count = self.counts.pop(smallest)
+            del self.errors[smallest]
+
+        self.counts[key] = count + 1
+        self.errors[key] = count
+        heapq.heappush(self.heap, (count + 1, self.order, key))
+        self.order += 1
+
+    def most_common(self, n):
+        """The n keys with the highest guaranteed counts, as (key, count) pairs."""
+        return heapq.nlargest(n, ((key, count - self.errors[key]) for key, count in self.counts.items()),
+                              key=itemgetter(1))
+
+    def to_state(self):
+        """JSON-serializable snapshot of the counter."""
+        orders = {key: order for _, order, key in self.heap}
+        return {
+            'capacity': self.capacity,
+            'order': self.order,
+            'items': [[key, count, self.errors[key], orders[key]] for key, count in self.counts.items()],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a counter from to_state output."""
+        counter = cls(state['capacity'])
+        counter.order = state['order']
+        for key, count, error, order in state['items']:
+            counter.counts[key] = count
+            counter.errors[key] = error
+            counter.heap.append((count, order, key))
+        heapq.heapify(counter.heap)
+        return counter
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with logarithmic buckets (DDSketch/HDR style).
+
+    A positive value v is counted in bucket ceil(log(v) / log(gamma)), so
+    every quantile comes back within the relative accuracy of a value that
+    was added. Sketches merge by adding bucket counts, which is how hourly
+    sketches are combined into daily ones without the raw events.
+    """
+
+    def __init__(self, relative_accuracy=SKETCH_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0     # Values <= 0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        """Add one value."""
+        if value > 0:
+            index = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Add every value of another sketch with the same accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q):
+        """Estimate the q-quantile (0 <= q <= 1), or None if the sketch is empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return self.min
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_state(self):
+        """JSON-serializable snapshot of the sketch."""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'buckets': sorted(self.buckets.items()),
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a sketch from to_state output."""
+        sketch = cls(state['relative_accuracy'])
+        sketch.buckets = {index: count for index, count in state['buckets']}
+        sketch.zero_count = state['zero_count']
+        sketch.count = state['count']
+        sketch.min = state['min']
+        sketch.max = state['max']
+        return sketch
+
+
+# Latency metrics sketched per skill and hour
+LATENCY_METRICS = ('duration', 'prompt_to_completion', 'tokens_per_second')
+
+def new_latency_group():
+    """Empty invocation count and sketches for one skill and time bucket."""
+    group = {metric: QuantileSketch() for metric in LATENCY_METRICS}
+    group['invocations'] = 0
+    return group
+
+def bucket_key(epoch, bucket):
+    """Local-time bucket label for an epoch: 'YYYY-MM-DD HH:00' for hour, 'YYYY-MM-DD' for day."""
+    fmt = '%Y-%m-%d %H:00' if bucket == 'hour' else '%Y-%m-%d'
+    return datetime.fromtimestamp(epoch).strftime(fmt)
+
+
+def new_skill_totals():
+    """Empty per-skill token and timing totals."""
+    return {
+        'input': 0, 'output': 0, 'total': 0,
+        'cache_read': 0, 'cache_creation': 0, 'count': 0,
+        'total_time': 0, 'time_count': 0
+    }
+
+
+class SkillUsageStats:
+    """Single-pass accumulators for the skill usage report.
+
+    Prompts and skill events are fed in epoch order (consume merges the two
+    logs). Correlation keeps only the latest prompt per session and the
+    open start events, and the report sections are running totals, a
+    fixed-size prompt counter, a bounded heap of the most recent
+    invocations and a bounded deque for the activity timeline. Memory
+    grows with the number of skills and sessions, not with the log length.
+    """
+
+    def __init__(self, recent_limit=20, timeline_limit=15, prompt_capacity=PROMPT_COUNTER_CAPACITY):
+        self.recent_limit = recent_limit
+
+        # Correlation state
+        self.last_prompt = {}                   # session -> (epoch, prompt)
+        self.open_starts = defaultdict(list)    # (session, skill) -> start epochs
+        self.previous_prompt_epoch = None
+
+        # Report accumulators
+        self.skill_events = 0
+        self.invocations = 0
+        self.skill_counts = Counter()
+        self.skill_tokens = defaultdict(new_skill_totals)
+        self.total_tokens = 0
+        self.total_cache_read = 0
+        self.total_cache_creation = 0
+        self.total_time = 0
+        self.timed_invocations = 0
+        self.prompt_counts = TopKCounter(prompt_capacity)
+        self.recent = []                        # Min-heap of (timestamp, -seq, row)
+        self.timeline = deque(maxlen=timeline_limit)
+        self.latency = defaultdict(new_latency_group)  # (skill, hour) -> sketches
+        self.last_quarter_hour = (None, None)           # (epoch // 900, hour label)
+
+    def consume(self, prompts, skill_events):
+        """Merge the prompt and skill event streams by epoch and add every record.
+
+        Each log is appended as events happen, so both streams are already
+        in epoch order. On equal epochs prompts come first, so a prompt
+        counts as preceding a skill event logged in the same second.
+        """
+        tagged_prompts = ((int(prompt['epoch']), True, prompt) for prompt in prompts)
+        tagged_events = ((int(event['epoch']), False, event) for event in skill_events)
+        for epoch, is_prompt, record in heapq.merge(tagged_prompts, tagged_events, key=itemgetter(0)):
+            if is_prompt:
+                self.add_prompt(record, epoch)
+            else:
+                self.add_skill_event(record, epoch)
+
+    def add_prompt(self, prompt, epoch):
+        """Add one record from prompts.jsonl."""
+        # The report never shows more than the first 100 characters of a prompt
+        self.last_prompt[prompt['session']] = (epoch, prompt['prompt'][:100])
+
+        if self.previous_prompt_epoch is not None:
+            self.timeline.append({
+                'timestamp': prompt['timestamp'],
+                'prompt': prompt['prompt'][:80],
+                'seconds_since_prev': epoch - self.previous_prompt_epoch,
+                'session': prompt['session']
+            })
+        self.previous_prompt_epoch = epoch
+
+    def add_skill_event(self, event, epoch):
+        """Add one record from skill-usage.jsonl."""
+        self.skill_events += 1
+        kind = event['event']
+        if kind == 'start':
+            self.open_starts[(event['session'], event['skill'])].append(epoch)
+            return
+        if kind != 'end':
+            return
+
+        prompt_epoch, prompt = self.last_prompt.get(event['session'], (None, "Unknown prompt"))
+        start_epoch = None
+        starts = self.open_starts.get((event['session'], event['skill']))
+        if starts and starts[-1] <= epoch:
+            start_epoch = starts.pop()
+            if not starts:
+                del self.open_starts[(event['session'], event['skill'])]
+
+        self.add_invocation(make_invocation(event, epoch, prompt, prompt_epoch, start_epoch))
+
+    def add_invocation(self, entry):
+        """Add one correlated invocation to the report totals."""
+        skill = entry['skill']
+        self.invocations += 1
+        self.skill_counts[skill] += 1
+
+        totals = self.skill_tokens[skill]
+        totals['count'] += 1
+
+        if entry.get('total_tokens') and entry['total_tokens'] != 'null':
+            tokens = int(entry['total_tokens'])
+            totals['total'] += tokens
+            self.total_tokens += tokens
+
+        if entry.get('input_tokens') and entry['input_tokens'] != 'null':
+            totals['input'] += int(entry['input_tokens'])
+
+        if entry.get('output_tokens') and entry['output_tokens'] != 'null':
+            totals['output'] += int(entry['output_tokens'])
+
+        if entry.get('cache_read_tokens') and entry['cache_read_tokens'] != 'null':
+            cache_read = int(entry['cache_read_tokens'])
+            totals['cache_read'] += cache_read
+            self.total_cache_read += cache_read
+
+        if entry.get('cache_creation_tokens') and entry['cache_creation_tokens'] != 'null':
+            cache_create = int(entry['cache_creation_tokens'])
+            totals['cache_creation'] += cache_create
+            self.total_cache_creation += cache_create
+
+        # Track timing from prompt to completion
+        prompt_to_completion = entry.get('prompt_to_completion')
+        if prompt_to_completion and prompt_to_completion > 0:
+            totals['total_time'] += prompt_to_completion
+            totals['time_count'] += 1
+            self.total_time += prompt_to_completion
+            self.timed_invocations += 1
+
+        if entry['prompt'] != "Unknown prompt":
+            self.prompt_counts.add(entry['prompt'][:100])
+
+        # Sketch latency and throughput per hour; days are merged from hours
+        group = self.latency[(skill, self.hour_label(entry['epoch']))]
+        group['invocations'] += 1
+        try:
+            duration = int(entry['duration'])
+        except (TypeError, ValueError):
+            duration = None
+        if duration is not None:
+            group['duration'].add(duration)
+        if prompt_to_completion is not None:
+            group['prompt_to_completion'].add(prompt_to_completion)
+        if duration and duration > 0 and entry.get('total_tokens') and entry['total_tokens'] != 'null':
+            group['tokens_per_second'].add(int(entry['total_tokens']) / duration)
+
+        # Keep the most recent invocations; earlier log order wins on equal timestamps
+        row = {
+            'timestamp': entry['timestamp'],
+            'skill': skill,
+            'total_tokens': entry.get('total_tokens'),
+            'prompt_to_completion': prompt_to_completion,
+            'prompt': entry['prompt'][:50]
+        }
+        item = (entry['timestamp'], -self.invocations, row)
+        if len(self.recent) < self.recent_limit:
+            heapq.heappush(self.recent, item)
+        elif item[:2] > self.recent[0][:2]:
+            heapq.heapreplace(self.recent, item)
+
+    def recent_invocations(self):
+        """The most recent invocations, newest first."""
+        return [row for _, _, row in sorted(self.recent, key=itemgetter(0, 1), reverse=True)]
+
+    def hour_label(self, epoch):
+        """bucket_key(epoch, 'hour'), formatted once per quarter hour.
+
+        Events arrive in epoch order and every UTC offset is a multiple of
+        15 minutes, so consecutive events usually reuse the last label.
+        """
+        quarter = epoch // 900
+        if self.last_quarter_hour[0] != quarter:
+            self.last_quarter_hour = (quarter, bucket_key(quarter * 900, 'hour'))
+        return self.last_quarter_hour[1]
+
+    def latency_by_bucket(self, bucket):
+        """Latency sketches per (time bucket, skill), merged up from the hourly ones.
+
+        Args:
+            bucket: 'hour' or 'day'
+
+        Returns:
+            Dict mapping (bucket label, skill) to an invocation count and a
+            QuantileSketch per metric in LATENCY_METRICS
+        """
+        if bucket == 'hour':
+            return {(hour, skill): group for (skill, hour), group in self.latency.items()}
+
+        merged = defaultdict(new_latency_group)
+        for (skill, hour), group in self.latency.items():
+            target = merged[(hour[:10], skill)]
+            target['invocations'] += group['invocations']
+            for metric in LATENCY_METRICS:
+                target[metric].merge(group[metric])
+        return merged
+
+    def to_state(self):
+        """JSON-serializable snapshot of the correlation state and accumulators."""
+        return {
+            'recent_limit': self.recent_limit,
+            'timeline_limit': self.timeline.maxlen,
+            'last_prompt': self.last_prompt,
+            'open_starts': [[session, skill, starts] for (session, skill), starts in self.open_starts.items()],
+            'previous_prompt_epoch': self.previous_prompt_epoch,
+            'skill_events': self.skill_events,
+            'invocations': self.invocations,
+            'skill_counts': self.skill_counts,
+            'skill_tokens': self.skill_tokens,
+            'total_tokens': self.total_tokens,
+            'total_cache_read': self.total_cache_read,
+            'total_cache_creation': self.total_cache_creation,
+            'total_time': self.total_time,
+            'timed_invocations': self.timed_invocations,
+            'prompt_counts': self.prompt_counts.to_state(),
+            'recent': self.recent,
+            'timeline': list(self.timeline),
+            'latency': [
+                [skill, hour, group['invocations']] + [group[metric].to_state() for metric in LATENCY_METRICS]
+                for (skill, hour), group in self.latency.items()
+            ],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild the accumulators from to_state output."""
+        stats = cls(state['recent_limit'], state['timeline_limit'])
+        stats.last_prompt = {session: tuple(entry) for session, entry in state['last_prompt'].items()}
+        for session, skill, starts in state['open_starts']:
+            stats.open_starts[(session, skill)] = starts
+        stats.previous_prompt_epoch = state['previous_prompt_epoch']
+        stats.skill_events = state['skill_events']
+        stats.invocations = state['invocations']
+        stats.skill_counts = Counter(state['skill_counts'])
+        stats.skill_tokens.update(state['skill_tokens'])
+        stats.total_tokens = state['total_tokens']
+        stats.total_cache_read = state['total_cache_read']
+        stats.total_cache_creation = state['total_cache_creation']
+        stats.total_time = state['total_time']
+        stats.timed_invocations = state['timed_invocations']
+        stats.prompt_counts = TopKCounter.from_state(state['prompt_counts'])
+        stats.recent = [tuple(item) for item in state['recent']]
+        stats.timeline.extend(state['timeline'])
+        for skill, hour, invocations, *sketches in state['latency']:
+            group = stats.latency[(skill, hour)]
+            group['invocations'] = invocations
+            for metric, sketch in zip(LATENCY_METRICS, sketches):
+                group[metric] = QuantileSketch.from_state(sketch)
+        return stats
+
+
+def default_rollup_path(log_dir):
+    """Rollup state file kept next to the logs for incremental runs."""
+    return Path(log_dir) / "skill-usage-rollup.json"
+
+
+def save_rollup(state_path, stats, checkpoints):
+    """Record the accumulators and log checkpoints for the next incremental run."""
+    state = {
+        'version': ROLLUP_VERSION,
+        'logs': checkpoints,
+        'stats': stats.to_state(),
+    }
+    # Write to a temporary file first so an interrupted run keeps the old rollup
+    state_path = Path(state_path)
+    tmp_path = state_path.with_name(state_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(state, separators=(',', ':')))
+    os.replace(tmp_path, state_path)
+
+
+def load_rollup(state_path):
+    """Load the rollup written by the previous run, or None if it is missing or unusable."""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('version') != ROLLUP_VERSION:
+        return None
+    return state
+
+
+def format_percentiles(sketch, formatter):
+    """Format a sketch's PERCENTILES as 'p50 / p90 / p99', or N/A if it is empty."""
+    if not sketch.count:
+        return 'N/A'
+    return ' / '.join(formatter(sketch.quantile(q)) for q in PERCENTILES)
+
+
+def write_percentile_section(write, stats, bucket):
+    """Write the per-skill latency and throughput percentile table."""
+    groups = stats.latency_by_bucket(bucket)
+    labels = sorted({label for label, _ in groups}, reverse=True)
+    shown = labels[:PERCENTILE_BUCKETS_SHOWN]
+    header = ' / '.join(f"p{round(q * 100)}" for q in PERCENTILES)
+
+    write()
+    write("## Latency Percentiles")
+    write()
+    write(f"Per {bucket}, most recent first ({len(shown)} of {len(labels)} {bucket}s shown). "
+          f"Percentiles are within {SKETCH_RELATIVE_ACCURACY:.0%} of an observed value.")
+    write()
+    write(f"| {bucket.title()} | Skill | Invocations | Duration ({header}) | Time from Prompt ({header}) | Tokens/s ({header}) |")
+    write("|------|-------|-------------|----------|------------------|----------|")
+
+    def seconds(value):
+        return format_duration(round(value))
+
+    def rate(value):
+        return f"{value:,.0f}"
+
+    for label in shown:
+        for skill in sorted(skill for group_label, skill in groups if group_label == label):
+            group = groups[(label, skill)]
+            write(f"| {label} | {skill} | {group['invocations']}x "
+                  f"| {format_percentiles(group['duration'], seconds)} "
+                  f"| {format_percentiles(group['prompt_to_completion'], seconds)} "
+                  f"| {format_percentiles(group['tokens_per_second'], rate)} |")
+
+
+def generate_report(log_dir, project_dir=None, incremental=False, state_path=None,
+                    percentiles=False, bucket='day'):
+    """Generate skill usage report and return as string.
+
+    With incremental=True the accumulators are loaded from the rollup state
+    file, only the lines appended to the logs since the previous run are
+    parsed, and the updated rollup is saved for the next run. With
+    percentiles=True a table of per-skill p50/p90/p99 latency and token
+    throughput is added, bucketed by 'hour' or 'day'.
+    """
     log_dir = Path(log_dir)
     output = StringIO()
 
     def write(text=""):
         output.write(text + "\n")
 
-    # Load logs
-    prompts = load_jsonl(log_dir / "prompts.jsonl")
-    skill_events = load_jsonl(log_dir / "skill-usage.jsonl")
+    if incremental:
+        state_path = Path(state_path) if state_path else default_rollup_path(log_dir)
+        rollup = load_rollup(state_path)
+        stats = SkillUsageStats.from_state(rollup['stats']) if rollup else SkillUsageStats()
+        checkpoints = rollup['logs'] if rollup else {}
+
+        plans = {name: plan_log_tail(log_dir, name, checkpoints.get(name, []))
+                 for name in ("prompts.jsonl", "skill-usage.jsonl")}
+        stats.consume(iter_log_tail(plans["prompts.jsonl"]), iter_log_tail(plans["skill-usage.jsonl"]))
+        save_rollup(state_path, stats,
+                    {name: [checkpoint for _, checkpoint in plan] for name, plan in plans.items()})
+    else:
+        # Stream the logs (and their rotated copies) through the accumulators
+        stats = SkillUsageStats()
+        stats.consume(iter_log(log_dir, "prompts.jsonl"), iter_log(log_dir, "skill-usage.jsonl"))
 
-    if not skill_events:
+    if not stats.skill_events:
         write("No skill usage data found yet.")
         write(f"Logs will be created in: {log_dir}")
         write("\nUse skills in Claude Code and they'll be tracked automatically.")
         return output.getvalue(), False
 
-    # Correlate prompts with skills
-    correlated = correlate_prompts_with_skills(prompts, skill_events)
-
     write("# Skill Usage Report")
     write()
     write(f"**Project:** {project_dir.name if project_dir else 'Unknown'}<br/>")
     write(f"**Log directory:** `{log_dir}`<br/>")
-    write(f"**Total skill invocations:** {len(correlated)}<br/>")
+    write(f"**Total skill invocations:** {stats.invocations}<br/>")
     write(f"**Report generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     write()
 
     # Skill frequency analysis
-    skill_counts = Counter(entry['skill'] for entry in correlated)
+    skill_counts = stats.skill_counts
     write("## Skill Usage Summary")
     write()
     for skill, count in skill_counts.most_common():
@@ -180,45 +851,10 @@ def generate_report(log_dir, project_dir=None):
     write()
     write("## Token Usage by Skill")
     write()
-    skill_tokens = defaultdict(lambda: {
-        'input': 0, 'output': 0, 'total': 0,
-        'cache_read': 0, 'cache_creation': 0, 'count': 0,
-        'total_time': 0, 'time_count': 0
-    })
-
-    total_tokens_all = 0
-    total_cache_read = 0
-    total_cache_creation = 0
-
-    for entry in correlated:
-        skill = entry['skill']
-        skill_tokens[skill]['count'] += 1
-
-        if entry.get('total_tokens') and entry['total_tokens'] != 'null':
-            tokens = int(entry['total_tokens'])
-            skill_tokens[skill]['total'] += tokens
-            total_tokens_all += tokens
-
-        if entry.get('input_tokens') and entry['input_tokens'] != 'null':
-            skill_tokens[skill]['input'] += int(entry['input_tokens'])
-
-        if entry.get('output_tokens') and entry['output_tokens'] != 'null':
-            skill_tokens[skill]['output'] += int(entry['output_tokens'])
-
-        if entry.get('cache_read_tokens') and entry['cache_read_tokens'] != 'null':
-            cache_read = int(entry['cache_read_tokens'])
-            skill_tokens[skill]['cache_read'] += cache_read
-            total_cache_read += cache_read
-
-        if entry.get('cache_creation_tokens') and entry['cache_creation_tokens'] != 'null':
-            cache_create = int(entry['cache_creation_tokens'])
-            skill_tokens[skill]['cache_creation'] += cache_create
-            total_cache_creation += cache_create
-
-        # Track timing from prompt to completion
-        if entry.get('prompt_to_completion') and entry['prompt_to_completion'] > 0:
-            skill_tokens[skill]['total_time'] += entry['prompt_to_completion']
-            skill_tokens[skill]['time_count'] += 1
+    skill_tokens = stats.skill_tokens
+    total_tokens_all = stats.total_tokens
+    total_cache_read = stats.total_cache_read
+    total_cache_creation = stats.total_cache_creation
 
     write("| Skill | Invocations | Total Tokens | Avg Time | Cache Read | Cache Creation |")
     write("|-------|-------------|--------------|----------|------------|----------------|")
@@ -244,10 +880,9 @@ def generate_report(log_dir, project_dir=None):
         write(f"| Estimated API cost | ${total_tokens_all * 0.000003:.2f} |")
 
     # Timing summary
-    total_time = sum(e.get('prompt_to_completion', 0) or 0 for e in correlated)
-    timed_skills = [e for e in correlated if e.get('prompt_to_completion') and e['prompt_to_completion'] > 0]
-    if timed_skills:
-        avg_time = total_time // len(timed_skills)
+    total_time = stats.total_time
+    if stats.timed_invocations:
+        avg_time = total_time // stats.timed_invocations
         write()
         write("## Timing Summary")
         write()
@@ -255,15 +890,17 @@ def generate_report(log_dir, project_dir=None):
         write(f"|--------|-------|")
         write(f"| Total time in skills | {format_duration(total_time)} |")
         write(f"| Average time per skill | {format_duration(avg_time)} |")
-        write(f"| Skills with timing data | {len(timed_skills)} of {len(correlated)} |")
+        write(f"| Skills with timing data | {stats.timed_invocations} of {stats.invocations} |")
+
+    if percentiles:
+        write_percentile_section(write, stats, bucket)
 
     # Common prompts that trigger skills
     write()
     write("## Common Prompts")
     write()
-    prompt_counts = Counter(entry['prompt'][:100] for entry in correlated if entry['prompt'] != "Unknown prompt")
     shown = 0
-    for prompt, count in prompt_counts.most_common(10):
+    for prompt, count in stats.prompt_counts.most_common(10):
         if count > 1 or shown < 5:
             truncated = prompt[:80] + "..." if len(prompt) > 80 else prompt
             write(f"- {count}x: \"{truncated}\"")
@@ -277,21 +914,21 @@ def generate_report(log_dir, project_dir=None):
     write()
     write("| Timestamp | Skill | Tokens | Time from Prompt | Prompt (truncated) |")
     write("|-----------|-------|--------|------------------|---------------------|")
-    for entry in sorted(correlated, key=lambda x: x['timestamp'], reverse=True)[:20]:
+    for entry in stats.recent_invocations():
         tokens = format_tokens(entry.get('total_tokens'))
         prompt_short = entry['prompt'][:50].replace('|', '\\|').replace('\n', ' ')
         time_from_prompt = format_duration(entry.get('prompt_to_completion')) if entry.get('prompt_to_completion') else 'N/A'
         write(f"| {entry['timestamp']} | {entry['skill']} | {tokens} | {time_from_prompt} | {prompt_short}... |")
 
     # Session activity timing
-    prompt_timing = analyze_prompt_timing(prompts)
+    prompt_timing = stats.timeline
     if prompt_timing:
         write()
         write("## Session Activity Timeline")
         write()
         write("| Timestamp | Time Since Previous | Prompt (truncated) |")
         write("|-----------|---------------------|---------------------|")
-        for entry in prompt_timing[-15:]:  # Last 15 entries
+        for entry in prompt_timing:  # Last 15 entries
             time_since = format_duration(entry['seconds_since_prev'])
             prompt_short = entry['prompt'][:60].replace('|', '\\|').replace('\n', ' ')
             write(f"| {entry['timestamp']} | {time_since} | {prompt_short}... |")
@@ -565,9 +1202,10 @@ def generate_html_report(markdown_content, project_name="Skill Usage"):
     return html
 
 
-def analyze_skill_usage(log_dir, output_file=None, project_dir=None, output_format='markdown'):
+def analyze_skill_usage(log_dir, output_file=None, project_dir=None, output_format='markdown',
+                        incremental=False, state_path=None, percentiles=False, bucket='day'):
     """Analyze skill usage patterns and generate report."""
-    report, success = generate_report(log_dir, project_dir)
+    report, success = generate_report(log_dir, project_dir, incremental, state_path, percentiles, bucket)
 
     # Generate HTML if requested
     if output_format == 'html':
@@ -606,6 +1244,14 @@ def main():
     parser.add_argument('-o', '--output', help='Output file path')
     parser.add_argument('-p', '--project', help='Project directory (for context)')
     parser.add_argument('--html', action='store_true', help='Generate HTML report instead of markdown')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only parse log lines appended since the last --incremental run')
+    parser.add_argument('--state', dest='state_path',
+                        help='Rollup state file for --incremental (default: <log_dir>/skill-usage-rollup.json)')
+    parser.add_argument('--percentiles', action='store_true',
+                        help='Add p50/p90/p99 latency and tokens/s per skill and time bucket')
+    parser.add_argument('--bucket', choices=['hour', 'day'], default='day',
+                        help='Time bucket for --percentiles (default: day)')
 
     args = parser.parse_args()
 
@@ -642,7 +1288,8 @@ def main():
         return
 
     output_format = 'html' if args.html else 'markdown'
-    analyze_skill_usage(log_dir, output_file, project_dir, output_format)
+    analyze_skill_usage(log_dir, output_file, project_dir, output_format, args.incremental, args.state_path,
+                        args.percentiles, args.bucket)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmark prompt/skill correlation in analyze-skills.py on synthetic logs.
+
+Generates an activity log the way the tracking hooks write it: many
+sessions interleaved in one file, each with prompts followed by skill
+start/end events, some skills nested or repeated and some end events
+missing their duration. Then times correlate_prompts_with_skills.
+
+On a smaller sample the results are checked two ways:
+
+- prompt matching against the original linear-scan implementation
+  (kept here as the baseline; it is O(events^2) so only the sample is run)
+- durations against the true start times recorded by the generator
+
+Usage:
+    python benchmark-analyze-skills.py
+    python benchmark-analyze-skills.py --events 5000000 --sessions 5000
+"""
+
+import argparse
+import importlib.util
+import random
+import time
+from pathlib import Path
+
+ANALYZE_SKILLS = Path(__file__).resolve().parent / 'analyze-skills.py'
+
+SKILLS = ['learning-graph-generator', 'glossary-generator', 'quiz-generator',
+          'microsim-generator', 'chapter-content-generator', 'faq-generator',
+          'diagram-reports-generator', 'book-metrics-generator']
+
+
+def load_analyze_skills(path: Path):
+    """Import analyze-skills.py as a module (its file name has a hyphen)."""
+    spec = importlib.util.spec_from_file_location('analyze_skills', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_logs(num_events: int, num_sessions: int, seed: int):
+    """Build interleaved prompt and skill event lists.
+
+    Returns:
+        (prompts, skill_events, true_starts) where true_starts[i] is the
+        start epoch of the invocation ended by skill_events[i] (or None)
+    """
+    rng = random.Random(seed)
+    timelines = []  # (epoch, order, kind, record, true_start)
+    order = 0
+    per_session = max(2, num_events // num_sessions)
+
+    for s in range(num_sessions):
+        session = f"session-{s:06d}"
+        epoch = 1_700_000_000 + rng.randrange(86_400 * 30)
+        produced = 0
+        while produced < per_session:
+            epoch += rng.randint(5, 600)
+            timelines.append((epoch, order, 'prompt', {
+                'timestamp': str(epoch), 'epoch': str(epoch), 'session': session,
+                'prompt': f"Prompt {s}-{produced}: please run {rng.choice(SKILLS)}"
+            }, None))
+            order += 1
+
+            # One invocation, sometimes with the same skill nested inside it
+            skill = rng.choice(SKILLS)
+            depth = 2 if rng.random() < 0.1 else 1
+            starts = []
+            for _ in range(depth):
+                epoch += rng.randint(0, 5)
+                starts.append(epoch)
+                timelines.append((epoch, order, 'start', {
+                    'timestamp': str(epoch), 'epoch': str(epoch), 'session': session,
+                    'skill': skill, 'event': 'start'
+                }, None))
+                order += 1
+            while starts:
+                start = starts.pop()
+                epoch += rng.randint(1, 900)
+                known = rng.random() < 0.7
+                tokens = rng.randint(1_000, 200_000)
+                timelines.append((epoch, order, 'end', {
+                    'timestamp': str(epoch), 'epoch': str(epoch), 'session': session,
+                    'skill': skill, 'event': 'end',
+                    'duration_seconds': str(epoch - start) if known else 'unknown',
+                    'input_tokens': tokens // 10, 'output_tokens': tokens // 20,
+                    'total_tokens': tokens, 'cache_read_tokens': tokens // 2,
+                    'cache_creation_tokens': tokens // 50
+                }, start))
+                order += 1
+            produced += 2 * depth + 1
+
+    # Copy the records in log order, as reading a log file would allocate them
+    timelines.sort(key=lambda x: (x[0], x[1]))
+    prompts = [dict(record) for _, _, kind, record, _ in timelines if kind == 'prompt']
+    skill_events = [dict(record) for _, _, kind, record, _ in timelines if kind != 'prompt']
+    true_starts = [start for _, _, kind, _, start in timelines if kind != 'prompt']
+    return prompts, skill_events, true_starts
+
+
+def legacy_correlate(prompts, skill_events):
+    """The original linear scans, kept as the baseline.
+
+    Finds the preceding prompt by walking the session's prompts backwards,
+    and a missing duration by walking every start event. Only the prompts
+    are compared, since the start-event walk took the first start of the
+    skill in the session rather than the matching one.
+    """
+    prompts_by_session = {}
+    for prompt in prompts:
+        prompts_by_session.setdefault(prompt['session'], []).append({
+            'epoch': int(prompt['epoch']), 'prompt': prompt['prompt']})
+    for session in prompts_by_session:
+        prompts_by_session[session].sort(key=lambda x: x['epoch'])
+
+    start_events = {}
+    for event in skill_events:
+        if event['event'] == 'start':
+            key = f"{event['session']}-{event['skill']}-{event['epoch']}"
+            start_events[key] = int(event['epoch'])
+
+    matched = []
+    for event in skill_events:
+        if event['event'] != 'end':
+            continue
+        skill_epoch = int(event['epoch'])
+        best_prompt = "Unknown prompt"
+        for p in reversed(prompts_by_session.get(event['session'], [])):
+            if p['epoch'] <= skill_epoch:
+                best_prompt = p['prompt']
+                break
+        if event['duration_seconds'] == 'unknown':
+            for key, start_epoch in start_events.items():
+                if key.startswith(f"{event['session']}-{event['skill']}-"):
+                    if start_epoch <= skill_epoch:
+                        break
+        matched.append(best_prompt)
+    return matched
+
+
+def best_time(func, repeat: int) -> float:
+    """Best wall-clock time of several runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark skill/prompt correlation in analyze-skills.py')
+    parser.add_argument('--events', type=int, default=1_000_000, help='Approximate number of log lines')
+    parser.add_argument('--sessions', type=int, default=2_000, help='Number of interleaved sessions')
+    parser.add_argument('--check-events', type=int, default=20_000,
+                        help='Size of the sample checked against the legacy implementation')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best time is reported)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--script', type=Path, default=ANALYZE_SKILLS, help='Path to analyze-skills.py')
+    args = parser.parse_args()
+
+    analyze_skills = load_analyze_skills(args.script)
+    correlate = analyze_skills.correlate_prompts_with_skills
+
+    # Correctness on a sample small enough for the quadratic baseline
+    sample_sessions = max(1, args.sessions * args.check_events // max(args.events, 1))
+    prompts, skill_events, true_starts = make_logs(args.check_events, sample_sessions, args.seed)
+    correlated = correlate(prompts, skill_events)
+    ends = [(event, start) for event, start in zip(skill_events, true_starts) if event['event'] == 'end']
+    prompt_mismatches = sum(1 for entry, legacy in zip(correlated, legacy_correlate(prompts, skill_events))
+                            if entry['prompt'] != legacy)
+    duration_mismatches = sum(1 for entry, (event, start) in zip(correlated, ends)
+                              if int(entry['duration']) != int(event['epoch']) - start)
+    sample_legacy = best_time(lambda: legacy_correlate(prompts, skill_events), 1)
+    sample_new = best_time(lambda: correlate(prompts, skill_events), args.repeat)
+
+    # Full-size timing
+    prompts, skill_events, _ = make_logs(args.events, args.sessions, args.seed)
+    full = best_time(lambda: correlate(prompts, skill_events), args.repeat)
+    lines = len(prompts) + len(skill_events)
+
+    print(f"Benchmarking {args.script}")
+    print()
+    print(f"{'Run':<28} {'Lines':>10} {'Best (s)':>10} {'us/line':>10}")
+    print(f"{'-' * 28} {'-' * 10} {'-' * 10} {'-' * 10}")
+    sample_lines = args.check_events
+    for name, count, seconds in (('legacy linear scan (sample)', sample_lines, sample_legacy),
+                                 ('indexed (sample)', sample_lines, sample_new),
+                                 ('indexed (full)', lines, full)):
+        print(f"{name:<28} {count:>10,} {seconds:>10.3f} {seconds / count * 1e6:>10.2f}")
+    print()
+    if prompt_mismatches or duration_mismatches:
+        print(f"❌ {prompt_mismatches} prompt and {duration_mismatches} duration mismatches in the sample")
+    else:
+        print(f"✅ Sample of {len(correlated):,} invocations: prompts match the legacy scan, "
+              f"durations match the true start times")
+
+
+if __name__ == '__main__':
+    main()